@@ -1537,6 +1537,7 @@ TALEEM_APPS = [
     'openedx.custom.videos.apps.VideosConfig',
     'openedx.custom.taleem_search.apps.TaleemSearchConfig',
     'openedx.custom.live_class.apps.LiveClassConfig',
+    'openedx.custom.taleem_calendar.apps.TaleemCalendarConfig',
     'openedx.custom.taleem_interactivexblock_utils.apps.TaleemInteractivexblockUtilsConfig',
     'openedx.custom.taleem_emails.apps.Ta3leemEmailAppConfig',
 ]
@@ -2353,6 +2354,17 @@ IMPORT_EXPORT_USE_TRANSACTIONS = True
 PROCTORING_SNAP_INTERVAL_IN_SECONDS = 10
 PROCTORING_SNAP_WIDTH = 640
 PROCTORING_SNAP_HEIGHT = 480
+# Polls of the exam attempts are written to the database at this interval
+PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS = 30
+# Changes to the exams are reflected in their reports analytics after this delay
+TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS = 60
+# Analytics of the running exams are refreshed when older
+TIMED_EXAM_ANALYTICS_MAX_AGE_IN_SECONDS = 5 * 60
+# Proctoring reports of an exam are exported in the background by this many processes
+PROCTORING_REPORT_EXPORT_PROCESSES = 4
+# Number of reports rendered between two progress updates of an export
+PROCTORING_REPORT_EXPORT_BATCH_SIZE = 20
+PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS = 60 * 60
 AI_MODULE_URL = 'http://45.79.126.118:8001/'
 # Image verification request retry settings
 IMAGE_VERIFICATION_REQUEST_RETRY_DELAY = 60 * 60
@@ -2361,6 +2373,12 @@ IMAGE_VERIFICATION_RETRY_MAX_ATTEMPTS = 6
 IMAGE_VERIFICATION_TIMEOUT_SECONDS = 1500
 IMAGE_VERIFICATION_ROUTING_KEY = 'edx.lms.core.default'
 
+##################### TA3LEEM CALENDAR SETTINGS ############################
+# Calendar events of the users are rebuilt in batches of this many users
+CALENDAR_EVENTS_BATCH_SIZE = 500
+# Calendar events are built by the LMS workers, the course dates need the LMS
+CALENDAR_EVENTS_ROUTING_KEY = 'edx.lms.core.default'
+
 
 MAX_EMAILS_PER_MINUTE = 30
 
@@ -2382,6 +2400,21 @@ MC_CLIENT_CEPH_ALIAS = 'ta3leem-ceph'
 ############### FCM - PUSH NOTIFICATIONS ###########
 FCM_DJANGO_SETTINGS = {}
 
+NOTIFICATION_BULK_CREATE_BATCH_SIZE = 1000
+# Tokens per FCM request
+FCM_BATCH_SIZE = 500
+# Concurrent FCM requests of a personalized notification
+FCM_MAX_CONCURRENT_REQUESTS = 8
+NOTIFICATION_BROADCAST_RETRY_DELAY = 60
+NOTIFICATION_BROADCAST_MAX_RETRIES = 5
+
+# Cached counters of the unread notifications
+NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT = 60 * 60 * 24
+
+############################ LIVE CLASS ####################################
+LIVE_CLASS_BOOKING_BATCH_SIZE = 1000
+LIVE_CLASS_AUTO_INVITE_CACHE_TIMEOUT = 60 * 60 * 24
+
 ################# custom ###################3
 ORA2_FILEUPLOAD_BACKEND = 's3'
 VERIFY_STUDENT = {
@@ -26,7 +26,7 @@ from django.utils.translation import ugettext_noop
 from django.test.client import RequestFactory
 from django.contrib.auth.models import User
 
-from edx_proctoring import constants
+from edx_proctoring import constants, heartbeats
 from edx_proctoring.backends import get_backend_provider
 from edx_proctoring.exceptions import (
     BackendProviderCannotRegisterAttempt,
@@ -470,6 +470,10 @@ def _get_exam_attempt(exam_attempt_obj):
 
     serialized_attempt_obj = ProctoredExamStudentAttemptSerializer(exam_attempt_obj)
     attempt = serialized_attempt_obj.data
+    attempt['last_poll_timestamp'] = heartbeats.get_last_poll_timestamp(
+        exam_attempt_obj.id,
+        exam_attempt_obj.last_poll_timestamp,
+    )
     attempt = _check_for_attempt_timeout(attempt)
 
     return attempt
@@ -806,7 +810,8 @@ def _start_exam_attempt(existing_attempt):
         ProctoredExamStudentAttemptStatus.started
     )
 
-    # Log the exam start
+    # Log the exam start, a resumed attempt starts a new session
+    ProctoredExamSessionConnectionHistory.end_session(existing_attempt.id)
     ProctoredExamSessionConnectionHistory.log_start_time(
         existing_attempt.user,
         existing_attempt.proctored_exam.course_id,
@@ -0,0 +1,84 @@
+"""
+Heartbeats of the proctored exam attempts.
+
+Polls record the last poll time of the attempt, which is also the
+last echo of its session, in the cache only. The heartbeats are
+written to the database in bulk by the periodic flush, meanwhile the
+readers take the latest of the cached and the stored time.
+"""
+
+from __future__ import absolute_import
+
+from datetime import timedelta
+
+from django.core.cache import cache
+
+HEARTBEAT_CACHE_KEY = 'edx_proctoring.heartbeat.{attempt_id}'
+LAST_FLUSH_CACHE_KEY = 'edx_proctoring.heartbeat.last_flush'
+HEARTBEAT_CACHE_TIMEOUT = 60 * 60 * 24
+HEARTBEAT_FLUSH_BATCH_SIZE = 500
+# Heartbeats cached while the previous flush was running are flushed again
+HEARTBEAT_FLUSH_MARGIN = timedelta(minutes=1)
+
+
+def get_heartbeat(attempt_id):
+    """
+    Return the cached heartbeat of the attempt, a dict of
+    user_id, course_id, history_id and timestamp, or None.
+    """
+    return cache.get(HEARTBEAT_CACHE_KEY.format(attempt_id=attempt_id))
+
+
+def get_heartbeats(attempt_ids):
+    """
+    Return the cached heartbeats of the given attempts keyed by attempt id.
+    """
+    keys = {HEARTBEAT_CACHE_KEY.format(attempt_id=attempt_id): attempt_id for attempt_id in attempt_ids}
+    return {
+        keys[key]: heartbeat
+        for key, heartbeat in cache.get_many(list(keys)).items()
+    }
+
+
+def set_heartbeat(attempt_id, heartbeat):
+    """
+    Cache the heartbeat of the attempt.
+    """
+    cache.set(HEARTBEAT_CACHE_KEY.format(attempt_id=attempt_id), heartbeat, HEARTBEAT_CACHE_TIMEOUT)
+
+
+def delete_heartbeat(attempt_id):
+    """
+    Drop the cached heartbeat of the attempt.
+    """
+    cache.delete(HEARTBEAT_CACHE_KEY.format(attempt_id=attempt_id))
+
+
+def latest(timestamp, heartbeat):
+    """
+    Return the latest of the stored timestamp and the time of the heartbeat.
+    """
+    if heartbeat and (timestamp is None or heartbeat['timestamp'] > timestamp):
+        return heartbeat['timestamp']
+    return timestamp
+
+
+def get_last_poll_timestamp(attempt_id, last_poll_timestamp):
+    """
+    Return the last poll time of the attempt given its stored one.
+    """
+    return latest(last_poll_timestamp, get_heartbeat(attempt_id))
+
+
+def get_last_flush():
+    """
+    Return the time the heartbeats were last flushed.
+    """
+    return cache.get(LAST_FLUSH_CACHE_KEY)
+
+
+def set_last_flush(timestamp):
+    """
+    Record the time the heartbeats were flushed.
+    """
+    cache.set(LAST_FLUSH_CACHE_KEY, timestamp, HEARTBEAT_CACHE_TIMEOUT)
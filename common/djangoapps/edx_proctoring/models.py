@@ -19,7 +19,7 @@ from django.shortcuts import get_object_or_404
 from django.db.models.base import ObjectDoesNotExist
 from django.utils.translation import ugettext_noop
 
-from edx_proctoring import constants
+from edx_proctoring import constants, heartbeats
 from edx_proctoring.backends import get_backend_provider
 from edx_proctoring.exceptions import (
     AllowanceValueNotAllowedException,
@@ -29,6 +29,7 @@ from edx_proctoring.exceptions import (
 from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus, SoftwareSecureReviewStatus
 from openedx.custom.timed_exam.models import TimedExam
 from openedx.custom.notifications.tasks import notify_user_for_report_review
+from openedx.custom.utils import chunked
 from opaque_keys.edx.django.models import CourseKeyField
 
 USER_MODEL = get_user_model()
@@ -369,6 +370,14 @@ class ProctoredExamStudentAttempt(TimeStampedModel):
         verbose_name = 'proctored exam attempt'
         unique_together = (('user', 'proctored_exam'),)
 
+    def save(self, *args, **kwargs):  # pylint: disable=arguments-differ
+        """
+        Keep the last poll time of the cached heartbeat which may not be flushed yet.
+        """
+        if self.pk:
+            self.last_poll_timestamp = heartbeats.get_last_poll_timestamp(self.pk, self.last_poll_timestamp)
+        super(ProctoredExamStudentAttempt, self).save(*args, **kwargs)
+
     @classmethod
     def live_status(cls, user, course_id):
         timestamp = datetime.now(pytz.UTC)
@@ -382,7 +391,11 @@ class ProctoredExamStudentAttempt(TimeStampedModel):
         in_progress_attempt = cls.objects.filter(filtered_query).first()
         if not in_progress_attempt:
             return None
-        if (timestamp - in_progress_attempt.last_poll_timestamp).total_seconds() / 60 <= away_time_limit:
+        last_poll_timestamp = heartbeats.get_last_poll_timestamp(
+            in_progress_attempt.id,
+            in_progress_attempt.last_poll_timestamp,
+        )
+        if (timestamp - last_poll_timestamp).total_seconds() / 60 <= away_time_limit:
             return "attempting"
         else:
             return "dangling"
@@ -886,29 +899,100 @@ class ProctoredExamSessionConnectionHistory(ProctoredExamConnectionHistory):
             user=user,
         )
 
+    @classmethod
+    def end_session(cls, attempt_id):
+        """
+        Write the cached heartbeat of the attempt to its session history and
+        drop it, so the polls of a resumed attempt log its new session.
+        """
+        heartbeat = heartbeats.get_heartbeat(attempt_id)
+        if not heartbeat:
+            return
+        cls.objects.filter(id=heartbeat['history_id']).update(last_echo=heartbeat['timestamp'])
+        heartbeats.delete_heartbeat(attempt_id)
+
     @classmethod
     def log_poll_time(cls, user, attempt_id):
         """
         Log the last echo time, call from polling.
-        """
-        attempt = ProctoredExamStudentAttempt.objects.get_exam_attempt_by_id(attempt_id)
-        course_id = attempt.proctored_exam.course_id
-        timestamp = datetime.now(pytz.UTC)
-        attempt.last_poll_timestamp = timestamp
-        attempt.save()
 
-        # Get the existing entry
-        history = cls.objects.filter(
-            course_id=course_id,
-            user=user,
-        ).last()
-        if history:
-            # Call save to update last_echo, it is auto_now field
-            history.save()
-        else:
-            # create new log entry
-            cls.log_start_time(user, course_id)
+        The time is cached as the heartbeat of the attempt and written
+        to the attempt and its session history by `flush_heartbeats`.
+        Returns the logged time, or None if the attempt is not of the user.
+        """
+        heartbeat = heartbeats.get_heartbeat(attempt_id)
+        if not heartbeat:
+            attempt = ProctoredExamStudentAttempt.objects.get_exam_attempt_by_id(attempt_id)
+            if not attempt:
+                return None
+            course_id = attempt.proctored_exam.course_id
+            # Get the existing entry
+            history = cls.objects.filter(
+                course_id=course_id,
+                user_id=attempt.user_id,
+            ).last()
+            if not history:
+                # create new log entry
+                history = cls.objects.create(
+                    course_id=course_id,
+                    user_id=attempt.user_id,
+                )
+            heartbeat = {
+                'user_id': attempt.user_id,
+                'course_id': course_id,
+                'history_id': history.id,
+            }
+
+        if heartbeat['user_id'] != user.id:
+            return None
 
+        heartbeat['timestamp'] = datetime.now(pytz.UTC)
+        heartbeats.set_heartbeat(attempt_id, heartbeat)
+        return heartbeat['timestamp']
+
+    @classmethod
+    def flush_heartbeats(cls):
+        """
+        Write the cached heartbeats to the attempts and their session histories.
+
+        Heartbeats of the attempts in progress, or updated since the last
+        flush e.g. submitted, are written in bulk. Returns the number of
+        heartbeats written.
+        """
+        flushed_at = datetime.now(pytz.UTC)
+        last_flush = heartbeats.get_last_flush()
+        since = last_flush - heartbeats.HEARTBEAT_FLUSH_MARGIN if last_flush else None
+
+        query = Q(status__in=[
+            ProctoredExamStudentAttemptStatus.started,
+            ProctoredExamStudentAttemptStatus.ready_to_submit,
+        ])
+        if since:
+            query |= Q(modified__gte=since)
+        attempt_ids = ProctoredExamStudentAttempt.objects.filter(query).values_list('id', flat=True)
+
+        count = 0
+        for attempt_ids_chunk in chunked(attempt_ids.iterator(), heartbeats.HEARTBEAT_FLUSH_BATCH_SIZE):
+            attempts = []
+            histories = []
+            for attempt_id, heartbeat in heartbeats.get_heartbeats(attempt_ids_chunk).items():
+                if since and heartbeat['timestamp'] < since:
+                    # Flushed already
+                    continue
+                attempts.append(ProctoredExamStudentAttempt(
+                    id=attempt_id,
+                    last_poll_timestamp=heartbeat['timestamp'],
+                ))
+                histories.append(cls(
+                    id=heartbeat['history_id'],
+                    last_echo=heartbeat['timestamp'],
+                ))
+            ProctoredExamStudentAttempt.objects.bulk_update(attempts, ['last_poll_timestamp'])
+            cls.objects.bulk_update(histories, ['last_echo'])
+            count += len(attempts)
+
+        heartbeats.set_last_flush(flushed_at)
+        return count
 
     class Meta:
         app_label = 'edx_proctoring'
@@ -353,13 +353,12 @@ class StudentProctoredExamAttempt(ProctoredAPIView):
             raise ProctoredExamPermissionDenied(err_msg)
 
         # Log the poll time
-        ProctoredExamSessionConnectionHistory.log_poll_time(
+        last_poll_timestamp = ProctoredExamSessionConnectionHistory.log_poll_time(
             request.user,
             attempt_id,
         )
-
-        # Attempt modified, fetch it again
-        attempt = get_exam_attempt_by_id(attempt_id)
+        if last_poll_timestamp:
+            attempt['last_poll_timestamp'] = last_poll_timestamp
 
         # add in the computed time remaining as a helper
         time_remaining_seconds = get_time_remaining_for_attempt(attempt)
@@ -537,12 +536,12 @@ class StudentProctoredExamAttemptCollection(ProctoredAPIView):
             provider = get_backend_provider(exam)
 
             # Log the poll time
-            ProctoredExamSessionConnectionHistory.log_poll_time(
+            last_poll_timestamp = ProctoredExamSessionConnectionHistory.log_poll_time(
                 request.user,
                 attempt['id'],
             )
-            # Attempt modified, fetch it again
-            attempt = get_exam_attempt_by_id(attempt['id'])
+            if last_poll_timestamp:
+                attempt['last_poll_timestamp'] = last_poll_timestamp
 
             time_remaining_seconds = get_time_remaining_for_attempt(attempt)
 
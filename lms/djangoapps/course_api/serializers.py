@@ -98,6 +98,13 @@ class CourseSerializer(serializers.Serializer):  # pylint: disable=abstract-meth
     # 'course_id' is a deprecated field, please use 'id' instead.
     course_id = serializers.CharField(source='id', read_only=True)
 
+    def _get_course_enrichment(self, course_overview):
+        """
+        Return the user specific data of the course loaded by the view
+        for the whole page, if any.
+        """
+        return self.context.get('course_enrichment', {}).get(str(course_overview.id))
+
     def get_hidden(self, course_overview):
         """
         Get the representation for SerializerMethodField `hidden`
@@ -164,6 +171,10 @@ class CourseSerializer(serializers.Serializer):  # pylint: disable=abstract-meth
         if not request.user.is_authenticated:
             return False
 
+        enrichment = self._get_course_enrichment(course_overview)
+        if enrichment:
+            return enrichment['is_favorite']
+
         return Wishlist.objects.filter(
             course_key=course_overview.id,
             user=request.user
@@ -193,6 +204,13 @@ class CourseSerializer(serializers.Serializer):  # pylint: disable=abstract-meth
         Return average course rating and number
         of votes.
         """
+        enrichment = self._get_course_enrichment(course_overview)
+        if enrichment:
+            return {
+                "stars": enrichment['ratings']['avg_rating'],
+                "num_votes": enrichment['ratings']['num_reviews'],
+            }
+
         return {
             "stars": CourseRating.avg_rating(course_overview.id),
             "num_votes": CourseRating.num_reviews(course_overview.id),
@@ -203,6 +221,10 @@ class CourseSerializer(serializers.Serializer):  # pylint: disable=abstract-meth
         Return whether the current user is enrolled.
         """
         request = self.context['request']
+        enrichment = self._get_course_enrichment(course_overview)
+        if enrichment:
+            return enrichment['is_enrolled']
+
         if request.user.is_authenticated:
             return CourseEnrollment.is_enrolled(
                 request.user, course_overview.id
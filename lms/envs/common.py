@@ -4051,6 +4051,17 @@ VERIFY_STUDENT["SOFTWARE_SECURE"] = {
 PROCTORING_SNAP_INTERVAL_IN_SECONDS = 10
 PROCTORING_SNAP_WIDTH = 640
 PROCTORING_SNAP_HEIGHT = 480
+# Polls of the exam attempts are written to the database at this interval
+PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS = 30
+# Changes to the exams are reflected in their reports analytics after this delay
+TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS = 60
+# Analytics of the running exams are refreshed when older
+TIMED_EXAM_ANALYTICS_MAX_AGE_IN_SECONDS = 5 * 60
+# Proctoring reports of an exam are exported in the background by this many processes
+PROCTORING_REPORT_EXPORT_PROCESSES = 4
+# Number of reports rendered between two progress updates of an export
+PROCTORING_REPORT_EXPORT_BATCH_SIZE = 20
+PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS = 60 * 60
 AI_MODULE_URL = 'http://45.79.126.118:8001/'
 # Image verification request retry settings
 IMAGE_VERIFICATION_REQUEST_RETRY_DELAY = 60 * 60
@@ -4096,6 +4107,13 @@ TWILIO_FROM_NUMBER = 'SET-ME'
 ##################### TA3LEEM ############################
 API_CACHE_TIMEOUT = 3600  # Value is in seconds
 
+# Tashgheel notifications outbox
+TASHGHEEL_REQUEST_TIMEOUT_IN_SECONDS = 10
+TASHGHEEL_OUTBOX_BATCH_SIZE = 200
+TASHGHEEL_OUTBOX_MAX_ATTEMPTS = 8
+TASHGHEEL_OUTBOX_DRAIN_INTERVAL_IN_SECONDS = 60
+TASHGHEEL_OUTBOX_CLAIM_TIMEOUT_IN_SECONDS = 5 * 60
+
 #################### COUNTRIES ##################################
 COUNTRIES_ONLY = ['IQ']
 
@@ -4103,6 +4121,13 @@ COUNTRIES_ONLY = ['IQ']
 JITSI_SERVER_URL = "https://liveclass-ta3leem.dev.env.creativeadvtech.com"
 JITSI_SERVER_APP_ID = "ta3leem_jitsi_server"
 JITSI_SERVER_SECRET = "ta3leem_jitsi_server_secret"
+LIVE_CLASS_STATUS_TOKEN_MAX_AGE = 60 * 60 * 6
+# Seconds a lobby status poll is held until the class stage changes,
+# keep 0 (no holding) unless the LMS runs with asynchronous workers
+LIVE_CLASS_STATUS_LONG_POLL_TIMEOUT = 0
+LIVE_CLASS_STATUS_CHECK_INTERVAL = 1
+LIVE_CLASS_BOOKING_BATCH_SIZE = 1000
+LIVE_CLASS_AUTO_INVITE_CACHE_TIMEOUT = 60 * 60 * 24
 
 ################## COURSE FILTERATION SETTINGS #################
 COURSE_PER_PAGE = 9
@@ -4124,6 +4149,14 @@ XAPI_LRS_AUTHTOKEN = 'NjUwYTAwZTA2ODVhOGUxYmFlNTRjZmMxYTdmZTAwNTBkZGU5NDkwNzoyZm
 ##################### TA3LEEM CALENDAR SETTINGS ############################
 CALENDAR_FIRST_DAY_OF_WEEK = "sat"
 CALENDAR_DATE_FORMAT = "long"
+# Default reminders of the events are sent to this many learners per task
+CALENDAR_REMINDER_BATCH_SIZE = 500
+# Reminders missed by the previous runs of send_default_event_reminders are sent within this delay
+CALENDAR_REMINDER_CATCH_UP_IN_MINUTES = 30
+# Calendar events of the users are rebuilt in batches of this many users
+CALENDAR_EVENTS_BATCH_SIZE = 500
+# Calendar events are built by the LMS workers, the course dates need the LMS
+CALENDAR_EVENTS_ROUTING_KEY = 'edx.lms.core.default'
 
 FAILED_LOGGING_THROTTLE_LIMIT = 10
 
@@ -4137,6 +4170,17 @@ USER_TASKS_ARTIFACT_STORAGE = 'openedx.custom.storage.backend.S3TA3Storage'
 ############### FCM - PUSH NOTIFICATIONS ###########
 FCM_DJANGO_SETTINGS = {}
 
+NOTIFICATION_BULK_CREATE_BATCH_SIZE = 1000
+# Tokens per FCM request
+FCM_BATCH_SIZE = 500
+# Concurrent FCM requests of a personalized notification
+FCM_MAX_CONCURRENT_REQUESTS = 8
+NOTIFICATION_BROADCAST_RETRY_DELAY = 60
+NOTIFICATION_BROADCAST_MAX_RETRIES = 5
+
+# Cached counters of the unread notifications
+NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT = 60 * 60 * 24
+
 # TinyMCE Text Editor settings
 TINYMCE_JS_URL = '/static/js/vendor/tinymce/js/tinymce/tinymce.full.min.js'
 TINYMCE_DEFAULT_CONFIG = {
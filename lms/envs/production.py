@@ -959,11 +959,50 @@ PROCTORING_SNAP_INTERVAL_IN_SECONDS = ENV_TOKENS.get(
 )
 PROCTORING_SNAP_WIDTH = ENV_TOKENS.get('PROCTORING_SNAP_WIDTH', PROCTORING_SNAP_WIDTH)
 PROCTORING_SNAP_HEIGHT = ENV_TOKENS.get('PROCTORING_SNAP_HEIGHT', PROCTORING_SNAP_HEIGHT)
+PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS = ENV_TOKENS.get(
+    'PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS', PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS
+)
+CELERYBEAT_SCHEDULE['flush-proctoring-heartbeats'] = {
+    'task': 'openedx.custom.timed_exam.tasks.flush_proctoring_heartbeats',
+    'schedule': datetime.timedelta(seconds=PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS),
+}
+TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS = ENV_TOKENS.get(
+    'TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS', TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS
+)
+TIMED_EXAM_ANALYTICS_MAX_AGE_IN_SECONDS = ENV_TOKENS.get(
+    'TIMED_EXAM_ANALYTICS_MAX_AGE_IN_SECONDS', TIMED_EXAM_ANALYTICS_MAX_AGE_IN_SECONDS
+)
 
 # Proctoring report related settings
 PROCTORING_VIOLATION_PENALTY = ENV_TOKENS.get('PROCTORING_VIOLATION_PENALTY', PROCTORING_VIOLATION_PENALTY)
 PROCTORING_VIOLATION_IGNORE_LIMIT = ENV_TOKENS.get('PROCTORING_VIOLATION_IGNORE_LIMIT', PROCTORING_VIOLATION_IGNORE_LIMIT)
 PROCTORING_VIOLATION_WARN_LIMIT = ENV_TOKENS.get('PROCTORING_VIOLATION_WARN_LIMIT', PROCTORING_VIOLATION_WARN_LIMIT)
+PROCTORING_REPORT_EXPORT_PROCESSES = ENV_TOKENS.get(
+    'PROCTORING_REPORT_EXPORT_PROCESSES', PROCTORING_REPORT_EXPORT_PROCESSES
+)
+PROCTORING_REPORT_EXPORT_BATCH_SIZE = ENV_TOKENS.get(
+    'PROCTORING_REPORT_EXPORT_BATCH_SIZE', PROCTORING_REPORT_EXPORT_BATCH_SIZE
+)
+PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS = ENV_TOKENS.get(
+    'PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS', PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS
+)
+
+####################### TASHGHEEL NOTIFICATIONS OUTBOX ############################
+TASHGHEEL_REQUEST_TIMEOUT_IN_SECONDS = ENV_TOKENS.get(
+    'TASHGHEEL_REQUEST_TIMEOUT_IN_SECONDS', TASHGHEEL_REQUEST_TIMEOUT_IN_SECONDS
+)
+TASHGHEEL_OUTBOX_BATCH_SIZE = ENV_TOKENS.get('TASHGHEEL_OUTBOX_BATCH_SIZE', TASHGHEEL_OUTBOX_BATCH_SIZE)
+TASHGHEEL_OUTBOX_MAX_ATTEMPTS = ENV_TOKENS.get('TASHGHEEL_OUTBOX_MAX_ATTEMPTS', TASHGHEEL_OUTBOX_MAX_ATTEMPTS)
+TASHGHEEL_OUTBOX_DRAIN_INTERVAL_IN_SECONDS = ENV_TOKENS.get(
+    'TASHGHEEL_OUTBOX_DRAIN_INTERVAL_IN_SECONDS', TASHGHEEL_OUTBOX_DRAIN_INTERVAL_IN_SECONDS
+)
+TASHGHEEL_OUTBOX_CLAIM_TIMEOUT_IN_SECONDS = ENV_TOKENS.get(
+    'TASHGHEEL_OUTBOX_CLAIM_TIMEOUT_IN_SECONDS', TASHGHEEL_OUTBOX_CLAIM_TIMEOUT_IN_SECONDS
+)
+CELERYBEAT_SCHEDULE['drain-tashgheel-outbox'] = {
+    'task': 'openedx.custom.taleem.tasks.drain_tashgheel_outbox',
+    'schedule': datetime.timedelta(seconds=TASHGHEEL_OUTBOX_DRAIN_INTERVAL_IN_SECONDS),
+}
 
 ####################### TA3LEEM 2 FACTOR AUTHENTICATION ############################
 DISABLE_2FA = ENV_TOKENS.get('DISABLE_2FA', DISABLE_2FA)
@@ -981,6 +1020,15 @@ COUNTRIES_ONLY = ENV_TOKENS.get('COUNTRIES_ONLY', COUNTRIES_ONLY)
 JITSI_SERVER_URL = ENV_TOKENS.get('JITSI_SERVER_URL', JITSI_SERVER_URL)
 JITSI_SERVER_APP_ID = ENV_TOKENS.get('JITSI_SERVER_APP_ID', JITSI_SERVER_APP_ID)
 JITSI_SERVER_SECRET = ENV_TOKENS.get('JITSI_SERVER_SECRET', JITSI_SERVER_SECRET)
+LIVE_CLASS_STATUS_TOKEN_MAX_AGE = ENV_TOKENS.get('LIVE_CLASS_STATUS_TOKEN_MAX_AGE', LIVE_CLASS_STATUS_TOKEN_MAX_AGE)
+LIVE_CLASS_STATUS_LONG_POLL_TIMEOUT = ENV_TOKENS.get(
+    'LIVE_CLASS_STATUS_LONG_POLL_TIMEOUT', LIVE_CLASS_STATUS_LONG_POLL_TIMEOUT
+)
+LIVE_CLASS_STATUS_CHECK_INTERVAL = ENV_TOKENS.get('LIVE_CLASS_STATUS_CHECK_INTERVAL', LIVE_CLASS_STATUS_CHECK_INTERVAL)
+LIVE_CLASS_BOOKING_BATCH_SIZE = ENV_TOKENS.get('LIVE_CLASS_BOOKING_BATCH_SIZE', LIVE_CLASS_BOOKING_BATCH_SIZE)
+LIVE_CLASS_AUTO_INVITE_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'LIVE_CLASS_AUTO_INVITE_CACHE_TIMEOUT', LIVE_CLASS_AUTO_INVITE_CACHE_TIMEOUT
+)
 
 
 ################## COURSE FILTERATION SETTINGS ###################
@@ -1022,6 +1070,20 @@ IOS_APP_BUNDLE_ID = ENV_TOKENS.get('IOS_APP_BUNDLE_ID', 'com.creative.ta3leemapp
 
 ############### FCM - PUSH NOTIFICATIONS ###########
 FCM_DJANGO_SETTINGS = ENV_TOKENS.get('FCM_DJANGO_SETTINGS', FCM_DJANGO_SETTINGS)
+NOTIFICATION_BULK_CREATE_BATCH_SIZE = ENV_TOKENS.get(
+    'NOTIFICATION_BULK_CREATE_BATCH_SIZE', NOTIFICATION_BULK_CREATE_BATCH_SIZE
+)
+FCM_BATCH_SIZE = ENV_TOKENS.get('FCM_BATCH_SIZE', FCM_BATCH_SIZE)
+FCM_MAX_CONCURRENT_REQUESTS = ENV_TOKENS.get('FCM_MAX_CONCURRENT_REQUESTS', FCM_MAX_CONCURRENT_REQUESTS)
+NOTIFICATION_BROADCAST_RETRY_DELAY = ENV_TOKENS.get(
+    'NOTIFICATION_BROADCAST_RETRY_DELAY', NOTIFICATION_BROADCAST_RETRY_DELAY
+)
+NOTIFICATION_BROADCAST_MAX_RETRIES = ENV_TOKENS.get(
+    'NOTIFICATION_BROADCAST_MAX_RETRIES', NOTIFICATION_BROADCAST_MAX_RETRIES
+)
+NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT = ENV_TOKENS.get(
+    'NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT', NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT
+)
 
 ############### SENTRY ############################
 SENTRY_DSN = ENV_TOKENS.get('SENTRY_DSN', '')
@@ -1049,6 +1111,12 @@ XAPI_LRS_AUTHTOKEN = ENV_TOKENS.get('XAPI_LRS_AUTHTOKEN', XAPI_LRS_AUTHTOKEN)
 ##################### TA3LEEM CALENDAR SETTINGS ############################
 CALENDAR_FIRST_DAY_OF_WEEK = ENV_TOKENS.get('CALENDAR_FIRST_DAY_OF_WEEK', CALENDAR_FIRST_DAY_OF_WEEK)
 CALENDAR_DATE_FORMAT = ENV_TOKENS.get('CALENDAR_DATE_FORMAT', CALENDAR_DATE_FORMAT)
+CALENDAR_REMINDER_BATCH_SIZE = ENV_TOKENS.get('CALENDAR_REMINDER_BATCH_SIZE', CALENDAR_REMINDER_BATCH_SIZE)
+CALENDAR_REMINDER_CATCH_UP_IN_MINUTES = ENV_TOKENS.get(
+    'CALENDAR_REMINDER_CATCH_UP_IN_MINUTES', CALENDAR_REMINDER_CATCH_UP_IN_MINUTES
+)
+CALENDAR_EVENTS_BATCH_SIZE = ENV_TOKENS.get('CALENDAR_EVENTS_BATCH_SIZE', CALENDAR_EVENTS_BATCH_SIZE)
+CALENDAR_EVENTS_ROUTING_KEY = ENV_TOKENS.get('CALENDAR_EVENTS_ROUTING_KEY', CALENDAR_EVENTS_ROUTING_KEY)
 
 # Identifier included in the User Agent from Ta3leem mobile apps.
 MOBILE_APP_USER_AGENT_REGEXES = ENV_TOKENS.get(
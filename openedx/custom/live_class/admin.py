@@ -14,6 +14,7 @@ class LiveClassAdmin(admin.ModelAdmin):
         'id',
         'name',
         'seats',
+        'booked_seats',
         'price',
     ]
     list_filter = [
@@ -35,6 +36,13 @@ class LiveClassBookingAdmin(admin.ModelAdmin):
         'live_class'
     ]
 
+    def save_model(self, request, obj, form, change):
+        super(LiveClassBookingAdmin, self).save_model(request, obj, form, change)
+        # Keep the booked seats of the previous and the new class up to date
+        LiveClass.count_booked_seats(
+            [obj.live_class_id] + ([form.initial['live_class']] if change else [])
+        )
+
 @admin.register(LiveClassAttendance)
 class LiveClassAttendanceAdmin(admin.ModelAdmin):
     """
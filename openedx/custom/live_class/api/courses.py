@@ -35,10 +35,10 @@ def get_course_with_access(user, course_key):
     return live_class
 
 
-def get_live_courses(stage=None):
+def get_live_courses(stage=None, user=None):
     """
     Given the stage look up the live classes
-    queryset.
+    queryset, annotated with whether the given user has booked them.
     """
     stages = [stage] if stage else [LiveClass.RUNNING, LiveClass.SCHEDULED]
     _filters = {
@@ -58,13 +58,20 @@ def get_live_courses(stage=None):
             end=EndDate('scheduled_on')
         ).filter(end__gte=timezone.now())
 
+    if user:
+        courses = LiveClass.annotate_has_booked(courses, user)
+
     return courses.order_by('scheduled_on')
 
 
 def my_live_classes(user):
     at_the_moment = timezone.now()
-    classes_teach = LiveClass.objects.filter(moderator=user.ta3leem_profile)
-    classes_learn = LiveClass.objects.filter(bookings__user=user)
+    classes_teach = LiveClass.annotate_has_booked(
+        LiveClass.objects.filter(moderator=user.ta3leem_profile), user
+    )
+    classes_learn = LiveClass.annotate_has_booked(
+        LiveClass.objects.filter(bookings__user=user), user
+    )
     return sorted(
         chain(classes_learn, classes_teach),
         key=lambda live_class: abs(live_class.scheduled_on - at_the_moment)
@@ -114,6 +114,9 @@ class LiveCourseSerializer(serializers.Serializer):  # pylint: disable=abstract-
         request = self.context['request']
         if not request.user.is_authenticated:
             return False
+        # Annotated by the listings
+        if hasattr(live_class, 'user_has_booked'):
+            return live_class.user_has_booked
         return live_class.has_booked(request.user)
 
 class LiveCourseDetailSerializer(LiveCourseSerializer):  # pylint: disable=abstract-method
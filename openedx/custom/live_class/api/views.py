@@ -19,7 +19,7 @@ from edx_rest_framework_extensions.auth.session.authentication import SessionAut
 from openedx.core.lib.api.authentication import BearerAuthenticationAllowInactiveUser
 
 from openedx.core.lib.api.view_utils import DeveloperErrorViewMixin, view_auth_classes
-from openedx.custom.live_class.models import LiveClass, LiveClassBooking, LiveClassAttendance
+from openedx.custom.live_class.models import LiveClass, LiveClassAttendance
 from openedx.custom.notifications.constants import NotificationTypes
 from openedx.custom.notifications.utils import notify_user
 
@@ -228,7 +228,7 @@ class LiveCourseListView(DeveloperErrorViewMixin, ListAPIView):
         if not form.is_valid():
             raise ValidationError(form.errors)
 
-        return get_live_courses(stage=form.cleaned_data['stage'])
+        return get_live_courses(stage=form.cleaned_data['stage'], user=self.request.user)
 
 
 class LiveCourseEnrollmentView(APIView):
@@ -390,10 +390,16 @@ class LiveCourseEnrollmentView(APIView):
                 }
             )
 
-        booking, created = LiveClassBooking.objects.get_or_create(
-            user=user,
-            live_class=live_class,
-        )
+        booking, created = live_class.book(user)
+        if not booking:
+            return Response(
+                status=status.HTTP_403_FORBIDDEN,
+                data={
+                    "message": u"Course '{course_id}' is full.".format(
+                        course_id=course_id
+                    )
+                }
+            )
         if created:
             notify_user(
                 user=user,
@@ -0,0 +1,43 @@
+from logging import getLogger
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F
+
+from openedx.custom.live_class.models import LiveClass
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    This command attempts to:
+        Compute the booked seats of the live classes from their bookings,
+        fixing the classes whose counter drifted.
+    Example usage:
+        $ ./manage.py lms reconcile_live_class_seats
+        $ ./manage.py lms reconcile_live_class_seats --classes 220041e0-df6c-4008-9de8-4235af96023f
+    """
+    help = 'Command to reconcile the booked seats of the live classes with their bookings.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--classes',
+            nargs='+',
+            help='Reconcile the given live classes only.',
+        )
+
+    def handle(self, *args, **options):
+        live_classes = LiveClass.objects.all()
+        if options['classes']:
+            live_classes = live_classes.filter(id__in=options['classes'])
+
+        drifted = list(
+            live_classes.annotate(
+                bookings_count=Count('bookings'),
+            ).exclude(
+                booked_seats=F('bookings_count'),
+            ).values_list('id', flat=True)
+        )
+        if drifted:
+            LiveClass.count_booked_seats(drifted)
+        logger.info("Reconciled the booked seats of {} live classes".format(len(drifted)))
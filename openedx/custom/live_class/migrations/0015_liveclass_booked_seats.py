@@ -0,0 +1,35 @@
+# Generated by Django 2.2.16 on 2026-10-18 10:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def apply_migration(apps, schema_editor):
+    LiveClass = apps.get_model('live_class', 'LiveClass')
+    LiveClassBooking = apps.get_model('live_class', 'LiveClassBooking')
+    LiveClass.objects.update(booked_seats=Coalesce(
+        Subquery(
+            LiveClassBooking.objects.filter(
+                live_class=OuterRef('pk'),
+            ).values('live_class').annotate(count=Count('id')).values('count'),
+            output_field=models.PositiveIntegerField(),
+        ),
+        0,
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('live_class', '0014_auto_20221202_1417'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='liveclass',
+            name='booked_seats',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(apply_migration, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('live_class', '0015_liveclass_booked_seats'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='liveclass',
+            name='scheduled_on',
+            field=models.DateTimeField(db_index=True, verbose_name='Scheduled On'),
+        ),
+    ]
@@ -9,8 +9,10 @@ from datetime import timedelta
 from decimal import Decimal
 
 from django.contrib.auth.models import User
-from django.db import models
-from django.db.models import Q, Sum
+from django.db import models, transaction
+from django.db.models import Case, Count, Exists, F, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.dispatch import Signal
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 from django.utils.translation import ugettext
@@ -25,6 +27,10 @@ from openedx.custom.utils import utc_datetime_to_local_datetime
 
 log = logging.getLogger(__name__)
 
+# Sent once the bookings of the classes are changed in bulk, bypassing the model signals,
+# along with the users booked if only new bookings of these users were added
+BOOKINGS_CHANGED = Signal(providing_args=["live_class_ids", "user_ids"])
+
 
 class LiveClass(TimeStampedModel):
     """
@@ -61,9 +67,11 @@ class LiveClass(TimeStampedModel):
     name = models.CharField(_("Name"), max_length=255)
     description = HTMLField(_("Description"), null=True)
     poster = models.ImageField(_("Poster"), upload_to='live_classes', null=True, blank=True)
-    scheduled_on = models.DateTimeField(_("Scheduled On"))
+    scheduled_on = models.DateTimeField(_("Scheduled On"), db_index=True)
     duration = models.PositiveSmallIntegerField(_("Duration"), default=60)
     seats = models.PositiveSmallIntegerField(_("Seats"), default=150)
+    # Number of the bookings, kept up to date as the class is booked
+    booked_seats = models.PositiveIntegerField(default=0, editable=False)
     price = models.PositiveSmallIntegerField(_("Price"), default=0)
     moderator = models.ForeignKey(
         Ta3leemUserProfile,
@@ -118,13 +126,77 @@ class LiveClass(TimeStampedModel):
 
     @property
     def seats_left(self):
-        return self.seats - self.bookings.count()
+        return self.seats - self.booked_seats
 
     def has_booked(self, user):
         if user_is_teacher(user):
             return user == self.moderator.user
         return self.bookings.filter(user=user).exists()
 
+    @classmethod
+    def annotate_has_booked(cls, queryset, user):
+        """
+        Annotate `user_has_booked` on the classes of the queryset, as returned by has_booked.
+        """
+        if not user.is_authenticated:
+            return queryset.annotate(user_has_booked=Value(False, output_field=models.BooleanField()))
+        if user_is_teacher(user):
+            return queryset.annotate(user_has_booked=Case(
+                When(moderator__user=user, then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ))
+        return queryset.annotate(user_has_booked=Exists(
+            LiveClassBooking.objects.filter(live_class=OuterRef('pk'), user=user)
+        ))
+
+    def book(self, user):
+        """
+        Book a seat of the class for the user.
+
+        The seat is taken by a conditional update, so concurrent bookings
+        never exceed the seats of the class. Returns (booking, created),
+        the booking is None if the class is full.
+        """
+        booking = self.bookings.filter(user=user).first()
+        if booking:
+            return booking, False
+
+        with transaction.atomic():
+            if not LiveClass.objects.filter(id=self.id, booked_seats__lt=F('seats')).update(
+                booked_seats=F('booked_seats') + 1
+            ):
+                return None, False
+            booking, created = LiveClassBooking.objects.get_or_create(user=user, live_class=self)
+            if not created:
+                # Booked by a concurrent request
+                LiveClass.objects.filter(id=self.id).update(booked_seats=F('booked_seats') - 1)
+
+        self.refresh_from_db(fields=['booked_seats'])
+        return booking, created
+
+    @classmethod
+    def count_booked_seats(cls, live_class_ids=None, user_ids=None):
+        """
+        Compute the booked seats of the given classes, or of all the
+        classes, from their bookings e.g. after inserting bookings in bulk.
+
+        The users booked in bulk are given if only their bookings were added.
+        """
+        live_classes = cls.objects.all()
+        if live_class_ids is not None:
+            live_classes = live_classes.filter(id__in=live_class_ids)
+            BOOKINGS_CHANGED.send(sender=cls, live_class_ids=live_class_ids, user_ids=user_ids)
+        return live_classes.update(booked_seats=Coalesce(
+            Subquery(
+                LiveClassBooking.objects.filter(
+                    live_class=OuterRef('pk'),
+                ).values('live_class').annotate(count=Count('id')).values('count'),
+                output_field=models.PositiveIntegerField(),
+            ),
+            0,
+        ))
+
     @classmethod
     def upcoming_classes(cls):
         right_now = timezone.now()
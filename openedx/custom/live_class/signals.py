@@ -2,11 +2,17 @@
 Live class signals and handlers.
 """
 
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from course_modes.models import CourseMode
 from student.signals import ENROLL_STATUS_CHANGE
+from xmodule.modulestore.django import SignalHandler
 
+from .models import LiveClass, LiveClassBooking
+from .status import publish_stage, unpublish_stage
 from .tasks import sync_enrollments
+from .utils import invalidate_auto_invite_live_class_ids
 
 @receiver(ENROLL_STATUS_CHANGE)
 def post_enrollment_live_class(sender, event=None, user=None, **kwargs):
@@ -15,3 +21,35 @@ def post_enrollment_live_class(sender, event=None, user=None, **kwargs):
 
     # Handle time taking op in background
     sync_enrollments.delay(user.id, str(kwargs.get('course_id')), event)
+
+
+@receiver(SignalHandler.course_published)
+def invalidate_auto_invite_live_classes(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Drop the cached live classes of the course, the blocks may have changed.
+    """
+    invalidate_auto_invite_live_class_ids(course_key)
+
+
+@receiver(post_save, sender=LiveClass)
+def publish_live_class_stage(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Wake up the users waiting for the class, e.g. once started or ended.
+    """
+    publish_stage(instance)
+
+
+@receiver(post_delete, sender=LiveClass)
+def unpublish_live_class_stage(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    unpublish_stage(instance)
+
+
+@receiver(post_delete, sender=LiveClassBooking)
+def release_live_class_seat(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Release the seat of the deleted booking.
+    """
+    LiveClass.objects.filter(
+        id=instance.live_class_id,
+        booked_seats__gt=0,
+    ).update(booked_seats=F('booked_seats') - 1)
@@ -0,0 +1,85 @@
+"""
+Stage of the live classes, cached for the lobby.
+
+Users waiting for a class to start follow the version of its stage,
+published to the cache whenever the class is saved, so the status polls
+are answered from the cache. The access to the lobby is checked once,
+the status polls carry a signed token instead.
+"""
+
+
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+
+from openedx.custom.live_class.models import LiveClass
+
+STAGE_CACHE_KEY = 'live_class.stage.{class_id}'
+STAGE_CACHE_TIMEOUT = 60 * 60 * 24
+STATUS_TOKEN_SALT = 'live_class.status'
+
+
+def publish_stage(live_class):
+    """
+    Cache the stage of the class, waking up the users waiting for it.
+    """
+    status = {
+        'stage': live_class.stage,
+        'version': live_class.modified.isoformat(),
+    }
+    cache.set(STAGE_CACHE_KEY.format(class_id=live_class.id), status, STAGE_CACHE_TIMEOUT)
+    return status
+
+
+def unpublish_stage(live_class):
+    cache.delete(STAGE_CACHE_KEY.format(class_id=live_class.id))
+
+
+def get_stage(class_id):
+    """
+    Return the stage of the class and its version, None if the class does not exist.
+    """
+    status = cache.get(STAGE_CACHE_KEY.format(class_id=class_id))
+    if status is None:
+        live_class = LiveClass.objects.filter(id=class_id).only('stage', 'modified').first()
+        if live_class:
+            status = publish_stage(live_class)
+    return status
+
+
+def wait_for_stage_change(class_id, version, timeout):
+    """
+    Return the stage of the class once its version differs from
+    the given one, or the current stage after `timeout` seconds.
+    """
+    deadline = time.time() + timeout
+    status = get_stage(class_id)
+    while status and status['version'] == version and time.time() < deadline:
+        time.sleep(settings.LIVE_CLASS_STATUS_CHECK_INTERVAL)
+        status = get_stage(class_id)
+    return status
+
+
+def get_status_token(live_class, user, is_moderator):
+    """
+    Return the token allowing the user to follow the status of the class.
+    """
+    return signing.dumps(
+        {'class_id': str(live_class.id), 'user_id': user.id, 'moderator': is_moderator},
+        salt=STATUS_TOKEN_SALT,
+    )
+
+
+def load_status_token(token, class_id, user):
+    """
+    Return the data of the status token if issued for the class and the user, None otherwise.
+    """
+    try:
+        data = signing.loads(token, salt=STATUS_TOKEN_SALT, max_age=settings.LIVE_CLASS_STATUS_TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if data['class_id'] != str(class_id) or data['user_id'] != user.id:
+        return None
+    return data
@@ -6,12 +6,13 @@ import logging
 from celery.task import task
 from opaque_keys.edx.keys import CourseKey
 
-from xmodule.modulestore.django import modulestore
+from django.conf import settings
 from openedx.custom.utils import utc_datetime_to_local_datetime
 from openedx.custom.notifications.tasks import send_announcement_notification
 from student.models import EnrollStatusChange, CourseEnrollment
 
 from .models import LiveClass, LiveClassBooking
+from .utils import get_auto_invite_live_class_ids
 
 log = logging.getLogger(__name__)
 
@@ -23,24 +24,22 @@ def sync_enrollments(user_id, course_id, event):
     as the user joined/left the course.
     """
     # Get the live classes mapped to the course
-    live_classes = [
-        block.live_class_id
-        for block in modulestore().get_items(
-            CourseKey.from_string(course_id),
-            qualifiers={'category': 'liveclass'}
-        )
-        if block.live_class_id and block.auto_invite
-    ]
+    live_classes = get_auto_invite_live_class_ids(CourseKey.from_string(course_id))
+    if not live_classes:
+        return
 
     if event == EnrollStatusChange.enroll:
-        for live_class_id in live_classes:
-            try:
-                LiveClassBooking.objects.create(
-                    user_id=user_id,
-                    live_class_id=live_class_id,
-                )
-            except:
-                continue
+        # Classes removed since the course was published are skipped
+        live_classes = list(LiveClass.objects.filter(id__in=live_classes).values_list('id', flat=True))
+        LiveClassBooking.objects.bulk_create(
+            [
+                LiveClassBooking(user_id=user_id, live_class_id=live_class_id)
+                for live_class_id in live_classes
+            ],
+            batch_size=settings.LIVE_CLASS_BOOKING_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        LiveClass.count_booked_seats(live_classes, user_ids=[user_id])
     elif event == EnrollStatusChange.unenroll:
         LiveClassBooking.objects.filter(
             user_id=user_id,
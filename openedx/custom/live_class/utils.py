@@ -4,14 +4,16 @@ from six import text_type
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.exceptions import ValidationError
+from django.core.cache import cache
+from django.db.models import Q
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from xmodule.modulestore.django import modulestore
 
 from openedx.core.djangoapps.user_api.accounts.image_helpers import get_profile_image_urls_for_user
 from openedx.custom.live_class.models import LiveClass, LiveClassBooking
 from openedx.custom.notifications.constants import NotificationTypes
-from openedx.custom.notifications.utils import notify_user
+from openedx.custom.notifications.utils import notify_users
 from openedx.custom.taleem.utils import user_is_ta3leem_admin, user_is_teacher
 from openedx.custom.taleem_organization.models import OrganizationType
 from openedx.custom.timed_exam.exceptions import InvalidCSVDataError, InvalidEmailError
@@ -25,6 +27,8 @@ from openedx.custom.notifications.tasks import send_announcement_notification
 
 __MISSING_VALUE__ = object()
 
+AUTO_INVITE_CACHE_KEY = 'live_class.auto_invite.{course_key}'
+
 TOOLBAR_BUTTONS = [
     'microphone', 'camera', 'closedcaptions', 'fullscreen', 'fodeviceselection',
     'hangup', 'chat', 'etherpad', 'shareaudio', 'raisehand', 'videoquality',
@@ -61,6 +65,23 @@ def can_browse_live_class(live_class, user):
     return False
 
 
+def get_browsable_live_classes(user, live_classes):
+    """
+    Filter the live classes the user can browse in one query, as checked by can_browse_live_class.
+    """
+    browsable = Q(class_type=LiveClass.PUBLIC)
+    user_organization = user.ta3leem_profile.organization
+    if user_organization:
+        at_institution = Q(
+            class_type=LiveClass.PUBLIC_AT_INSTITUTION,
+            moderator__organization=user_organization,
+        )
+        if user_organization.type != OrganizationType.SCHOOL:
+            at_institution &= Q(moderator__department__in=user.ta3leem_profile.department.all())
+        browsable |= at_institution
+    return live_classes.filter(browsable).distinct()
+
+
 def generate_jwt_token(user, is_teacher, live_class):
     payload = {}
 
@@ -115,6 +136,30 @@ def get_all_live_classes(user):
     return live_classes
 
 
+def get_auto_invite_live_class_ids(course_key):
+    """
+    Return the ids of the live classes the learners of the course are
+    booked in, cached until the course is published again.
+    """
+    cache_key = AUTO_INVITE_CACHE_KEY.format(course_key=course_key)
+    live_class_ids = cache.get(cache_key)
+    if live_class_ids is None:
+        live_class_ids = [
+            block.live_class_id
+            for block in modulestore().get_items(
+                course_key,
+                qualifiers={'category': 'liveclass'}
+            )
+            if block.live_class_id and block.auto_invite
+        ]
+        cache.set(cache_key, live_class_ids, settings.LIVE_CLASS_AUTO_INVITE_CACHE_TIMEOUT)
+    return live_class_ids
+
+
+def invalidate_auto_invite_live_class_ids(course_key):
+    cache.delete(AUTO_INVITE_CACHE_KEY.format(course_key=course_key))
+
+
 def enroll_in_live_class(request, live_class):
     """
     Enrol the given emails in given Timed exam.
@@ -130,27 +175,24 @@ def enroll_in_live_class(request, live_class):
     """
     students_data = []
     invalid_emails = []
-    total_email_count = 0
 
     if request.FILES:
-        for row in parse_csv(request.FILES['book_csv_file']):
-            try:
-                total_email_count += 1
-                validate_student_email(row['email'])
-            except ValidationError:
-                invalid_emails.append(row['email'])
-            else:
-                students_data.append({'email': row['email']})
-        validate_students_data(students_data)
+        rows = list(parse_csv(request.FILES['book_csv_file']))
+        validate_students_data(rows)
+        emails = [row['email'] for row in rows]
     else:
-        for email in convert_comma_separated_string_to_list(request.POST['student_email']):
-            try:
-                total_email_count += 1
-                validate_student_email(email)
-            except ValidationError:
-                invalid_emails.append(email)
-            else:
-                students_data.append({'email': email})
+        emails = convert_comma_separated_string_to_list(request.POST['student_email'])
+
+    total_email_count = len(emails)
+    # Emails are matched case insensitively, as by the database
+    existing_emails = {
+        email.lower() for email in User.objects.filter(email__in=emails).values_list('email', flat=True)
+    }
+    for email in emails:
+        if email.lower() in existing_emails:
+            students_data.append({'email': email})
+        else:
+            invalid_emails.append(email)
 
     enroll_user_in_live_class(students_data, live_class)
 
@@ -187,43 +229,42 @@ def validate_students_data(students_data):
             )
 
 
-def validate_student_email(student_email):
-    """
-    Validate that student with the given email address exists.
-    """
-    try:
-        User.objects.get(email=student_email)
-    except User.DoesNotExist:
-        raise ValidationError(message="User doesn't Exists with email: {}".format(student_email))
-
-
 def enroll_user_in_live_class(students_data, live_class):
     """
-    Create the Booking Object for user.
+    Create the Booking Objects for the users.
+
+    The users are resolved in one query and the bookings are inserted in
+    bulk, only the users not booked already are notified.
 
     Arguments:
         students_data (list<dict>): Each dict will contain the following fields
             1. email (str): Email address of the user that needs to be enrolled
         live_class (LiveClass): The live class object for the booking.
     """
-    users_to_be_notified = []
-    for student_data in students_data:
-        student_email = student_data['email']
-        student = User.objects.get(email=student_email)
-        _, created = LiveClassBooking.objects.get_or_create(
-            user=student,
-            live_class=live_class
-        )
+    emails = [student_data['email'] for student_data in students_data]
+    user_ids = set(User.objects.filter(email__in=emails).values_list('id', flat=True))
+    user_ids -= set(
+        LiveClassBooking.objects.filter(
+            live_class=live_class,
+            user_id__in=user_ids,
+        ).values_list('user_id', flat=True)
+    )
+    users_to_be_notified = sorted(user_ids)
+    LiveClassBooking.objects.bulk_create(
+        [LiveClassBooking(user_id=user_id, live_class=live_class) for user_id in users_to_be_notified],
+        batch_size=settings.LIVE_CLASS_BOOKING_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    LiveClass.count_booked_seats([live_class.id], user_ids=users_to_be_notified)
 
-        if created:
-            users_to_be_notified.append(student.id)
-            notify_user(
-                user=student,
-                notification_type=NotificationTypes.LIVE_CLASS_BOOKED,
-                notification_message="You have been enrolled in new live class {{live_class_name:{live_class_name}}}".format(
-                    live_class_name=live_class.name,
-                )
+    if users_to_be_notified:
+        notify_users(
+            users_to_be_notified,
+            notification_type=NotificationTypes.LIVE_CLASS_BOOKED,
+            notification_message="You have been enrolled in new live class {{live_class_name:{live_class_name}}}".format(
+                live_class_name=live_class.name,
             )
+        )
     # send notification in background
     if users_to_be_notified:
         send_announcement_notification.delay(
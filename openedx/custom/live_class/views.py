@@ -25,10 +25,11 @@ from openedx.custom.live_class.models import (
     LiveClassAttendance,
     LiveClassBooking
 )
+from openedx.custom.live_class.status import get_status_token, load_status_token, wait_for_stage_change
 from openedx.custom.live_class.utils import (
-    can_browse_live_class,
     enroll_in_live_class,
     generate_jwt_token,
+    get_browsable_live_classes,
     get_class_url,
     get_class_settings,
 )
@@ -46,15 +47,12 @@ def browse_classes(request):
     """
     Function responsible for showing the live classes for browsing.
     """
-    live_classes = []
     if request.user.is_authenticated:
         live_class_qs = LiveClass.objects.prefetch_related('moderator').filter(
             stage__in=[LiveClass.SCHEDULED, LiveClass.RUNNING],
             class_type__in=[LiveClass.PUBLIC, LiveClass.PUBLIC_AT_INSTITUTION]
         )
-        for live_class in live_class_qs.iterator():
-            if can_browse_live_class(live_class, request.user):
-                live_classes.append(live_class)
+        live_classes = get_browsable_live_classes(request.user, live_class_qs)
     else:
         live_classes = LiveClass.objects.filter(
             stage=LiveClass.SCHEDULED,
@@ -86,13 +84,9 @@ def book_class(request, pk):
     if not live_class.seats_left or live_class.is_paid:
         return HttpResponseForbidden("Action not allowed.")
 
-    try:
-        LiveClassBooking.objects.create(
-            user=request.user,
-            live_class=live_class,
-        )
-    except Exception as e:
-        log.error(str(e))
+    booking, _ = live_class.book(request.user)
+    if not booking:
+        return HttpResponseForbidden("Action not allowed.")
 
     return redirect(reverse('dashboard'))
 
@@ -242,6 +236,10 @@ def go_to_class(request, class_id):
         context.update({
             'expired': expired,
             'long_poll': -15 <= minutes <= threshold_period,
+            'status_token': get_status_token(live_class, user, is_moderator),
+            'stage_version': live_class.modified.isoformat(),
+            # The status is held by the server when long polling
+            'status_poll_delay': 0 if settings.LIVE_CLASS_STATUS_LONG_POLL_TIMEOUT else 5000,
         })
 
     return render_to_response('live_class/jitsi_class.html', context)
@@ -250,8 +248,34 @@ def go_to_class(request, class_id):
 @login_required
 @ensure_csrf_cookie
 def live_class_status(request, class_id):
-    live_class = get_object_or_404(LiveClass, id=class_id)
+    """
+    Status of the class for the users waiting in the lobby.
+
+    Learners holding the status token of the lobby are answered from the
+    cached stage, held until the stage changes when long polling.
+    """
     user = request.user
+    token = load_status_token(request.POST.get('token', ''), class_id, user)
+    # Teachers may start the class within a time window, checked below
+    if token and not token['moderator']:
+        status = wait_for_stage_change(
+            class_id,
+            request.POST.get('version'),
+            settings.LIVE_CLASS_STATUS_LONG_POLL_TIMEOUT,
+        )
+        if status is None:
+            return HttpResponseForbidden("Action not allowed.")
+        join_url = ''
+        if status['stage'] == LiveClass.RUNNING:
+            join_url = reverse('running_class', kwargs={'class_id': class_id})
+        return JsonResponse({
+            'continue_polling': not join_url,
+            'join_url': join_url,
+            'class_status': status['stage'],
+            'version': status['version'],
+        })
+
+    live_class = get_object_or_404(LiveClass, id=class_id)
     is_admin = user.is_superuser or user_is_ta3leem_admin(user)
     is_moderator = user.ta3leem_profile == live_class.moderator
 
@@ -271,7 +295,8 @@ def live_class_status(request, class_id):
     return JsonResponse({
         'continue_polling': not join_url,
         'join_url': join_url,
-        'class_status': live_class.stage
+        'class_status': live_class.stage,
+        'version': live_class.modified.isoformat(),
     })
 
 
@@ -8,6 +8,7 @@ from django.contrib import admin
 
 from .models import (
     NotificationMessage,
+    NotificationBroadcast,
     EventReminderSettings,
     MutedPost,
     NotificationPreference,
@@ -30,6 +31,29 @@ class NotificationMessageAdmin(admin.ModelAdmin):
     search_fields = ['id', 'title', 'message']
 
 
+@admin.register(NotificationBroadcast)
+class NotificationBroadcastAdmin(admin.ModelAdmin):
+    """
+    Simple, admin page to follow the progress of the broadcasts.
+    """
+    list_display = [
+        'id',
+        'notification_id',
+        'message',
+        'course_key',
+        'stage',
+        'total_users',
+        'total_devices',
+        'dispatched_batches',
+        'pushed_batches',
+        'failed_batches',
+        'error',
+        'modified',
+    ]
+    list_filter = ['stage']
+    search_fields = ['notification_id', 'title', 'message']
+
+
 @admin.register(MutedPost)
 class MutedPostAdmin(admin.ModelAdmin):
     """
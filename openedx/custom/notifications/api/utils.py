@@ -4,22 +4,26 @@ API utils for notification app.
 
 
 import re
+import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 
+from django.conf import settings
 from fcm_django.fcm import fcm_send_bulk_message
 from fcm_django.models import FCMDevice
 
+from openedx.custom.notifications import counters
 from openedx.custom.notifications.models import NotificationMessage
+from openedx.custom.utils import chunked
 
 log = logging.getLogger(__name__)
 
+# FCM errors of the tokens no longer valid
+DEAD_TOKEN_ERRORS = ('NotRegistered', 'InvalidRegistration')
+
 
 def count_unread_notifications(user, course_id):
-    return NotificationMessage.objects.filter(
-        user=user,
-        course_key=course_id,
-        read=False,
-    ).exclude(data={}).count()
+    return counters.get_unread_count(user, course_id)
 
 def get_user_devices(user_id):
     """
@@ -35,17 +39,26 @@ def get_user_devices(user_id):
     )
 
 
-def get_registration_ids(users, all_users=False):
+def get_users_devices(users):
     """
-    Get FCM tokens for the given users.
+    Get FCM tokens for the given users, grouped by user.
     """
-    if all_users:
-        return list(
-            FCMDevice.objects.filter(
-                active=True,
-            ).values_list("registration_id", flat=True)
-        )
+    devices = {}
+    for user_id, registration_id in FCMDevice.objects.filter(
+        user_id__in=users,
+        active=True,
+    ).values_list("user_id", "registration_id"):
+        devices.setdefault(user_id, []).append(registration_id)
+    return devices
 
+
+def get_registration_ids(users):
+    """
+    Get FCM tokens for the given users.
+
+    Notifications to all the users are sent by the broadcasts,
+    see openedx.custom.notifications.broadcasts.
+    """
     # get devices for the users
     return list(
         FCMDevice.objects.filter(
@@ -64,7 +77,6 @@ def add_notification_db(users, title, message,
     notification_id = data.get('id')
     if personalize:
         for user in users:
-            data.update(personalize.get(user, {}))
             notifications.append(
                 NotificationMessage(
                     user_id=user,
@@ -72,7 +84,7 @@ def add_notification_db(users, title, message,
                     message=message,
                     course_key=course_key,
                     notification_id=notification_id,
-                    data=data,
+                    data=dict(data, **personalize.get(user, {})),
                     resolve_link=resolve_link,
                 )
             )
@@ -90,34 +102,92 @@ def add_notification_db(users, title, message,
             for user in users
         ]
 
-    NotificationMessage.objects.bulk_create(notifications)
+    NotificationMessage.objects.bulk_create(
+        notifications,
+        batch_size=settings.NOTIFICATION_BULK_CREATE_BATCH_SIZE,
+    )
+    counters.increment(users, course_key, bool(data))
     log.info("Added {} notifications to DB".format(len(notifications)))
 
+def send_bulk_message(registration_ids, title, message, data):
+    """
+    Push the message to the given tokens in a single FCM request.
+
+    Returns the tokens FCM reported as no longer valid.
+    """
+    result = fcm_send_bulk_message(
+        registration_ids=registration_ids,
+        title=title,
+        body=message,
+        data=data,
+    )
+    log.info("FCM notification status: success {}, failure {}".format(
+        result.get('success'),
+        result.get('failure'),
+    ))
+    # Results are in the order of the tokens
+    return [
+        registration_id
+        for registration_id, response in zip(registration_ids, result.get('results', []))
+        if response.get('error') in DEAD_TOKEN_ERRORS
+    ]
+
+
+def deactivate_devices(registration_ids):
+    """
+    Stop pushing to the given tokens.
+    """
+    if registration_ids:
+        deactivated = FCMDevice.objects.filter(
+            registration_id__in=registration_ids,
+        ).update(active=False)
+        log.info("Deactivated {} FCM devices".format(deactivated))
+
+
 def push_notification_fcm(
-    users, title, message, data={}, personalize={}, all_users=False
+    users, title, message, data={}, personalize={}
 ):
     """
     FCM push notification and alerts.
+
+    Users sharing the same payload are pushed at once, the requests
+    are sent concurrently and the dead tokens are deactivated.
     """
 
     log.info("Sending FCM notification")
+    # payload: [registration_id]
+    groups = {}
     if personalize:
-        for user in users:
-            data.update(personalize.get(user, {}))
-            devices = get_user_devices(user)
-            if devices:
-                res = fcm_send_bulk_message(
-                    registration_ids=devices,
-                    title=title,
-                    body=message,
-                    data=data,
-                )
-                log.info("FCM notification status: {}".format(res))
+        for user_id, registration_ids in get_users_devices(users).items():
+            payload = dict(data, **personalize.get(user_id, {}))
+            key = json.dumps(payload, sort_keys=True, default=str)
+            groups.setdefault(key, (payload, []))[1].extend(registration_ids)
     else:
-        result = fcm_send_bulk_message(
-            registration_ids=get_registration_ids(users, all_users),
-            title=title,
-            body=message,
-            data=data,
-        )
-        log.info("FCM notification status: {}".format(result))
+        registration_ids = get_registration_ids(users)
+        if registration_ids:
+            groups[None] = (data, registration_ids)
+
+    batches = [
+        (payload, batch)
+        for payload, registration_ids in groups.values()
+        for batch in chunked(registration_ids, settings.FCM_BATCH_SIZE)
+    ]
+    if not batches:
+        return
+
+    dead_tokens = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=min(len(batches), settings.FCM_MAX_CONCURRENT_REQUESTS)) as executor:
+        futures = [
+            executor.submit(send_bulk_message, batch, title, message, payload)
+            for payload, batch in batches
+        ]
+        for future in futures:
+            try:
+                dead_tokens.extend(future.result())
+            except Exception:  # pylint: disable=broad-except
+                log.exception("FCM notification failed")
+                failed += 1
+
+    log.info("Sent {} FCM requests, {} failed".format(len(batches) - failed, failed))
+    deactivate_devices(dead_tokens)
@@ -4,6 +4,7 @@ HTTP end-points for the Notifications API.
 
 
 import logging
+from collections import OrderedDict
 from uuid import uuid4
 
 from django.contrib.auth.models import User
@@ -12,21 +13,28 @@ from django.utils.translation import ugettext as _
 from django.utils.translation import ugettext_noop
 
 import edx_api_doc_tools as apidocs
-from edx_rest_framework_extensions.paginators import DefaultPagination
 from rest_framework import permissions, status
+from rest_framework.exceptions import NotFound
 from rest_framework.generics import ListAPIView
 from rest_framework.mixins import CreateModelMixin
+from rest_framework.pagination import BasePagination, _positive_int
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 from edx_rest_framework_extensions.auth.jwt.authentication import JwtAuthentication
 from edx_rest_framework_extensions.auth.session.authentication import SessionAuthenticationAllowInactiveUser
 from openedx.core.lib.api.authentication import BearerAuthenticationAllowInactiveUser
-from openedx.custom.notifications.models import NotificationMessage, MutedPost, NotificationPreference
+from openedx.custom.notifications import counters
+from openedx.custom.notifications.broadcasts import create_broadcast
+from openedx.custom.notifications.models import (
+    NotificationMessage,
+    MutedPost,
+    NotificationPreference,
+)
 from fcm_django.api.rest_framework import FCMDeviceSerializer
 from fcm_django.models import FCMDevice
 from opaque_keys.edx.keys import CourseKey
-from student.models import CourseEnrollment
 
 from .serializers import NotificationSerializer
 from .mixins import DeviceViewSetMixin
@@ -39,26 +47,54 @@ log = logging.getLogger(__name__)
 DEFAULT_USER_MESSAGE = ugettext_noop(u'An error has occurred. Please try again.')
 
 
-class NotificationsPagination(DefaultPagination):
+class NotificationsPagination(BasePagination):
     """
     Paginator for notifications API.
+
+    The personal notifications and the broadcasts are merged as they are
+    read, so the pages follow the cursor of the last notification listed
+    instead of a page number.
     """
     page_size = 10
     max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
 
-    def get_paginated_response(self, data):
+    def paginate_messages(self, get_messages, request):
         """
-        Annotate the response with pagination information.
+        Return the page of the messages listed by `get_messages(cursor, limit)`.
         """
-        response = super(NotificationsPagination, self).get_paginated_response(data)
-
-        # Add `current_page` value, it's needed for pagination footer.
-        response.data["current_page"] = self.page.number
-
-        # Add `start` value, it's needed for the pagination header.
-        response.data["start"] = (self.page.number - 1) * self.get_page_size(self.request)
+        self.request = request
+        page_size = self.get_page_size(request)
+        try:
+            messages = get_messages(cursor=request.query_params.get(self.cursor_query_param), limit=page_size + 1)
+        except ValueError:
+            raise NotFound(_(u'Invalid cursor'))
+        self.has_next = len(messages) > page_size
+        self.page = messages[:page_size]
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.page[-1].cursor)
 
-        return response
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
 
 
 class NotificationsViewMixin(object):
@@ -115,6 +151,8 @@ class NotificationsListView(ListAPIView, NotificationsViewMixin):
 
         Each page in the list contains 10 notifications by default. The page
         size can be altered by passing parameter "page_size=<page_size>".
+        The next page is at the "next" link of the page, which passes the
+        "cursor" of the last notification of the page.
 
         **Use Cases**
 
@@ -131,6 +169,9 @@ class NotificationsListView(ListAPIView, NotificationsViewMixin):
                 If specified, filters notifications by course they belong to.
                 URL encode e.g. course-v1:x/y/z --> course-v1%3Ax%2Fy%2Fz
 
+            cursor (optional):
+                Lists the notifications after the given one, as passed by the "next" link.
+
         **Response Values**
 
             Body comprises a list of objects.
@@ -158,29 +199,30 @@ class NotificationsListView(ListAPIView, NotificationsViewMixin):
         """
         return super(NotificationsListView, self).get(request, *args, **kwargs)
 
-    def get_queryset(self):
+    def list(self, request, *args, **kwargs):
+        page = self.paginator.paginate_messages(self.get_messages, request)
+        serializer = self.get_serializer(page, many=True)
+        return self.paginator.get_paginated_response(serializer.data)
+
+    def get_messages(self, **kwargs):
         """
-        Returns queryset of notifications for GET requests.
+        Returns the notifications for GET requests.
 
-        The results will only include notifications for the request's user.
+        The results will only include notifications for the request's user,
+        along with the broadcasts the user is in the audience of.
         Note: It will exclude the records having `data` as empty JSON.
         """
-        user = self.request.user
-        receive_on = NotificationPreference.BOTH
-        if hasattr(user, 'notification_preferences'):
-            receive_on = user.notification_preferences.receive_on
-
-        course_key = self.request.data.get('course_key')
-        queryset = NotificationMessage.objects.filter(
-            user=user,
-        ).exclude(data={})
-        if course_key:
-            queryset = queryset.filter(course_key=course_key)
+        return NotificationMessage.get_messages(
+            self.request.user,
+            include_read=True,
+            receive_on=NotificationPreference.MOBILE,
+            course_key=self.request.data.get('course_key'),
+            with_data=True,
+            **kwargs
+        )
 
-        if receive_on not in (NotificationPreference.BOTH,
-            NotificationPreference.MOBILE):
-            queryset = queryset.exclude(title="Discussion")
-        return queryset
+    def get_queryset(self):
+        return self.get_messages()
 
     @apidocs.schema()
     def post(self, request, *unused_args, **unused_kwargs):
@@ -279,16 +321,17 @@ class NotificationsListView(ListAPIView, NotificationsViewMixin):
             data['course_id'] = course_key
             data['teacher_name'] = request.user.profile.name
 
-        if email:
-            users = list(User.objects.filter(
-                email=email,
-            ).values_list('id', flat=True))
-        else:
-            users = list(CourseEnrollment.objects.filter(
-                is_active=True,
-                course_id=course_key_obj,
-            ).values_list('user_id', flat=True))
+        if not email:
+            # Shared by the learners of the course
+            create_broadcast(title, message, course_key, data, push=False)
+            return Response(
+                {"success": True},
+                status=status.HTTP_200_OK
+            )
 
+        users = list(User.objects.filter(
+            email=email,
+        ).values_list('id', flat=True))
         for user_id in users:
             notification = NotificationMessage.objects.create(
                 user_id=user_id,
@@ -298,6 +341,7 @@ class NotificationsListView(ListAPIView, NotificationsViewMixin):
                 notification_id=notification_id,
                 data=data,
             )
+        counters.increment(users, course_key)
 
         return Response(
             {"success": True},
@@ -332,9 +376,9 @@ class NotificationsListView(ListAPIView, NotificationsViewMixin):
             NotificationMessage.mark_all_as_read(user)
         else:
             try:
-                NotificationMessage.objects.get(
+                NotificationMessage.get_for_user(
+                    user,
                     notification_id=notification_id,
-                    user=user
                 ).mark_as_read()
             except NotificationMessage.DoesNotExist:
                 error_message = ugettext_noop(u'Invalid id: {notification_id}.').format(notification_id=notification_id)
@@ -398,11 +442,7 @@ class HasCourseNotifications(APIView):
             }
         """
         return Response({
-            "has_notifications": NotificationMessage.objects.filter(
-                user=self.request.user,
-                course_key__isnull=False,
-                read=False,
-            ).exclude(data={}).exists(),
+            "has_notifications": counters.get_unread_count(self.request.user, counters.COURSES) > 0,
         })
 
 
@@ -0,0 +1,96 @@
+"""
+Notifications sent to all the users, or to the learners of a course.
+
+The notification of a broadcast is stored once, and pushed to the
+devices of its audience in batches of bounded size so memory does not
+grow with the number of users. The progress is recorded after every batch.
+"""
+
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from fcm_django.models import FCMDevice
+
+from openedx.custom.notifications import counters
+from openedx.custom.notifications.models import NotificationBroadcast
+from openedx.custom.utils import chunked
+
+log = logging.getLogger(__name__)
+
+# Counters of the audience of a course broadcast dropped at once
+COUNTERS_RESET_BATCH_SIZE = 1000
+
+
+def create_broadcast(title, message, course_key=None, data=None, resolve_link=None, push=True):
+    """
+    Store the notification to all the users, or to the learners of the course.
+    """
+    data = data or {}
+    broadcast = NotificationBroadcast.objects.create(
+        notification_id=data['id'],
+        title=title,
+        message=message,
+        course_key=course_key,
+        data=data,
+        resolve_link=resolve_link,
+        stage=NotificationBroadcast.PUSHING if push else NotificationBroadcast.DONE,
+        total_users=NotificationBroadcast.get_audience(course_key).count(),
+        total_devices=get_devices(course_key).count() if push else 0,
+    )
+    # Once committed, so the counters are not computed again without the broadcast
+    transaction.on_commit(lambda: reset_audience_counters(course_key))
+    return broadcast
+
+
+def reset_audience_counters(course_key=None):
+    """
+    Drop the unread counters of the audience of the broadcast, all the users if not set.
+    """
+    if not course_key:
+        counters.reset_all()
+        return
+    user_ids = NotificationBroadcast.get_audience(course_key).order_by().values_list('id', flat=True)
+    for chunk in chunked(user_ids.iterator(), COUNTERS_RESET_BATCH_SIZE):
+        counters.reset(chunk)
+
+
+def get_devices(course_key=None):
+    """
+    Return the active devices of the audience of the broadcast.
+    """
+    devices = FCMDevice.objects.filter(active=True)
+    if course_key:
+        devices = devices.filter(user__in=NotificationBroadcast.get_audience(course_key))
+    return devices
+
+
+def get_device_batches(broadcast):
+    """
+    Yield the (first, last) ids of the batches of the active
+    devices not pushed to yet, each batch is sent by one FCM request.
+    """
+    last_device_id = broadcast.last_device_id
+    while True:
+        device_ids = list(
+            get_devices(broadcast.course_key).filter(
+                id__gt=last_device_id,
+            ).order_by('id').values_list('id', flat=True)[:settings.FCM_BATCH_SIZE]
+        )
+        if not device_ids:
+            return
+        last_device_id = device_ids[-1]
+        yield device_ids[0], last_device_id
+
+
+def get_batch_registration_ids(broadcast, first_device_id, last_device_id):
+    """
+    Return the FCM tokens of the active devices of the batch.
+    """
+    return list(
+        get_devices(broadcast.course_key).filter(
+            id__gte=first_device_id,
+            id__lte=last_device_id,
+        ).values_list('registration_id', flat=True)
+    )
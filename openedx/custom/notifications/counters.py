@@ -0,0 +1,146 @@
+"""
+Cached counters of the unread notifications of the users.
+
+Counters are kept per user for all the notifications, the course
+notifications and the notifications of every course. They are adjusted
+as the notifications are added, read or deleted, and computed from the
+database when missing from the cache.
+
+Changes affecting many counters at once replace a version instead: the
+version of the user for the bulk changes of the user and the broadcasts
+to a course, and the broadcast generation for the broadcasts to all, so
+the counters are computed again.
+"""
+
+
+import logging
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+log = logging.getLogger(__name__)
+
+UNREAD_COUNT_CACHE_KEY = 'notifications.unread.{user_id}.{version}.{generation}.{scope}'
+USER_VERSION_CACHE_KEY = 'notifications.unread.{user_id}.version'
+BROADCAST_GENERATION_CACHE_KEY = 'notifications.unread.broadcast_generation'
+
+# Scopes of the counters besides the course keys
+ALL = 'all'
+COURSES = 'courses'
+
+
+def _get_scopes(course_key, has_data):
+    """
+    Return the scopes counting a notification of the given course.
+    """
+    scopes = [ALL]
+    # Notifications without data are not shown in the apps
+    if course_key and has_data:
+        scopes.extend((COURSES, str(course_key)))
+    return scopes
+
+
+def _get_versions(user_ids):
+    """
+    Return the versions of the given users and the broadcast generation.
+    """
+    keys = [USER_VERSION_CACHE_KEY.format(user_id=user_id) for user_id in user_ids]
+    values = cache.get_many(keys + [BROADCAST_GENERATION_CACHE_KEY])
+    return (
+        {user_id: values.get(key, 0) for user_id, key in zip(user_ids, keys)},
+        values.get(BROADCAST_GENERATION_CACHE_KEY, 0),
+    )
+
+
+def _get_keys(user_ids, scopes):
+    versions, generation = _get_versions(user_ids)
+    return [
+        UNREAD_COUNT_CACHE_KEY.format(
+            user_id=user_id,
+            version=versions[user_id],
+            generation=generation,
+            scope=scope,
+        )
+        for user_id in user_ids
+        for scope in scopes
+    ]
+
+
+def _count_in_db(user, scope):
+    from openedx.custom.notifications.models import NotificationBroadcast, NotificationMessage
+
+    messages = NotificationMessage.objects.filter(user=user, read=False)
+    broadcasts = NotificationBroadcast.get_user_unread_broadcasts(user)
+    if scope == COURSES:
+        messages = messages.filter(course_key__isnull=False).exclude(data={})
+        broadcasts = broadcasts.filter(course_key__isnull=False)
+    elif scope != ALL:
+        messages = messages.filter(course_key=scope).exclude(data={})
+        broadcasts = broadcasts.filter(course_key=scope)
+    return messages.count() + broadcasts.count()
+
+
+def get_unread_count(user, scope=ALL):
+    """
+    Return the number of the unread notifications of the user in the
+    given scope, ALL, COURSES or a course key.
+    """
+    key = _get_keys([user.id], [str(scope)])[0]
+    count = cache.get(key)
+    if count is None:
+        count = _count_in_db(user, str(scope))
+        cache.set(key, count, settings.NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT)
+    return max(count, 0)
+
+
+def _add(user_ids, course_key, has_data, delta):
+    for key in _get_keys(list(user_ids), _get_scopes(course_key, has_data)):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # Not cached, computed from the database when read
+            pass
+
+
+def increment(user_ids, course_key=None, has_data=True):
+    """
+    Count a new notification of the given users.
+    """
+    _add(user_ids, course_key, has_data, 1)
+
+
+def decrement(user_id, course_key=None, has_data=True):
+    """
+    Discount a notification of the user read or deleted.
+    """
+    _add([user_id], course_key, has_data, -1)
+
+
+def reset(user_ids):
+    """
+    Drop the counters of the given users, e.g. after marking all their notifications as read.
+    """
+    # Any new version drops the counters, set at once for all the users
+    version = uuid.uuid4().hex
+    cache.set_many({USER_VERSION_CACHE_KEY.format(user_id=user_id): version for user_id in user_ids}, None)
+
+
+def reset_all():
+    """
+    Drop the counters of all the users, e.g. after a new broadcast to all.
+    """
+    if not cache.add(BROADCAST_GENERATION_CACHE_KEY, 1, None):
+        cache.incr(BROADCAST_GENERATION_CACHE_KEY)
+
+
+def reconcile(user, course_keys=()):
+    """
+    Compute the counters of the user from the database.
+    """
+    scopes = [ALL, COURSES] + [str(course_key) for course_key in course_keys]
+    keys = _get_keys([user.id], scopes)
+    cache.set_many(
+        {key: _count_in_db(user, scope) for key, scope in zip(keys, scopes)},
+        settings.NOTIFICATION_UNREAD_COUNT_CACHE_TIMEOUT,
+    )
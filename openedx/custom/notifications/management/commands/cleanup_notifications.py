@@ -3,6 +3,7 @@ from logging import getLogger
 from django.db.models import Count
 from django.core.management.base import BaseCommand
 
+from openedx.custom.notifications import counters
 from openedx.custom.notifications.models import NotificationMessage
 
 logger = getLogger(__name__)
@@ -24,6 +25,7 @@ class Command(BaseCommand):
     def handle(self, *args, **options):
         logger.info("clening up the notifications")
         to_be_deleted = []
+        user_ids = []
         # count and prepare a list of notification IDs
         for packet in (
             NotificationMessage.objects.all(
@@ -32,6 +34,7 @@ class Command(BaseCommand):
             .annotate(total=Count("id"))
             .filter(total__gt=MAX_NOTIFICATIONS)
         ):
+            user_ids.append(packet["user_id"])
             to_be_deleted.extend(
                 NotificationMessage.objects.filter(
                     user_id=packet["user_id"],
@@ -44,4 +47,5 @@ class Command(BaseCommand):
             # perform raw delete as we don't have signals and cascade
             notifications = NotificationMessage.objects.filter(id__in=to_be_deleted)
             notifications._raw_delete(notifications.db)
+            counters.reset(user_ids)
             logger.info("Cleaned {} notifications".format(len(to_be_deleted)))
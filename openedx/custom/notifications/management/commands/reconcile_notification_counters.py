@@ -0,0 +1,66 @@
+from datetime import timedelta
+from logging import getLogger
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from openedx.custom.notifications import counters
+from openedx.custom.notifications.models import NotificationBroadcastState, NotificationMessage
+from openedx.custom.utils import chunked
+from student.models import CourseEnrollment
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    This command attempts to:
+        Compute the cached counters of the unread notifications from
+        the database, for the users whose notifications changed recently.
+    Example usage:
+        $ ./manage.py lms reconcile_notification_counters
+        $ ./manage.py lms reconcile_notification_counters --hours 6
+        $ ./manage.py lms reconcile_notification_counters --users 10 12
+    """
+    help = 'Command to reconcile the cached unread notification counters with the database.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--hours',
+            type=int,
+            default=24,
+            help='Reconcile the users whose notifications changed within the given hours.',
+        )
+        parser.add_argument(
+            '--users',
+            nargs='+',
+            type=int,
+            help='Reconcile the given users only.',
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options['users']
+        if not user_ids:
+            since = timezone.now() - timedelta(hours=options['hours'])
+            user_ids = set(
+                NotificationMessage.objects.filter(
+                    modified__gte=since,
+                ).values_list('user_id', flat=True).distinct()
+            ) | set(
+                NotificationBroadcastState.objects.filter(
+                    modified__gte=since,
+                ).values_list('user_id', flat=True).distinct()
+            )
+
+        logger.info("Reconciling the notification counters of {} users".format(len(user_ids)))
+        for chunk in chunked(sorted(user_ids), 500):
+            course_keys = {}
+            for user_id, course_id in CourseEnrollment.objects.filter(
+                user_id__in=chunk,
+                is_active=True,
+            ).values_list('user_id', 'course_id'):
+                course_keys.setdefault(user_id, set()).add(str(course_id))
+            for user in User.objects.filter(id__in=chunk):
+                counters.reconcile(user, course_keys.get(user.id, ()))
+        logger.info("Reconciled the notification counters")
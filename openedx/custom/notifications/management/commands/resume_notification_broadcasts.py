@@ -0,0 +1,43 @@
+from datetime import timedelta
+from logging import getLogger
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from openedx.custom.notifications.models import NotificationBroadcast
+from openedx.custom.notifications.tasks import run_notification_broadcast
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    This command attempts to:
+        Resume the broadcasts interrupted e.g. by a worker restart or
+        given up after the retries, from the last device dispatched.
+    Example usage:
+        $ ./manage.py lms resume_notification_broadcasts
+        $ ./manage.py lms resume_notification_broadcasts --stalled-for 30
+    """
+    help = 'Command to resume the interrupted notification broadcasts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stalled-for',
+            type=int,
+            default=15,
+            help='Minutes without progress after which a broadcast is considered interrupted.',
+        )
+
+    def handle(self, *args, **options):
+        broadcasts = NotificationBroadcast.objects.filter(
+            stage=NotificationBroadcast.PUSHING,
+            modified__lt=timezone.now() - timedelta(minutes=options['stalled_for']),
+        )
+        for broadcast in broadcasts:
+            logger.info(
+                "Resuming the broadcast %s, dispatched %s push batches",
+                broadcast.notification_id,
+                broadcast.dispatched_batches,
+            )
+            run_notification_broadcast.delay(broadcast.id)
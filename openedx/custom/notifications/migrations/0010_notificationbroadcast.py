@@ -0,0 +1,42 @@
+# Generated by Django 2.2.16 on 2026-10-17 15:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import jsonfield.fields
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0009_preferences_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationBroadcast',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('notification_id', models.UUIDField(unique=True)),
+                ('title', models.CharField(blank=True, max_length=255, null=True)),
+                ('message', models.TextField(max_length=255)),
+                ('resolve_link', models.TextField(blank=True, max_length=255, null=True)),
+                ('course_key', models.CharField(blank=True, max_length=255, null=True)),
+                ('data', jsonfield.fields.JSONField(default=dict)),
+                ('stage', models.CharField(choices=[('ps', 'Pushing'), ('ok', 'Done')], db_index=True, default='ps', max_length=2)),
+                ('total_users', models.PositiveIntegerField(default=0)),
+                ('total_devices', models.PositiveIntegerField(default=0)),
+                ('last_device_id', models.PositiveIntegerField(default=0)),
+                ('dispatched_batches', models.PositiveIntegerField(default=0)),
+                ('pushed_batches', models.PositiveIntegerField(default=0)),
+                ('failed_batches', models.PositiveIntegerField(default=0)),
+                ('error', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'get_latest_by': 'created',
+                'index_together': {('course_key', 'created')},
+            },
+        ),
+    ]
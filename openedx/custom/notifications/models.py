@@ -6,17 +6,30 @@ import logging
 import re
 
 from django.contrib.auth.models import User
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Q
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from django.utils.translation import ugettext as _
 
 from jsonfield import JSONField
 from model_utils.models import TimeStampedModel
 from config_models.models import ConfigurationModel
+from student.models import CourseAccessRole, CourseEnrollment
+
+from openedx.custom.notifications import counters
+from openedx.custom.utils import chunked
 
 log = logging.getLogger(__name__)
 
+# Personal notifications and broadcasts listed at most per page, newest first
+MAX_LISTED_NOTIFICATIONS = 100
+# Ids of the broadcasts listed along with the personal notifications
+BROADCAST_ID_PREFIX = 'b'
+# States of the broadcasts stored at once by the bulk changes of a user
+BROADCAST_STATE_BATCH_SIZE = 500
+
 
 # pylint: disable=model-has-unicode
 class NotificationMessage(TimeStampedModel, models.Model):
@@ -37,8 +50,102 @@ class NotificationMessage(TimeStampedModel, models.Model):
         """
         Mark the given notification as read.
         """
+        if self.is_broadcast:
+            was_unread = NotificationBroadcastState.discount(self.user, self.broadcast_id, read=True)
+        else:
+            # Conditional update, so concurrent requests discount the notification once
+            was_unread = NotificationMessage.objects.filter(
+                id=self.id,
+                read=False,
+            ).update(read=True, modified=timezone.now())
         self.read = True
-        self.save()
+        if was_unread:
+            counters.decrement(self.user_id, self.course_key, bool(self.data))
+
+    def delete_for_user(self):
+        """
+        Delete the notification, a broadcast is hidden for the user only.
+        """
+        if self.is_broadcast:
+            was_unread = NotificationBroadcastState.discount(self.user, self.broadcast_id, deleted=True)
+        else:
+            # Conditional delete, so concurrent requests discount the notification once
+            was_unread = NotificationMessage.objects.filter(id=self.id, read=False).delete()[0]
+            if not was_unread:
+                NotificationMessage.objects.filter(id=self.id).delete()
+        if was_unread:
+            counters.decrement(self.user_id, self.course_key, bool(self.data))
+
+    @property
+    def is_broadcast(self):
+        return isinstance(self.id, str) and self.id.startswith(BROADCAST_ID_PREFIX)
+
+    @property
+    def broadcast_id(self):
+        return int(self.id[len(BROADCAST_ID_PREFIX):])
+
+    @property
+    def cursor(self):
+        """
+        Position of the message in the list of `get_messages`, the next page starts after it.
+        """
+        return '{}_{}'.format(self.id, self.modified.isoformat())
+
+    @staticmethod
+    def parse_cursor(cursor):
+        """
+        Return the modified time and the id of the message of the given cursor.
+
+        Raises ValueError if the cursor is not valid.
+        """
+        message_id, modified = cursor.split('_', 1)
+        modified = parse_datetime(modified)
+        if modified is None:
+            raise ValueError('Invalid cursor: {}'.format(cursor))
+        if message_id.startswith(BROADCAST_ID_PREFIX):
+            int(message_id[len(BROADCAST_ID_PREFIX):])
+        else:
+            message_id = int(message_id)
+        return modified, message_id
+
+    def get_sort_key(self):
+        """
+        Order of the message in the list, the personal notifications are
+        listed before the broadcasts of the same time.
+        """
+        if self.is_broadcast:
+            return self.modified, 0, self.broadcast_id
+        return self.modified, 1, self.id
+
+    @classmethod
+    def get_for_user(cls, user, id=None, notification_id=None):
+        """
+        Return the personal notification or the broadcast of the user
+        by the id, as listed by `get_messages`, or the notification id.
+
+        Raises NotificationMessage.DoesNotExist.
+        """
+        if id is not None and str(id).startswith(BROADCAST_ID_PREFIX):
+            broadcasts = NotificationBroadcast.get_user_broadcasts(user).filter(
+                id=str(id)[len(BROADCAST_ID_PREFIX):],
+            )
+        elif notification_id is not None:
+            messages = cls.objects.filter(user=user, notification_id=notification_id)
+            if messages.exists():
+                return messages.get()
+            broadcasts = NotificationBroadcast.get_user_broadcasts(user).filter(
+                notification_id=notification_id,
+            )
+        else:
+            return cls.objects.get(id=id, user=user)
+
+        broadcast = broadcasts.first()
+        if broadcast is None:
+            raise cls.DoesNotExist
+        return broadcast.as_message(
+            user,
+            read=broadcast.states.filter(user=user, read=True).exists(),
+        )
 
     @classmethod
     def mark_all_as_read(cls, user):
@@ -50,27 +157,78 @@ class NotificationMessage(TimeStampedModel, models.Model):
             user=user,
             read=False,
         ).update(read=True)
+        NotificationBroadcastState.set_state(
+            user,
+            NotificationBroadcast.get_user_unread_broadcasts(user).values_list('id', flat=True),
+            read=True,
+        )
+        counters.reset([user.id])
+
+    @classmethod
+    def delete_all(cls, user):
+        """
+        Delete all the notifications of the given user,
+        the broadcasts are hidden for the user only.
+        """
+        cls.objects.filter(user=user).delete()
+        NotificationBroadcastState.set_state(
+            user,
+            NotificationBroadcast.get_user_broadcasts(user).values_list('id', flat=True),
+            deleted=True,
+        )
+        counters.reset([user.id])
 
     @classmethod
-    def get_messages(cls, user, include_read=False):
+    def get_messages(cls, user, include_read=False, receive_on=None, course_key=None, with_data=False,
+                     cursor=None, limit=MAX_LISTED_NOTIFICATIONS):
         """
-        Returns the mapping of time and notes taken by a user in the given course and video
+        Returns a page of the personal notifications of the user merged with
+        the broadcasts the user is in the audience of, newest first.
+
+        Each page reads at most `limit` rows of either kind, the next page
+        starts after the `cursor` of the last message of the previous one.
+
+        Arguments:
+            receive_on: the platform the messages are listed on, discussion
+                notifications are excluded if the user does not receive them there.
+            course_key: lists the notifications of the given course only.
+            with_data: excludes the notifications not meant for the apps.
+            cursor: lists the messages after the given cursor only,
+                raises ValueError if it is not valid.
+            limit: the number of messages listed at most.
         Return message:
             message = <NotificationMessage>
         """
-        receive_on = NotificationPreference.BOTH
+        if cursor:
+            cursor = cls.parse_cursor(cursor)
+
+        preference = NotificationPreference.BOTH
         if hasattr(user, 'notification_preferences'):
-            receive_on = user.notification_preferences.receive_on
+            preference = user.notification_preferences.receive_on
 
         messages = cls.objects.filter(user=user)
-        if receive_on not in (NotificationPreference.BOTH,
-            NotificationPreference.WEB):
+        if preference not in (NotificationPreference.BOTH,
+            receive_on or NotificationPreference.WEB):
             messages = messages.exclude(title="Discussion")
 
         if not include_read:
             messages = messages.exclude(read=True)
-
-        return messages.order_by('-modified')
+        if course_key:
+            messages = messages.filter(course_key=course_key)
+        if with_data:
+            messages = messages.exclude(data={})
+
+        if cursor:
+            modified, last_id = cursor
+            older = Q(modified__lt=modified)
+            if isinstance(last_id, int):
+                older |= Q(modified=modified, id__lt=last_id)
+            messages = messages.filter(older)
+
+        messages = list(messages.order_by('-modified', '-id')[:limit])
+        messages.extend(NotificationBroadcast.get_user_messages(user, include_read, course_key, cursor, limit))
+        messages.sort(key=cls.get_sort_key, reverse=True)
+        return messages[:limit]
 
     class Meta:
         index_together = [
@@ -87,6 +245,231 @@ class NotificationMessage(TimeStampedModel, models.Model):
         )
 
 
+class NotificationBroadcast(TimeStampedModel):
+    """
+    A notification to all the users, or to the learners of a course.
+
+    The notification is stored once and shared by its audience, the read
+    and deleted states of the users are kept in NotificationBroadcastState.
+    Devices are pushed to in the order of their ids, the last one
+    dispatched is recorded so an interrupted broadcast resumes from
+    where it stopped.
+
+    .. no_pii:
+    """
+    PUSHING = 'ps'
+    DONE = 'ok'
+
+    STAGES = (
+        (PUSHING, 'Pushing'),
+        (DONE, 'Done'),
+    )
+
+    notification_id = models.UUIDField(unique=True)
+    title = models.CharField(max_length=255, null=True, blank=True)
+    message = models.TextField(max_length=255)
+    resolve_link = models.TextField(max_length=255, null=True, blank=True)
+    # The learners of the course, all the users if not set
+    course_key = models.CharField(max_length=255, null=True, blank=True)
+    data = JSONField(default=dict)
+    stage = models.CharField(max_length=2, db_index=True, choices=STAGES, default=PUSHING)
+    total_users = models.PositiveIntegerField(default=0)
+    total_devices = models.PositiveIntegerField(default=0)
+    last_device_id = models.PositiveIntegerField(default=0)
+    dispatched_batches = models.PositiveIntegerField(default=0)
+    pushed_batches = models.PositiveIntegerField(default=0)
+    failed_batches = models.PositiveIntegerField(default=0)
+    # Last error of the broadcast, the stage is kept to resume from
+    error = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        get_latest_by = 'created'
+        index_together = [
+            ('course_key', 'created'),
+        ]
+
+    def __str__(self):
+        return 'NotificationBroadcast: {}, {}'.format(self.notification_id, self.get_stage_display())
+
+    @property
+    def is_complete(self):
+        """
+        Whether all the push batches are sent.
+        """
+        return self.stage == self.DONE and (
+            self.pushed_batches + self.failed_batches >= self.dispatched_batches
+        )
+
+    @staticmethod
+    def get_audience(course_key=None):
+        """
+        Return the users the broadcast of the given course, or to all, is meant for.
+        """
+        if not course_key:
+            return User.objects.all()
+        # enrolled users excluding teachers/admins
+        return User.objects.filter(
+            courseenrollment__course_id=course_key,
+            courseenrollment__is_active=True,
+        ).exclude(
+            courseaccessrole__role__in=('instructor', 'staff'),
+        )
+
+    @classmethod
+    def get_user_broadcasts(cls, user):
+        """
+        Return the broadcasts the user is in the audience of and has not deleted,
+        sent since the user joined, or enrolled in the course of the broadcast.
+        """
+        query = Q(course_key__isnull=True, created__gte=user.date_joined)
+        # Teachers/admins are not in the audience of the course broadcasts
+        if not CourseAccessRole.objects.filter(user=user, role__in=('instructor', 'staff')).exists():
+            enrollments = CourseEnrollment.objects.filter(
+                user=user,
+                is_active=True,
+            ).values_list('course_id', 'created')
+            for course_id, enrolled in enrollments:
+                query |= Q(course_key=str(course_id), created__gte=enrolled)
+        return cls.objects.filter(query).exclude(
+            id__in=NotificationBroadcastState.get_broadcast_ids(user, deleted=True),
+        )
+
+    @classmethod
+    def get_user_messages(cls, user, include_read=False, course_key=None, cursor=None,
+                          limit=MAX_LISTED_NOTIFICATIONS):
+        """
+        Return the broadcasts of the user as notification messages, newest first,
+        after the parsed cursor of `NotificationMessage.get_messages`.
+        """
+        if include_read:
+            broadcasts = cls.get_user_broadcasts(user)
+        else:
+            broadcasts = cls.get_user_unread_broadcasts(user)
+        if course_key:
+            broadcasts = broadcasts.filter(course_key=course_key)
+        if cursor:
+            created, last_id = cursor
+            older = Q(created__lt=created)
+            if isinstance(last_id, int):
+                # The personal notifications are listed first
+                older |= Q(created=created)
+            else:
+                older |= Q(created=created, id__lt=int(last_id[len(BROADCAST_ID_PREFIX):]))
+            broadcasts = broadcasts.filter(older)
+        broadcasts = list(broadcasts.order_by('-created', '-id')[:limit])
+
+        read = set()
+        if include_read:
+            read = set(
+                NotificationBroadcastState.objects.filter(
+                    user=user,
+                    broadcast__in=broadcasts,
+                    read=True,
+                ).values_list('broadcast_id', flat=True)
+            )
+        return [
+            broadcast.as_message(user, read=broadcast.id in read)
+            for broadcast in broadcasts
+        ]
+
+    @classmethod
+    def get_user_unread_broadcasts(cls, user):
+        """
+        Return the broadcasts of the user not read yet.
+        """
+        return cls.get_user_broadcasts(user).exclude(
+            id__in=NotificationBroadcastState.get_broadcast_ids(user, read=True),
+        )
+
+    def as_message(self, user, read=False):
+        """
+        Return the broadcast as a notification message of the user, not to be saved.
+        """
+        data = dict(self.data, read=read)
+        message = NotificationMessage(
+            user=user,
+            title=self.title,
+            message=self.message,
+            resolve_link=self.resolve_link,
+            read=read,
+            course_key=self.course_key,
+            notification_id=self.notification_id,
+            data=data,
+            created=self.created,
+            modified=self.created,
+        )
+        message.id = '{}{}'.format(BROADCAST_ID_PREFIX, self.id)
+        return message
+
+
+class NotificationBroadcastState(TimeStampedModel):
+    """
+    Read and deleted state of a broadcast for a user,
+    stored only once the user reads or deletes it.
+
+    .. no_pii:
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    broadcast = models.ForeignKey(NotificationBroadcast, related_name='states', on_delete=models.CASCADE)
+    read = models.BooleanField(default=False)
+    deleted = models.BooleanField(default=False)
+
+    class Meta:
+        unique_together = ('user', 'broadcast')
+
+    def __str__(self):
+        return 'NotificationBroadcastState: {}, {}'.format(self.user_id, self.broadcast_id)
+
+    @classmethod
+    def get_broadcast_ids(cls, user, **state):
+        """
+        Return the subquery of the ids of the broadcasts in the given state for the user.
+        """
+        return cls.objects.filter(user=user, **state).values('broadcast_id')
+
+    @classmethod
+    def discount(cls, user, broadcast_id, read=False, deleted=False):
+        """
+        Mark the broadcast as read, or deleted, for the user.
+
+        Returns whether the broadcast was unread, concurrent
+        requests discount the broadcast once.
+        """
+        with transaction.atomic():
+            state, created = cls.objects.get_or_create(
+                user=user,
+                broadcast_id=broadcast_id,
+                defaults={'read': read, 'deleted': deleted},
+            )
+            if created:
+                return True
+            changes = {'read': True} if read else {'deleted': True}
+            discounted = cls.objects.filter(
+                id=state.id,
+                read=False,
+                deleted=False,
+            ).update(modified=timezone.now(), **changes)
+            if not discounted and deleted:
+                cls.objects.filter(id=state.id).update(deleted=True, modified=timezone.now())
+        return bool(discounted)
+
+    @classmethod
+    def set_state(cls, user, broadcast_ids, **state):
+        """
+        Set the read or deleted state of the given broadcasts for the user.
+        """
+        with transaction.atomic():
+            for chunk in chunked(broadcast_ids, BROADCAST_STATE_BATCH_SIZE):
+                cls.objects.filter(
+                    user=user,
+                    broadcast_id__in=chunk,
+                ).update(**state)
+                cls.objects.bulk_create(
+                    [cls(user=user, broadcast_id=broadcast_id, **state) for broadcast_id in chunk],
+                    ignore_conflicts=True,
+                )
+
+
 class MutedPost(models.Model):
     """
     User who opt-out from discussion forum
@@ -11,6 +11,8 @@ from openedx.custom.utils import utc_datetime_to_local_datetime
 
 
 class NotificationMessageSerializer(serializers.ModelSerializer):
+    # Broadcasts are listed with prefixed ids
+    id = serializers.ReadOnlyField()
     created = serializers.DateTimeField(format="%b %d, %Y %I:%M %p")
 
     class Meta:
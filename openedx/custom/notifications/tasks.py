@@ -5,22 +5,29 @@ Celery tasks used by notification triggers
 from uuid import uuid4
 
 import logging
+from django.conf import settings
+from django.db.models import F
 from django.utils import timezone
-from django.contrib.auth.models import User
 from celery.task import task
 
 from opaque_keys.edx.keys import CourseKey
 from openedx.custom.notifications.utils import translate
 from openedx.custom.notifications.api.utils import (
     add_notification_db,
+    deactivate_devices,
     push_notification_fcm,
+    send_bulk_message,
+)
+from openedx.custom.notifications.broadcasts import (
+    create_broadcast,
+    get_batch_registration_ids,
+    get_device_batches,
 )
-from django.contrib.auth.models import User
 from openedx.custom.notifications.constants import NotificationTypes
+from openedx.custom.notifications.models import NotificationBroadcast
 from openedx.custom.taleem_grades.models import PersistentExamGrade
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.core.djangoapps.django_comment_common import comment_client as cc
-from student.models import CourseEnrollment
 from openedx.custom.notifications.permissions import (
     get_course_teachers,
     is_staff_or_course_teacher,
@@ -42,34 +49,105 @@ def send_announcement_notification(title='', message='', data={},
 
     log.info("Storing and sending announcement notifications")
 
-    if users is None and course_id:
-        # enrolled users excluding teachers/admins
-        users = CourseEnrollment.objects.filter(
-            course_id=course_id,
-            is_active=True,
-        ).exclude(
-            user__courseaccessrole__role__in=('instructor', 'staff'),
-        ).values_list("user_id", flat=True)
-    db_users = users
-    if users is None and to_all:
-        db_users = User.objects.all().values_list('id', flat=True)
-
     data.update({
         'id': str(uuid4()),
         'created': str(timezone.localtime()),
         'read': False,
     })
-    add_notification_db(db_users, title, message,
+
+    # The notification of all the users, or of all the learners of the course, is shared
+    if to_all or (users is None and course_id):
+        broadcast = create_broadcast(title, message, None if to_all else course_id, data, resolve_link)
+        log.info("Broadcasting the notification %s to %s users", broadcast.notification_id, broadcast.total_users)
+        run_notification_broadcast.delay(broadcast.id)
+        return
+
+    add_notification_db(users, title, message,
         course_id, data, resolve_link=resolve_link)
     push_notification_fcm(
         users=users,
         title=translate(title),
         message=translate(message),
         data=data,
-        all_users=to_all,
     )
 
 
+@task(
+    bind=True,
+    default_retry_delay=settings.NOTIFICATION_BROADCAST_RETRY_DELAY,
+    max_retries=settings.NOTIFICATION_BROADCAST_MAX_RETRIES,
+)
+def run_notification_broadcast(self, broadcast_id):
+    """
+    Dispatch the push batches of the broadcast,
+    resuming from the last device dispatched.
+    """
+    broadcast = NotificationBroadcast.objects.get(id=broadcast_id)
+    try:
+        if broadcast.stage == NotificationBroadcast.PUSHING:
+            for first_device_id, last_device_id in get_device_batches(broadcast):
+                push_broadcast_batch.delay(broadcast.id, first_device_id, last_device_id)
+                broadcast.dispatched_batches += 1
+                broadcast.last_device_id = last_device_id
+                broadcast.save(update_fields=['dispatched_batches', 'last_device_id', 'modified'])
+            broadcast.stage = NotificationBroadcast.DONE
+            broadcast.save(update_fields=['stage', 'modified'])
+            log.info(
+                "Broadcast %s: dispatched %s push batches",
+                broadcast.notification_id,
+                broadcast.dispatched_batches,
+            )
+    except Exception as exc:  # pylint: disable=broad-except
+        log.exception(
+            "Broadcast %s interrupted, attempt#: %s of %s",
+            broadcast.notification_id,
+            self.request.retries,
+            settings.NOTIFICATION_BROADCAST_MAX_RETRIES,
+        )
+        broadcast.error = str(exc)[:255]
+        broadcast.save(update_fields=['error', 'modified'])
+        self.retry(exc=exc)
+
+
+@task(
+    bind=True,
+    default_retry_delay=settings.NOTIFICATION_BROADCAST_RETRY_DELAY,
+    max_retries=settings.NOTIFICATION_BROADCAST_MAX_RETRIES,
+)
+def push_broadcast_batch(self, broadcast_id, first_device_id, last_device_id):
+    """
+    Push the notification of the broadcast to a batch of devices.
+    """
+    broadcast = NotificationBroadcast.objects.get(id=broadcast_id)
+    registration_ids = get_batch_registration_ids(broadcast, first_device_id, last_device_id)
+    try:
+        if registration_ids:
+            deactivate_devices(send_bulk_message(
+                registration_ids,
+                translate(broadcast.title),
+                translate(broadcast.message),
+                broadcast.data,
+            ))
+    except Exception as exc:  # pylint: disable=broad-except
+        log.error(
+            "Broadcast %s: failed to push devices %s-%s, attempt#: %s of %s",
+            broadcast.notification_id,
+            first_device_id,
+            last_device_id,
+            self.request.retries,
+            settings.NOTIFICATION_BROADCAST_MAX_RETRIES,
+        )
+        if self.request.retries >= settings.NOTIFICATION_BROADCAST_MAX_RETRIES:
+            NotificationBroadcast.objects.filter(id=broadcast_id).update(
+                failed_batches=F('failed_batches') + 1,
+            )
+        self.retry(exc=exc)
+    else:
+        NotificationBroadcast.objects.filter(id=broadcast_id).update(
+            pushed_batches=F('pushed_batches') + 1,
+        )
+
+
 @task()
 def notify_user_for_report_review(users, course_id, status):
     """
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from uuid import uuid4
+
+from django.test import TestCase
+from django.utils import timezone
+from student.tests.factories import UserFactory
+
+from openedx.custom.notifications.models import (
+    MAX_LISTED_NOTIFICATIONS,
+    NotificationBroadcast,
+    NotificationMessage,
+)
+
+
+class NotificationsPagingTests(TestCase):
+    """
+    The personal notifications merged with the broadcasts are listed past the first page.
+    """
+
+    def setUp(self):
+        super(NotificationsPagingTests, self).setUp()
+        self.user = UserFactory()
+        self.now = timezone.now()
+
+        for index in range(MAX_LISTED_NOTIFICATIONS + 20):
+            message = NotificationMessage.objects.create(
+                user=self.user,
+                message='Message {}'.format(index),
+                data={'type': 'test'},
+            )
+            # Pairs of the messages share their time, along with the broadcasts
+            NotificationMessage.objects.filter(id=message.id).update(modified=self.get_time(index // 2))
+
+        for index in range(30):
+            broadcast = NotificationBroadcast.objects.create(
+                notification_id=uuid4(),
+                message='Broadcast {}'.format(index),
+                data={'type': 'test'},
+            )
+            NotificationBroadcast.objects.filter(id=broadcast.id).update(created=self.get_time(index * 3))
+
+        self.total = MAX_LISTED_NOTIFICATIONS + 20 + 30
+
+    def get_time(self, minutes):
+        return self.now - timedelta(minutes=minutes)
+
+    def assert_listed_once(self, messages):
+        self.assertEqual(len(messages), self.total)
+        self.assertEqual(len({message.id for message in messages}), self.total)
+        sort_keys = [message.get_sort_key() for message in messages]
+        self.assertEqual(sort_keys, sorted(sort_keys, reverse=True))
+
+    def test_messages_past_first_page(self):
+        messages = []
+        cursor = None
+        while True:
+            page = NotificationMessage.get_messages(self.user, include_read=True, cursor=cursor, limit=10)
+            if not page:
+                break
+            messages.extend(page)
+            cursor = page[-1].cursor
+
+        self.assert_listed_once(messages)
+
+    def test_api_past_first_page(self):
+        self.client.login(username=self.user.username, password='test')
+        messages = []
+        url = '/api/notifications/v1/notifications/'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            messages.extend(response.data['results'])
+            url = response.data['next']
+
+        self.assertEqual(len(messages), self.total)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            NotificationMessage.get_messages(self.user, cursor='invalid')
@@ -27,9 +27,9 @@ urlpatterns = [
         name='announcement'
     ),
     path(r'list/', views.list_messages, name='list_messages'),
-    path(r'mark/as/read/<int:id>/', views.mark_as_read, name='mark_as_read'),
+    path(r'mark/as/read/<str:id>/', views.mark_as_read, name='mark_as_read'),
     path(r'mark/as/read/', views.mark_all_as_read, name='mark_all_as_read'),
-    path(r'delete/<int:id>/', views.delete, name='delete'),
+    path(r'delete/<str:id>/', views.delete, name='delete'),
     path(r'delete/', views.delete_all, name='delete_all'),
     path(r'autocomplete/users/', views.autocomplete_users, name='autocomplete_users'),
     path(r'list-messages-in-json/', views.list_messages_in_json, name='list_messages_in_json'),
@@ -17,6 +17,8 @@ from student.auth import has_studio_write_access
 from student.models import CourseAccessRole, CourseEnrollment
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.custom.notifications.constants import NotificationTypes
+from openedx.custom.notifications import counters
+from openedx.custom.notifications.api.utils import add_notification_db
 from openedx.custom.notifications.models import NotificationMessage
 
 
@@ -62,6 +64,7 @@ def notify_user(user, notification_type=None, resolve_link=None, notification_me
         if resolve_link:
             notification.resolve_link = resolve_link
         notification.save()
+        counters.increment([user.id], has_data=False)
     except Exception:
         log.error(
             u'Error occur while adding a notification for "%s".',
@@ -74,6 +77,26 @@ def notify_user(user, notification_type=None, resolve_link=None, notification_me
         )
 
 
+def notify_users(user_ids, notification_type=None, resolve_link=None, notification_message=None, title=None):
+    """
+    Same as notify_user for many users at once, the notifications are inserted in bulk.
+    """
+    if not notification_message:
+        try:
+            notification_message = NotificationTypes.messages[notification_type]
+        except KeyError:
+            log.exception(
+                u'Invalid Notification Type : "%s"',
+                notification_type
+            )
+            return
+
+    if not title:
+        title = NotificationTypes.titles.get(notification_type, "General")
+
+    add_notification_db(list(user_ids), title, notification_message, resolve_link=resolve_link)
+
+
 def get_user_courses(request):
     """
     List all courses available to the logged in user by iterating through all the courses.
@@ -5,6 +5,7 @@ Notification management views.
 import logging
 
 from django.contrib.auth.decorators import login_required
+from django.http import Http404
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.shortcuts import redirect
 from django.utils.translation import ugettext as _
@@ -17,10 +18,11 @@ from openedx.custom.notifications.utils import (
     get_users,
     user_can_add_new_notification
 )
+from openedx.custom.notifications import counters
 from openedx.custom.notifications.serializers import NotificationMessageSerializer
 from openedx.custom.timed_exam.models import TimedExamAlarms
 
-from .models import NotificationMessage, NotificationPreference
+from .models import MAX_LISTED_NOTIFICATIONS, NotificationMessage, NotificationPreference
 from .forms import NotificationPreferenceForm
 
 log = logging.getLogger(__name__)
@@ -31,9 +33,23 @@ log = logging.getLogger(__name__)
 def list_messages(request):
     user = request.user
 
-    notifications = NotificationMessage.get_messages(user, include_read=True)
+    try:
+        notifications = NotificationMessage.get_messages(
+            user,
+            include_read=True,
+            cursor=request.GET.get('cursor'),
+            limit=MAX_LISTED_NOTIFICATIONS + 1,
+        )
+    except ValueError:
+        raise Http404
+    # The older notifications are listed after the last one of the page
+    next_cursor = None
+    if len(notifications) > MAX_LISTED_NOTIFICATIONS:
+        notifications = notifications[:MAX_LISTED_NOTIFICATIONS]
+        next_cursor = notifications[-1].cursor
     context = {
         'notifications': notifications,
+        'next_cursor': next_cursor,
         'can_add_new_notification': user_can_add_new_notification(request)
     }
     return render_to_response('notifications/list.html', context)
@@ -45,10 +61,7 @@ def mark_as_read(request, id):
     user = request.user
 
     try:
-        notification = NotificationMessage.objects.get(
-            id=id,
-            user=user,
-        )
+        notification = NotificationMessage.get_for_user(user, id=id)
         notification.mark_as_read()
         success = True
     except Exception as e:
@@ -81,11 +94,8 @@ def delete(request, id):
     user = request.user
 
     try:
-        notification = Notification.objects.get(
-            id=id,
-            user=user,
-        )
-        notification.delete()
+        notification = NotificationMessage.get_for_user(user, id=id)
+        notification.delete_for_user()
         success = True
     except:
         success = False
@@ -101,9 +111,7 @@ def delete_all(request):
     user = request.user
 
     try:
-        Notification.objects.filter(
-            user=user,
-        ).delete()
+        NotificationMessage.delete_all(user)
         success = True
     except:
         success = False
@@ -140,6 +148,10 @@ def list_messages_in_json(request):
     user = request.user
     include_read = request.GET.get('include-read', False) in {'True', True, 'true'}
 
+    # Polled by the header, nothing to list without unread notifications
+    if not include_read and not counters.get_unread_count(user):
+        return JsonResponse([])
+
     notifications = NotificationMessage.get_messages(user, include_read=include_read)
     serializer = NotificationMessageSerializer(
         notifications,
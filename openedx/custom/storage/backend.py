@@ -2,32 +2,27 @@
 Custom storage backend based on s3boto3.
 '''
 import os
-from boto3 import Session
-from botocore.client import Config
 from boto3.s3.transfer import TransferConfig
 
 from django.conf import settings
 from storages.backends.s3boto3 import S3Boto3Storage
 
+from openedx.custom.storage.utils import get_s3_client, save_files
+
 
 KB = 1024
 MB = KB * KB
 
 class S3TA3Storage(S3Boto3Storage):
     def _save_content(self, obj, content, parameters):
-        # head bucket before save
-        session = Session(
-            aws_access_key_id=self.access_key,
-            aws_secret_access_key=self.secret_key,
-            region_name=self.region_name,
-        )
-        client = session.client(
-            "s3",
+        # head bucket before save, the pooled client and the check are shared by the process
+        client = get_s3_client(
             endpoint_url=self.endpoint_url,
+            access_key=self.access_key,
+            secret_key=self.secret_key,
+            bucket_name=self.bucket_name,
             region_name=self.region_name,
-            config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
         )
-        client.head_bucket(Bucket=self.bucket_name)
 
         # only pass backwards incompatible arguments if they vary from the default
         put_parameters = parameters.copy() if parameters else {}
@@ -43,6 +38,11 @@ class S3TA3Storage(S3Boto3Storage):
         client.upload_fileobj(content, obj.bucket_name, obj.key,
             ExtraArgs=put_parameters, Config=transfer_config)
 
+    def save_many(self, files, max_workers=None):
+        """
+        Upload the (name, content) pairs concurrently over the pooled client.
+        """
+        return save_files(self, files, max_workers=max_workers)
 
     # URL considering public endpoint
     def url(self, name, parameters=None, expire=None):
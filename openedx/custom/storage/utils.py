@@ -2,29 +2,98 @@
 Utility related to storage.
 '''
 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 from boto3 import Session
 from botocore.client import Config
 
 from django.conf import settings
 
 
+# Clients are thread safe, a client per endpoint and credentials is shared by the process
+_clients = {}
+_clients_lock = threading.Lock()
+
+# (endpoint_url, bucket_name): time until which the bucket is known to exist
+_checked_buckets = {}
+
+
+def _get_max_pool_connections():
+    return getattr(settings, 'AWS_S3_MAX_POOL_CONNECTIONS', 50)
+
+
+def _get_bucket_check_ttl():
+    return getattr(settings, 'AWS_S3_BUCKET_CHECK_TTL', 5 * 60)
+
+
+def get_pooled_s3_client(endpoint_url='', access_key='', secret_key='', region_name='us-east-1'):
+    """
+    Return the process-wide S3 client for the given endpoint and credentials.
+
+    The client keeps a pool of up to AWS_S3_MAX_POOL_CONNECTIONS
+    connections, so the TLS handshakes are not repeated on every request.
+    """
+    key = (endpoint_url, access_key, secret_key, region_name)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                session = Session(
+                    aws_access_key_id=access_key,
+                    aws_secret_access_key=secret_key,
+                    region_name=region_name,
+                )
+                client = session.client(
+                    "s3",
+                    endpoint_url=endpoint_url,
+                    region_name=region_name,
+                    config=Config(
+                        signature_version="s3v4",
+                        s3={"addressing_style": "path"},
+                        max_pool_connections=_get_max_pool_connections(),
+                    ),
+                )
+                _clients[key] = client
+    return client
+
+
+def head_bucket(client, bucket_name):
+    """
+    Make sure the bucket exists, the result is remembered for AWS_S3_BUCKET_CHECK_TTL seconds.
+    """
+    key = (client.meta.endpoint_url, bucket_name)
+    if _checked_buckets.get(key, 0) > time.time():
+        return
+    client.head_bucket(Bucket=bucket_name)
+    _checked_buckets[key] = time.time() + _get_bucket_check_ttl()
+
+
 def get_s3_client(endpoint_url='',
     access_key='',
     secret_key='',
     bucket_name='',
-    bump_head=True):
-    session = Session(
-        aws_access_key_id=access_key,
-        aws_secret_access_key=secret_key,
-        region_name='us-east-1',
-    )
-    client = session.client(
-        "s3",
-        endpoint_url=endpoint_url,
-        region_name='us-east-1',
-        config=Config(signature_version="s3v4", s3={"addressing_style": "path"}),
-    )
+    bump_head=True,
+    region_name='us-east-1'):
+    client = get_pooled_s3_client(endpoint_url, access_key, secret_key, region_name)
     if bump_head:
-        client.head_bucket(Bucket=bucket_name)
+        head_bucket(client, bucket_name)
     return client
 
+
+def save_files(storage, files, max_workers=None):
+    """
+    Save the files to the storage concurrently.
+
+    Works with any django storage e.g. S3TA3Storage or the FileSystemStorage
+    used locally. `files` is an iterable of (name, content) pairs, returns the
+    list of the names the files are saved with, in the same order.
+    """
+    files = list(files)
+    if not files:
+        return []
+    max_workers = max_workers or min(len(files), _get_max_pool_connections())
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda name_content: storage.save(*name_content), files))
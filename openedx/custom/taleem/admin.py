@@ -9,7 +9,7 @@ from django.contrib import admin
 from openedx.custom.taleem.models import (
     CompletionTracking, LoginAttempt,
     Ta3leemUserProfile, TeacherAccountRequest,
-    MobileApp, 
+    MobileApp, TashgheelNotification,
 )
 
 
@@ -91,3 +91,23 @@ class MobileAppAdmin(admin.ModelAdmin):
     list_display = ('id', 'version', 'force_update',
         'android_version', 'android_force_update', )
     search_fields = ('id', 'version')
+
+
+@admin.register(TashgheelNotification)
+class TashgheelNotificationAdmin(admin.ModelAdmin):
+    """
+    Admin page to monitor the Tashgheel notifications outbox.
+    """
+    list_display = (
+        'id',
+        'notification_type',
+        'key',
+        'stage',
+        'attempts',
+        'next_attempt_at',
+        'lag',
+        'created',
+    )
+    list_filter = ('notification_type', 'stage')
+    search_fields = ('key',)
+    readonly_fields = ('lag',)
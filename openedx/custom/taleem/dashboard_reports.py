@@ -1,173 +1,182 @@
 
 import math
+from collections import defaultdict
 from six import text_type
 from datetime import datetime
 
 
 from pytz import UTC
-from django.db.models import Avg
+from django.core.cache import cache
 from django.urls import reverse
 from django.conf import settings
 
+from course_modes.models import CourseMode
 from student.models import CourseEnrollment
 
 from lms.djangoapps.certificates.models import GeneratedCertificate
 from openedx.custom.wishlist.models import Wishlist
-from openedx.custom.taleem_grades.models import PersistentExamGrade
+from openedx.custom.taleem_grades.models import PersistentExamGrade, StudentExamSummary
 from openedx.custom.timed_exam.models import TimedExam
 from edx_proctoring.models import ProctoredExamStudentAttempt
-from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus
 from lms.djangoapps.grades.models import PersistentSubsectionGrade
 from xmodule.modulestore.django import modulestore
 from opaque_keys.edx.keys import CourseKey
 
 
-TIMED_EXAM_PASS_CRITERIA = 50.0
+TEACHER_EXAM_REPORT_CACHE_KEY = 'taleem.dashboard_reports.teacher_exam_report.{user_id}'
+TEACHER_EXAM_REPORT_CACHE_TIMEOUT = 60 * 60
 
 
 def get_teacher_exam_report_data(user):
     """
     Return the teacher's exam related report data.
+
+    The report is cached per teacher and invalidated
+    whenever a grade or an attempt of one of the exams changes.
     """
-    timed_exams = TimedExam.objects.filter(user_id=user.id)
+    cache_key = TEACHER_EXAM_REPORT_CACHE_KEY.format(user_id=user.id)
+    report_data = cache.get(cache_key)
+    if report_data is None:
+        timed_exams = list(TimedExam.objects.filter(user_id=user.id))
+        exam_reports = get_timed_exams_report_data(timed_exams)
+        report_data = {
+            'timed_exam_count': len(timed_exams),
+            'timed_exam_reports': [
+                {
+                    'timed_exam_key': timed_exam.key,
+                    'timed_exam_name': timed_exam.display_name,
+                    'average_percentage': exam_reports[timed_exam.key]['average_percentage'],
+                    'top_students': exam_reports[timed_exam.key]['top_students'],
+                    'absent_students': exam_reports[timed_exam.key]['absent_students'],
+                }
+                for timed_exam in timed_exams
+            ]
+        }
+        cache.set(cache_key, report_data, TEACHER_EXAM_REPORT_CACHE_TIMEOUT)
+    return report_data
 
-    average_persistent_exam_grades = PersistentExamGrade.objects.filter(
-        course_id__in=[timed_exam.key for timed_exam in timed_exams]
-    ).values('course_id').annotate(average_score=Avg('percent_grade'))
-    average_persistent_exam_grades = {
-        str(item['course_id']): round(item['average_score'], 2) for item in average_persistent_exam_grades
-    }
 
-    timed_exam_report_data = []
-    for timed_exam in timed_exams:
-        timed_exam_report_data.append(
-            {
-                'timed_exam_key': timed_exam.key,
-                'timed_exam_name': timed_exam.display_name,
-                'average_percentage': average_persistent_exam_grades.get(timed_exam.key),
-                'top_students': get_top_students(timed_exam),
-                'absent_students': get_absent_students(timed_exam)
-            }
-        )
+def invalidate_teacher_exam_report(course_id):
+    """
+    Invalidate the cached report of the teachers owning the given timed exam.
+    """
+    teacher_ids = TimedExam.objects.filter(key=text_type(course_id)).values_list('user_id', flat=True)
+    cache.delete_many([TEACHER_EXAM_REPORT_CACHE_KEY.format(user_id=user_id) for user_id in teacher_ids])
+
+
+def get_timed_exams_report_data(timed_exams):
+    """
+    Compute the average grade, top students and absent students
+    of all the given timed exams with a fixed number of queries.
+
+    Returns a dict keyed on the timed exam key.
+    """
+    exam_keys = [timed_exam.key for timed_exam in timed_exams]
+    if not exam_keys:
+        return {}
+
+    # Arrange the grades of every exam from the highest to the lowest value
+    exam_grades = defaultdict(list)
+    for course_id, user_id, percent_grade in PersistentExamGrade.objects.filter(
+        course_id__in=exam_keys
+    ).order_by('course_id', '-percent_grade').values_list('course_id', 'user_id', 'percent_grade'):
+        exam_grades[text_type(course_id)].append((user_id, percent_grade))
+
+    enrolled_students = defaultdict(list)
+    for student in CourseEnrollment.objects.filter(
+        course_id__in=exam_keys,
+        is_active=True,
+        mode=CourseMode.TIMED
+    ).values('course_id', 'user__id', 'user__email', 'user__first_name', 'user__last_name', 'user__username'):
+        enrolled_students[text_type(student['course_id'])].append(student)
+
+    students_with_attempts = defaultdict(set)
+    for course_id, user_id in ProctoredExamStudentAttempt.objects.filter(
+        proctored_exam__course_id__in=exam_keys
+    ).values_list('proctored_exam__course_id', 'user_id'):
+        students_with_attempts[course_id].add(user_id)
+
     return {
-        'timed_exam_count': timed_exams.count(),
-        'timed_exam_reports': timed_exam_report_data
+        exam_key: {
+            'average_percentage': _get_average_percentage(exam_grades[exam_key]),
+            'top_students': _get_top_students(exam_grades[exam_key], enrolled_students[exam_key]),
+            'absent_students': _get_absent_students(
+                students_with_attempts[exam_key], enrolled_students[exam_key]
+            ),
+        }
+        for exam_key in exam_keys
     }
 
 
-def get_top_students(timed_exam):
+def _get_average_percentage(grades):
     """
-    Get the report of top students in the timed exams.
+    Average of the given (user_id, percent_grade) grades.
+    """
+    if not grades:
+        return None
+    return round(sum(percent_grade for __, percent_grade in grades) / len(grades), 2)
 
 
-    Arguments:
-        timed_exam (TimedExam): timed exam whose top students we need to get.
+def _get_top_students(grades, enrolled_students):
     """
-    scores = PersistentExamGrade.objects.filter(
-        course_id=timed_exam.key
-    ).order_by('-percent_grade').values_list('user_id', 'percent_grade')
-
-    # Getting the top 10% student from the queryset.
-    top_ten_percent = int(math.ceil(scores.count() * 0.1))
-    scores = dict(scores[0:top_ten_percent])
+    Top 10% of the enrolled students from the grades
+    sorted from the highest to the lowest value.
+    """
+    top_ten_percent = int(math.ceil(len(grades) * 0.1))
+    scores = dict(grades[0:top_ten_percent])
 
     return [{
         'name': "{0} {1}".format(student.get('user__first_name'), student.get('user__last_name')).strip(),
         'email': student.get('user__email'),
         'username': student.get('user__username'),
         'grade_percentage': scores.get(student.get('user__id'), 0.0)
-    } for student in timed_exam.enrolled_students if scores.get(student.get('user__id'), False)]
+    } for student in enrolled_students if scores.get(student.get('user__id'), False)]
 
 
-def get_absent_students(timed_exam):
+def _get_absent_students(students_with_attempts, enrolled_students):
     """
-    Get absent students in a Timed exam.
-
-    Arguments:
-        timed_exam (TimedExam): timed exam whose absent students we need to get.
+    Enrolled students who haven't attempted the exam.
     """
-    student_with_attempts = ProctoredExamStudentAttempt.objects.filter(
-        proctored_exam__course_id=timed_exam.key
-    ).values_list('user_id', flat=True)
-
     return [{
         'name': "{0} {1}".format(student.get('user__first_name'), student.get('user__last_name')).strip(),
         'email': student.get('user__email'),
         'username': student.get('user__username'),
-    } for student in timed_exam.enrolled_students if student.get('user__id') not in student_with_attempts]
+    } for student in enrolled_students if student.get('user__id') not in students_with_attempts]
 
 
-def get_student_timed_exam_report_data(user):
-    """
-    Return the student's timed exam related report data.
+def get_top_students(timed_exam):
     """
+    Get the report of top students in the timed exams.
 
-    def _filter_timed_exam(user, time_exam_queryset):
-        """
-        Filter the queryset if proctored exam attempt record doesn't exist.
-        """
-        return [
-            timed_exam for timed_exam in time_exam_queryset if not ProctoredExamStudentAttempt.objects.filter(
-                proctored_exam__course_id=timed_exam.key,
-                user__username=user.username
-            ).exists()
-        ]
-
-    def _get_submitted_timed_exams_count(user, timed_exam_ids):
-        """
-        Return the count of all the submitted timed exams of the given user.
-        """
-        return ProctoredExamStudentAttempt.objects.filter(
-            proctored_exam__course_id__in=timed_exam_ids,
-            user__username=user.username,
-            status=ProctoredExamStudentAttemptStatus.submitted
-        ).count()
-
-    def _get_missed_timed_exams_count(user, timed_exams):
-        """
-        Return the count of all the missed timed exams of the given user.
-        """
-        past_timed_exams = timed_exams.filter(due_date__lt=datetime.utcnow())
-        return len(_filter_timed_exam(user, past_timed_exams))
-
-    def _get_pending_timed_exams_count(user, timed_exams):
-        """
-        Return the count of all the pending timed exams of the given user.
-        """
-        future_time_exams = timed_exams.filter(due_date__gte=datetime.utcnow())
-        return len(_filter_timed_exam(user, future_time_exams))
 
-    missed_timed_exam_count = pending_timed_exam_count = submitted_timed_exam_count = 0
-    passed_exams_count = failed_exams_count = timed_exam_average_grade = 0
+    Arguments:
+        timed_exam (TimedExam): timed exam whose top students we need to get.
+    """
+    return get_timed_exams_report_data([timed_exam])[timed_exam.key]['top_students']
 
-    timed_exam_ids = [
-        str(enrollment.course.id) for enrollment in CourseEnrollment.enrollments_for_user(user, timed_exam=True)
-    ]
 
-    if timed_exam_ids:
-        all_timed_exams = TimedExam.objects.filter(key__in=timed_exam_ids)
+def get_absent_students(timed_exam):
+    """
+    Get absent students in a Timed exam.
 
-        submitted_timed_exam_count = _get_submitted_timed_exams_count(user, timed_exam_ids)
-        missed_timed_exam_count = _get_missed_timed_exams_count(user, all_timed_exams)
-        pending_timed_exam_count = _get_pending_timed_exams_count(user, all_timed_exams)
+    Arguments:
+        timed_exam (TimedExam): timed exam whose absent students we need to get.
+    """
+    return get_timed_exams_report_data([timed_exam])[timed_exam.key]['absent_students']
 
-        # Grade related report data
-        timed_exam_grades = PersistentExamGrade.objects.filter(user_id=user.id, course_id__in=timed_exam_ids)
-        if timed_exam_grades:
-            passed_exams_count = timed_exam_grades.filter(percent_grade__gte=TIMED_EXAM_PASS_CRITERIA).count()
-            failed_exams_count = timed_exam_grades.count() - passed_exams_count
-            timed_exam_average_grade = round(
-                sum([grade.percent_grade for grade in timed_exam_grades]) / timed_exam_grades.count(),
-                2
-            )
 
+def get_student_timed_exam_report_data(user):
+    """
+    Return the student's timed exam related report data.
+    """
+    summary = StudentExamSummary.get_or_build(user.id)
     return {
-        'submitted_timed_exam_count': submitted_timed_exam_count,
-        'missed_timed_exam_count': missed_timed_exam_count,
-        'pending_timed_exam_count': pending_timed_exam_count,
-        'passed_timed_exams_count': passed_exams_count,
-        'failed_timed_exams_count': failed_exams_count,
-        'timed_exam_average_grade': timed_exam_average_grade
+        'submitted_timed_exam_count': summary.submitted_count,
+        'missed_timed_exam_count': summary.missed_count,
+        'pending_timed_exam_count': summary.pending_count,
+        'passed_timed_exams_count': summary.passed_count,
+        'failed_timed_exams_count': summary.failed_count,
+        'timed_exam_average_grade': summary.average_grade
     }
 
 
@@ -0,0 +1,39 @@
+# Generated by Django 2.2.16 on 2026-10-17 14:00
+
+from django.db import migrations, models
+import django.utils.timezone
+import jsonfield.fields
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taleem', '0023_can_user_normal_browser'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TashgheelNotification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('notification_type', models.CharField(choices=[('grade', 'Grade'), ('skill', 'Skill')], max_length=16)),
+                ('key', models.CharField(db_index=True, max_length=255)),
+                ('pending_key', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('endpoint', models.URLField(max_length=255)),
+                ('params', jsonfield.fields.JSONField(blank=True, default={})),
+                ('stage', models.CharField(choices=[('pd', 'Pending'), ('sd', 'Sending'), ('ok', 'Sent'), ('fl', 'Failed')], db_index=True, default='pd', max_length=2)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('error', models.CharField(blank=True, max_length=255, null=True)),
+            ],
+            options={
+                'verbose_name': 'Tashgheel Notification',
+                'verbose_name_plural': 'Tashgheel Notifications',
+                'ordering': ('id',),
+            },
+        ),
+    ]
@@ -9,7 +9,7 @@ from enum import Enum
 
 import pytz
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 from django.utils.translation import ugettext_lazy as _
@@ -322,6 +322,26 @@ class CourseRating(TimeStampedModel):
 
         return stars
 
+    @classmethod
+    def get_user_ratings(cls, user_id, courses):
+        """
+        Returns the ratings given by the user on the given courses.
+
+        Arguments:
+            user_id (int): identifier of the user.
+            courses (list<CourseOverview>): A list of course overview model instances.
+
+        Returns:
+            (dict): course id (str) to the rating submitted by the user, courses not yet reviewed are omitted.
+        """
+        return {
+            str(course_id): stars
+            for course_id, stars in cls.objects.filter(
+                user_id=user_id,
+                course__in=courses,
+            ).values_list('course', 'stars')
+        }
+
     @classmethod
     def get_course_ratings(cls, courses):
         """
@@ -481,3 +501,145 @@ class MobileApp(TimeStampedModel):
             self.version,
             self.android_version,
         )
+
+
+class TashgheelNotification(TimeStampedModel):
+    """
+    Outbox of the notifications to be delivered to Tashgheel.
+
+    Notifications are queued within the request and delivered by the
+    drain task, pending notifications with the same key are coalesced.
+    A drain claims every notification before delivering it, so overlapping
+    drains never deliver the same one twice.
+
+    .. no_pii:
+    """
+    GRADE = 'grade'
+    SKILL = 'skill'
+
+    NOTIFICATION_TYPES = (
+        (GRADE, 'Grade'),
+        (SKILL, 'Skill'),
+    )
+
+    PENDING = 'pd'
+    SENDING = 'sd'
+    SENT = 'ok'
+    FAILED = 'fl'
+
+    STAGES = (
+        (PENDING, 'Pending'),
+        (SENDING, 'Sending'),
+        (SENT, 'Sent'),
+        (FAILED, 'Failed'),
+    )
+
+    # Delay of the first retry, doubled on every failed attempt
+    RETRY_DELAY = timedelta(minutes=1)
+    MAX_RETRY_DELAY = timedelta(hours=6)
+
+    notification_type = models.CharField(max_length=16, choices=NOTIFICATION_TYPES)
+    # e.g. grade:<user_id>:<course_id>
+    key = models.CharField(max_length=255, db_index=True)
+    # The key while pending, a single notification per key is pending
+    pending_key = models.CharField(max_length=255, null=True, blank=True, unique=True)
+    endpoint = models.URLField(max_length=255)
+    params = JSONField(default={}, blank=True)
+    stage = models.CharField(max_length=2, db_index=True, choices=STAGES, default=PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, db_index=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    error = models.CharField(max_length=255, null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'Tashgheel Notification'
+        verbose_name_plural = 'Tashgheel Notifications'
+        ordering = ('id',)
+
+    def __str__(self):
+        return "{}: {}".format(self.notification_type, self.key)
+
+    @classmethod
+    def enqueue(cls, notification_type, key, endpoint, params):
+        """
+        Queue the notification, or update the pending one having the same key.
+        """
+        with transaction.atomic():
+            notification, created = cls.objects.select_for_update().get_or_create(
+                pending_key=key,
+                defaults={
+                    'notification_type': notification_type,
+                    'key': key,
+                    'endpoint': endpoint,
+                    'params': params,
+                },
+            )
+            if not created:
+                notification.endpoint = endpoint
+                notification.params = params
+                notification.save()
+
+    @property
+    def lag(self):
+        """
+        Time taken from queuing the notification to its delivery, or till now.
+        """
+        return (self.sent_at or timezone.now()) - self.created
+
+    def claim(self, timeout):
+        """
+        Claim the notification for delivery, unless claimed by another drain.
+
+        The claim expires after `timeout` so the notifications of a drain
+        killed while delivering them are delivered again. Notifications
+        queued meanwhile with the same key are queued anew.
+        """
+        next_attempt_at = timezone.now() + timeout
+        claimed = TashgheelNotification.objects.filter(
+            id=self.id,
+            stage=self.stage,
+            next_attempt_at=self.next_attempt_at,
+        ).update(
+            stage=self.SENDING,
+            pending_key=None,
+            next_attempt_at=next_attempt_at,
+            modified=timezone.now(),
+        )
+        if claimed:
+            self.stage = self.SENDING
+            self.pending_key = None
+            self.next_attempt_at = next_attempt_at
+        return bool(claimed)
+
+    def mark_sent(self):
+        self.stage = self.SENT
+        self.sent_at = timezone.now()
+        self.error = None
+        self.save()
+
+    def mark_failed(self, error, max_attempts):
+        """
+        Schedule the next attempt with an exponential back off,
+        or give up after `max_attempts` attempts.
+        """
+        self.attempts += 1
+        self.error = str(error)[:255]
+        if self.attempts >= max_attempts:
+            self.stage = self.FAILED
+            self.save()
+            return
+
+        self.stage = self.PENDING
+        self.pending_key = self.key
+        self.next_attempt_at = timezone.now() + min(
+            self.RETRY_DELAY * 2 ** (self.attempts - 1),
+            self.MAX_RETRY_DELAY,
+        )
+        try:
+            with transaction.atomic():
+                self.save()
+        except IntegrityError:
+            # Superseded by the notification queued with the same key while delivering this one
+            self.stage = self.FAILED
+            self.pending_key = None
+            self.save()
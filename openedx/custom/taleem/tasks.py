@@ -0,0 +1,83 @@
+"""
+Taleem celery tasks.
+"""
+
+
+import logging
+from datetime import timedelta
+
+import requests
+from celery.task import task  # pylint: disable=no-name-in-module, import-error
+from django.conf import settings
+from django.db.models import Min
+from django.utils import timezone
+from edx_django_utils.monitoring import set_custom_metric
+
+from openedx.custom.taleem.models import TashgheelNotification
+
+log = logging.getLogger(__name__)
+
+
+@task(bind=True)
+def drain_tashgheel_outbox(self):
+    """
+    Deliver the due notifications of the Tashgheel outbox.
+    """
+    claim_timeout = timedelta(seconds=settings.TASHGHEEL_OUTBOX_CLAIM_TIMEOUT_IN_SECONDS)
+    # Notifications claimed by a drain which did not deliver them in time are due again
+    notifications = TashgheelNotification.objects.filter(
+        stage__in=(TashgheelNotification.PENDING, TashgheelNotification.SENDING),
+        next_attempt_at__lte=timezone.now(),
+    ).order_by('next_attempt_at')[:settings.TASHGHEEL_OUTBOX_BATCH_SIZE]
+
+    sent = failed = 0
+    max_lag = 0
+    # A single keep-alive session for the whole batch
+    with requests.Session() as session:
+        for notification in notifications:
+            # Overlapping drains deliver every notification once
+            if not notification.claim(claim_timeout):
+                continue
+            try:
+                response = session.get(
+                    notification.endpoint,
+                    params=notification.params,
+                    timeout=settings.TASHGHEEL_REQUEST_TIMEOUT_IN_SECONDS,
+                )
+                response.raise_for_status()
+            except requests.RequestException as exc:
+                log.warning(
+                    "[Tashgheel Integration] Failed to deliver the notification %s: %s",
+                    notification.key,
+                    exc,
+                )
+                notification.mark_failed(exc, settings.TASHGHEEL_OUTBOX_MAX_ATTEMPTS)
+                failed += 1
+            else:
+                notification.mark_sent()
+                max_lag = max(max_lag, notification.lag.total_seconds())
+                sent += 1
+
+    report_tashgheel_outbox_metrics(sent, failed, max_lag)
+
+
+def report_tashgheel_outbox_metrics(sent, failed, max_lag):
+    """
+    Log and report the delivery metrics of the Tashgheel outbox.
+    """
+    pending = TashgheelNotification.objects.filter(
+        stage__in=(TashgheelNotification.PENDING, TashgheelNotification.SENDING),
+    )
+    oldest_pending = pending.aggregate(oldest=Min('created'))['oldest']
+    metrics = {
+        'tashgheel_outbox_sent': sent,
+        'tashgheel_outbox_failed': failed,
+        'tashgheel_outbox_pending': pending.count(),
+        'tashgheel_outbox_max_delivery_lag': max_lag,
+        'tashgheel_outbox_oldest_pending_lag': (
+            (timezone.now() - oldest_pending).total_seconds() if oldest_pending else 0
+        ),
+    }
+    for name, value in metrics.items():
+        set_custom_metric(name, value)
+    log.info("[Tashgheel Integration] Outbox drained: %s", metrics)
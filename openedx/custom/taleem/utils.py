@@ -207,17 +207,11 @@ def get_course_ratings(user, courses):
             3. key: 'user_rating', value: (int) Rating given by the user.
     """
     ratings = CourseRating.get_course_ratings(courses=courses)
+    user_ratings = CourseRating.get_user_ratings(user.id, courses) if user.is_authenticated else {}
     for course in courses:
         course_id = str(course.id)
         if course_id in ratings:
-            rating = ratings[course_id]
-            if user.is_authenticated:
-                rating['user_rating'] = CourseRating.get_user_rating(
-                    user_id=user.id,
-                    course_id=course_id
-                )
-            else:
-                rating['user_rating'] = 0
+            ratings[course_id]['user_rating'] = user_ratings.get(course_id, 0)
         else:
             ratings[course_id] = {
                 'course': course_id,
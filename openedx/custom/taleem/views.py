@@ -50,7 +50,7 @@ from student.helpers import (
     AccountValidationError,
 )
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
-from openedx.custom.taleem.models import CourseRating, Ta3leemUserProfile
+from openedx.custom.taleem.models import CourseRating, Ta3leemUserProfile, TashgheelNotification
 from openedx.custom.taleem.forms import CourseRatingForm
 from openedx.custom.taleem.utils import (
     user_is_teacher, user_is_ta3leem_admin, create_random_captcha_text, clear_login_attempts,
@@ -421,17 +421,22 @@ def taleem_allow_entrance(request):
 
 
 def tashgheel_skill_notification(timed_exam):
+    """
+    Queue the notification of the skill of the exam, delivered by the outbox drain.
+    """
     # Default skill should not be notified to the tashgheel.
     if Skill.DEFAULT_SKILL_NAME == timed_exam.skill.name:
         return
 
     config = configuration_helpers.get_value('TASHGHEEL', {})
-    skill_endpoint = config.get('SKILL_NOTIFICATION_URL') 
+    skill_endpoint = config.get('SKILL_NOTIFICATION_URL')
     if skill_endpoint and timed_exam.skill:
-        log.info("[Tashgheel Integration] Sending skill notification")
-        requests.get(
+        log.info("[Tashgheel Integration] Queuing skill notification")
+        TashgheelNotification.enqueue(
+            TashgheelNotification.SKILL,
+            'skill:{}'.format(timed_exam.key),
             skill_endpoint,
-            params={
+            {
                 'skill': timed_exam.skill.name,
                 'course_name': timed_exam.display_name
             }
@@ -439,21 +444,27 @@ def tashgheel_skill_notification(timed_exam):
 
 
 def tashgheel_grade_notification(user, course_id):
+    """
+    Queue the grade notification of the user, delivered by the outbox drain.
+    Score changes of the same exam are coalesced into a single notification.
+    """
     if not user.ta3leem_profile.is_tashgheel_user:
         return
 
     config = configuration_helpers.get_value('TASHGHEEL', {})
-    grade_endpoint = config.get('GRADE_NOTIFICATION_URL') 
+    grade_endpoint = config.get('GRADE_NOTIFICATION_URL')
 
     if not grade_endpoint:
         return
 
     timed_exam = TimedExam.get_obj_by_course_id(course_id)
-    if timed_exam.skill:
-        log.info("[Tashgheel Integration] Sending grade notification")
-        requests.get(
+    if timed_exam and timed_exam.skill:
+        log.info("[Tashgheel Integration] Queuing grade notification")
+        TashgheelNotification.enqueue(
+            TashgheelNotification.GRADE,
+            'grade:{}:{}'.format(user.id, course_id),
             grade_endpoint,
-            params={
+            {
                 'email': user.email,
                 'skill': timed_exam.skill.name,
                 'course_name': timed_exam.display_name
@@ -5,7 +5,7 @@ Django admin page for taleem calendar to manage at high level.
 
 from django.contrib import admin
 
-from openedx.custom.taleem_calendar.models import Ta3leemReminder, CalendarEvent
+from openedx.custom.taleem_calendar.models import Ta3leemReminder, CalendarEvent, UserCalendarEvent
 
 
 @admin.register(Ta3leemReminder)
@@ -36,3 +36,20 @@ class CalendarEventAdmin(admin.ModelAdmin):
     ]
 
     search_fields = ['title', 'time', 'created_by']
+
+
+@admin.register(UserCalendarEvent)
+class UserCalendarEventAdmin(admin.ModelAdmin):
+    """
+    Simple, admin page to view the calendar events of the users.
+    """
+    list_display = [
+        'user',
+        'event_type',
+        'key',
+        'start_date'
+    ]
+
+    list_filter = ['event_type']
+    raw_id_fields = ['user']
+    search_fields = ['user__username', 'key', 'course_id']
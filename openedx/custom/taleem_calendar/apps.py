@@ -7,3 +7,6 @@ class TaleemCalendarConfig(AppConfig):
     """
     name = 'openedx.custom.taleem_calendar'
     verbose_name = "Taleem Calendar"
+
+    def ready(self):
+        import openedx.custom.taleem_calendar.signals  # pylint: disable=unused-import
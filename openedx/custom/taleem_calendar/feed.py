@@ -0,0 +1,340 @@
+"""
+Calendar feed of the users, stored as UserCalendarEvent rows.
+
+Building the events of a user on every calendar view loaded the block
+structure of every course of the user and queried the reminders of
+every event. The events are stored per user instead, and rebuilt in the
+background as the courses are published, the users enroll, and the
+exams, classes and custom events change. A calendar view is then a
+range query on the events of the user and one query for their reminders.
+The events of the users without stored events yet are built on their
+first calendar view.
+"""
+
+
+import hashlib
+import logging
+from collections import defaultdict
+from datetime import datetime
+
+import pytz
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.urls import reverse
+from django.utils.translation import ugettext as _
+from edx_django_utils.cache import RequestCache
+from icalendar import Calendar, Event
+from six import text_type
+from six.moves.urllib.parse import urljoin
+from student.models import CourseEnrollment
+from util.course import get_link_for_about_page
+
+from lms.djangoapps.courseware.courses import get_course_date_blocks
+from lms.djangoapps.courseware.date_summary import CourseAssignmentDate
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.core.djangoapps.site_configuration.helpers import get_value
+from openedx.core.lib.request_utils import get_request_or_stub
+from openedx.custom.live_class.models import LiveClass, LiveClassBooking
+from openedx.custom.taleem_calendar.models import CalendarEvent, Ta3leemReminder, UserCalendar, UserCalendarEvent
+from openedx.custom.utils import utc_datetime_to_local_datetime
+
+log = logging.getLogger(__name__)
+
+# Key of the event in the calendar events of the API
+EVENT_ID_FIELDS = {
+    Ta3leemReminder.COURSE_START_DATE: 'course_id',
+    Ta3leemReminder.COURSE_END_DATE: 'course_id',
+    Ta3leemReminder.COURSE_IMPORTANT_DATE: 'course_important_date_id',
+    Ta3leemReminder.EXAM_START_DATE: 'exam_id',
+    Ta3leemReminder.EXAM_END_DATE: 'exam_id',
+    Ta3leemReminder.LIVE_CLASS: 'live_class_id',
+    UserCalendarEvent.CUSTOM_EVENT: 'event_id',
+}
+
+
+def replace_events(queryset, events):
+    """
+    Replace the calendar events matching the queryset with the given ones.
+    """
+    with transaction.atomic():
+        queryset.delete()
+        UserCalendarEvent.objects.bulk_create(events, batch_size=settings.CALENDAR_EVENTS_BATCH_SIZE)
+
+
+def build_course_events(user, course):
+    """
+    Return the calendar events of the user in the course or the exam.
+    """
+    course_id = text_type(course.id)
+    event = dict(user=user, key=course_id, course_id=course_id, description=course.display_name)
+    events = []
+    if course.is_timed_exam:
+        if course.start_date:
+            events.append(UserCalendarEvent(event_type=Ta3leemReminder.EXAM_START_DATE, start_date=course.start_date, **event))
+        if course.end_date:
+            events.append(UserCalendarEvent(event_type=Ta3leemReminder.EXAM_END_DATE, start_date=course.end_date, **event))
+        return events
+
+    link = get_link_for_about_page(course)
+    if course.start_date:
+        events.append(UserCalendarEvent(
+            event_type=Ta3leemReminder.COURSE_START_DATE, start_date=course.start_date, link=link, **event
+        ))
+    if course.end_date:
+        events.append(UserCalendarEvent(
+            event_type=Ta3leemReminder.COURSE_END_DATE, start_date=course.end_date, link=link, **event
+        ))
+
+    request = get_request_or_stub()
+    request.user = user
+    for block in get_course_date_blocks(course, user, request, include_access=True, include_past_dates=True):
+        if isinstance(block, CourseAssignmentDate) and block.link:
+            events.append(UserCalendarEvent(
+                user=user,
+                event_type=Ta3leemReminder.COURSE_IMPORTANT_DATE,
+                key=block.link,
+                course_id=course_id,
+                title=block.title,
+                description=course.display_name,
+                start_date=block.date,
+                link=urljoin(settings.LMS_ROOT_URL, block.link),
+            ))
+    return events
+
+
+def sync_course_events(course_key, user_ids):
+    """
+    Rebuild the calendar events of the given users in the course or the exam.
+    """
+    course = CourseOverview.objects.filter(id=course_key).first()
+    enrollments = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        user_id__in=user_ids,
+        is_active=True,
+    ).select_related('user')
+    events = []
+    if course:
+        for enrollment in enrollments:
+            events.extend(build_course_events(enrollment.user, course))
+    replace_events(
+        UserCalendarEvent.objects.filter(course_id=text_type(course_key), user_id__in=user_ids),
+        events,
+    )
+    # The block structures of the users are cached for the "request"
+    RequestCache.clear_all_namespaces()
+    return len(events)
+
+
+def build_live_class_event(user_id, live_class):
+    return UserCalendarEvent(
+        user_id=user_id,
+        event_type=Ta3leemReminder.LIVE_CLASS,
+        key=text_type(live_class.id),
+        description=live_class.name,
+        start_date=live_class.scheduled_on,
+        link=get_live_class_link(live_class),
+    )
+
+
+def build_custom_event(event):
+    return UserCalendarEvent(
+        user_id=event.created_by_id,
+        event_type=UserCalendarEvent.CUSTOM_EVENT,
+        key=text_type(event.id),
+        title=event.title,
+        description=event.description,
+        start_date=event.time,
+    )
+
+
+def get_live_class_link(live_class):
+    if live_class.stage in (LiveClass.SCHEDULED, LiveClass.RUNNING):
+        return reverse('go_to_class', args=[text_type(live_class.id)])
+    return ''
+
+
+def sync_live_class_events(live_class_id):
+    """
+    Rebuild the calendar events of the class, for its moderator and the booked users.
+    """
+    queryset = UserCalendarEvent.objects.filter(event_type=Ta3leemReminder.LIVE_CLASS, key=text_type(live_class_id))
+    live_class = LiveClass.objects.filter(id=live_class_id).select_related('moderator').first()
+    if not live_class:
+        queryset.delete()
+        return
+
+    user_ids = set(LiveClassBooking.objects.filter(live_class=live_class).values_list('user_id', flat=True))
+    if live_class.moderator_id:
+        user_ids.add(live_class.moderator.user_id)
+    replace_events(queryset, [build_live_class_event(user_id, live_class) for user_id in user_ids])
+
+
+def add_live_class_events(live_class_id, user_ids):
+    """
+    Add the calendar events of the class for the given users, booked in bulk.
+    """
+    live_class = LiveClass.objects.filter(id=live_class_id).first()
+    if not live_class:
+        return
+    UserCalendarEvent.objects.bulk_create(
+        [build_live_class_event(user_id, live_class) for user_id in user_ids],
+        batch_size=settings.CALENDAR_EVENTS_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def add_live_class_event(booking):
+    live_class = booking.live_class
+    UserCalendarEvent.objects.get_or_create(
+        user_id=booking.user_id,
+        event_type=Ta3leemReminder.LIVE_CLASS,
+        key=text_type(live_class.id),
+        defaults={
+            'description': live_class.name,
+            'start_date': live_class.scheduled_on,
+            'link': get_live_class_link(live_class),
+        },
+    )
+
+
+def remove_live_class_event(booking):
+    UserCalendarEvent.objects.filter(
+        user_id=booking.user_id,
+        event_type=Ta3leemReminder.LIVE_CLASS,
+        key=text_type(booking.live_class_id),
+    ).delete()
+
+
+def sync_custom_event(event):
+    replace_events(
+        UserCalendarEvent.objects.filter(
+            user_id=event.created_by_id,
+            event_type=UserCalendarEvent.CUSTOM_EVENT,
+            key=text_type(event.id),
+        ),
+        [build_custom_event(event)],
+    )
+
+
+def delete_custom_event(event):
+    UserCalendarEvent.objects.filter(
+        user_id=event.created_by_id,
+        event_type=UserCalendarEvent.CUSTOM_EVENT,
+        key=text_type(event.id),
+    ).delete()
+
+
+def ensure_user_events(user):
+    """
+    Build the calendar events of the user, unless they are stored already.
+
+    The stored events are kept up to date by the signals, the events of the
+    users enrolled before the events were stored are built on their first view.
+    """
+    if UserCalendar.objects.filter(user=user).exists():
+        return
+
+    events = []
+    enrollments = CourseEnrollment.objects.filter(user=user, is_active=True)
+    for course in CourseOverview.objects.filter(id__in=enrollments.values('course_id')):
+        events.extend(build_course_events(user, course))
+    live_classes = LiveClass.objects.filter(Q(bookings__user=user) | Q(moderator__user=user)).distinct()
+    events.extend(build_live_class_event(user.id, live_class) for live_class in live_classes)
+    events.extend(build_custom_event(event) for event in CalendarEvent.objects.filter(created_by=user))
+
+    with transaction.atomic():
+        if UserCalendar.objects.get_or_create(user=user)[1]:
+            replace_events(UserCalendarEvent.objects.filter(user=user), events)
+
+
+def get_event_reminders(events, user):
+    """
+    Return the reminders of the events visible to the user, per (event type, key).
+    """
+    reminders = defaultdict(list)
+    queryset = Ta3leemReminder.objects.filter(
+        identifier__in={event.key for event in events if event.event_type != UserCalendarEvent.CUSTOM_EVENT},
+    )
+    for reminder in queryset:
+        if reminder.privacy == Ta3leemReminder.PRIVATE and not reminder.created_by_id == user.id:
+            continue
+        reminders[(reminder.type, reminder.identifier)].append({
+            'description': reminder.message,
+            'start_date': reminder.time,
+            'reminder_id': reminder.id,
+        })
+    return reminders
+
+
+def get_event_title(event):
+    if event.event_type == Ta3leemReminder.COURSE_IMPORTANT_DATE:
+        return "{type} - {title}".format(type=_("Course Important Date"), title=event.title)
+    return {
+        Ta3leemReminder.COURSE_START_DATE: _("Course Start Date"),
+        Ta3leemReminder.COURSE_END_DATE: _("Course End Date"),
+        Ta3leemReminder.EXAM_START_DATE: _("Timed Exam Start"),
+        Ta3leemReminder.EXAM_END_DATE: _("Timed Exam End"),
+        Ta3leemReminder.LIVE_CLASS: _("Live Class"),
+    }.get(event.event_type, event.title)
+
+
+def get_user_calendar_events(user, from_date, to_date):
+    """
+    Return the calendar events of the user between the given dates, with their reminders.
+    """
+    ensure_user_events(user)
+    events = list(UserCalendarEvent.objects.filter(
+        user=user,
+        start_date__range=(from_date, to_date),
+    ).order_by('start_date'))
+    reminders = get_event_reminders(events, user)
+
+    calendar_events = []
+    for event in events:
+        start_date = event.start_date
+        if event.event_type in (Ta3leemReminder.EXAM_START_DATE, Ta3leemReminder.EXAM_END_DATE):
+            start_date = utc_datetime_to_local_datetime(start_date)
+        calendar_event = {
+            'title': get_event_title(event),
+            'description': event.description,
+            'start_date': start_date,
+            'type': event.event_type,
+            EVENT_ID_FIELDS[event.event_type]: event.key,
+            'reminders': reminders.get((event.event_type, event.key), []),
+        }
+        if event.event_type == UserCalendarEvent.CUSTOM_EVENT:
+            calendar_event['event_id'] = int(event.key)
+            calendar_event['reminders'] = []
+        if event.link:
+            calendar_event['link'] = event.link
+        calendar_events.append(calendar_event)
+    return calendar_events
+
+
+def generate_user_ics(user, from_date, to_date, domain):
+    """
+    Return the iCalendar file of the calendar events of the user between the given dates.
+    """
+    ensure_user_events(user)
+    now = datetime.now(pytz.utc)
+    calendar = Calendar()
+    calendar.add('prodid', '-//{}//taleem_calendar//EN'.format(get_value('platform_name', settings.PLATFORM_NAME)))
+    calendar.add('version', '2.0')
+    for event in UserCalendarEvent.objects.filter(
+        user=user,
+        start_date__range=(from_date, to_date),
+    ).order_by('start_date'):
+        ical_event = Event()
+        # The rows are rebuilt as the events change, the uid is derived from the event key
+        uid = hashlib.md5(event.key.encode('utf-8')).hexdigest()
+        ical_event.add('uid', '{}.{}@{}'.format(event.event_type, uid, domain))
+        ical_event.add('dtstamp', now)
+        ical_event.add('summary', get_event_title(event))
+        ical_event.add('description', event.description)
+        ical_event.add('dtstart', event.start_date)
+        if event.link:
+            ical_event.add('url', event.link)
+        ical_event.add('transp', 'TRANSPARENT')
+        calendar.add_component(ical_event)
+    return calendar.to_ical()
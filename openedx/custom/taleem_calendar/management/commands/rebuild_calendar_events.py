@@ -0,0 +1,55 @@
+from logging import getLogger
+
+from django.core.management.base import BaseCommand
+from opaque_keys.edx.keys import CourseKey
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.custom.live_class.models import LiveClass
+from openedx.custom.taleem_calendar.feed import sync_custom_event
+from openedx.custom.taleem_calendar.models import CalendarEvent
+from openedx.custom.taleem_calendar.tasks import sync_course_calendar_events, sync_live_class_calendar_events
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    This command attempts to:
+        Rebuild the stored calendar events of the users, of the given
+        courses only or of all the courses, live classes and custom events.
+        The events of the courses and the classes are rebuilt by background tasks.
+    Example usage:
+        $ ./manage.py lms rebuild_calendar_events
+        $ ./manage.py lms rebuild_calendar_events --courses course-v1:edX+DemoX+Demo_Course
+    """
+    help = 'Command to rebuild the calendar events of the users.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--courses',
+            nargs='+',
+            help='Course keys of the courses or the exams to rebuild the events of.',
+        )
+
+    def handle(self, *args, **options):
+        if options['courses']:
+            course_keys = [CourseKey.from_string(course_id) for course_id in options['courses']]
+        else:
+            course_keys = CourseOverview.get_all_course_keys()
+
+        for course_key in course_keys:
+            sync_course_calendar_events.delay(str(course_key))
+        logger.info('Rebuilding the calendar events of %s courses', len(course_keys))
+        if options['courses']:
+            return
+
+        live_class_ids = list(LiveClass.objects.values_list('id', flat=True))
+        for live_class_id in live_class_ids:
+            sync_live_class_calendar_events.delay(str(live_class_id))
+        logger.info('Rebuilding the calendar events of %s live classes', len(live_class_ids))
+
+        count = 0
+        for event in CalendarEvent.objects.iterator():
+            sync_custom_event(event)
+            count += 1
+        logger.info('Rebuilt %s custom calendar events', count)
@@ -0,0 +1,27 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taleem_calendar', '0005_calendarevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReminderDispatch',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('course_start_date', 'Course Start Date'), ('course_end_date', 'Course End Date'), ('exam_start_date', 'Exam Start Date'), ('exam_end_date', 'Exam End Date'), ('live_class', 'Live Class'), ('course_important_date', 'Course Important Date')], max_length=24)),
+                ('event_id', models.CharField(max_length=255)),
+                ('event_time', models.DateTimeField()),
+                ('reminder_time', models.CharField(max_length=10)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'unique_together': {('event_type', 'event_id', 'event_time', 'reminder_time')},
+            },
+        ),
+    ]
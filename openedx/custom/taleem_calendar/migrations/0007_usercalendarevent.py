@@ -0,0 +1,41 @@
+# Generated by Django 2.2.16 on 2026-10-18 14:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('taleem_calendar', '0006_eventreminderdispatch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserCalendarEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('course_start_date', 'Course Start Date'), ('course_end_date', 'Course End Date'), ('exam_start_date', 'Exam Start Date'), ('exam_end_date', 'Exam End Date'), ('live_class', 'Live Class'), ('course_important_date', 'Course Important Date'), ('custom_event', 'Custom Event')], max_length=24)),
+                ('key', models.CharField(max_length=255)),
+                ('course_id', models.CharField(blank=True, db_index=True, max_length=255)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('start_date', models.DateTimeField()),
+                ('link', models.CharField(blank=True, max_length=500)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='user_calendar_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'unique_together': {('user', 'event_type', 'key')},
+                'index_together': {('user', 'start_date'), ('event_type', 'key')},
+            },
+        ),
+        migrations.CreateModel(
+            name='UserCalendar',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='calendar', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
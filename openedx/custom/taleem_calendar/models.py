@@ -74,3 +74,72 @@ class CalendarEvent(models.Model):
         app_label = 'taleem_calendar'
         verbose_name = _("Calender Event")
         verbose_name_plural = _("Calendar Events")
+
+
+class EventReminderDispatch(models.Model):
+    """
+    Default reminder of an event dispatched to its learners, so it is sent once.
+    """
+    event_type = models.CharField(max_length=24, choices=Ta3leemReminder.REMINDER_TYPES)
+    event_id = models.CharField(max_length=255)
+    event_time = models.DateTimeField()
+    # Time before the event the reminder is sent at, e.g. "24 hours"
+    reminder_time = models.CharField(max_length=10)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'taleem_calendar'
+        unique_together = ('event_type', 'event_id', 'event_time', 'reminder_time')
+
+    @classmethod
+    def claim(cls, event_type, event_id, event_time, reminder_time):
+        """
+        Record the dispatch of the reminder, return False if dispatched already.
+        """
+        __, created = cls.objects.get_or_create(
+            event_type=event_type,
+            event_id=str(event_id),
+            event_time=event_time,
+            reminder_time=reminder_time,
+        )
+        return created
+
+
+class UserCalendarEvent(models.Model):
+    """
+    Event shown on the calendar of a user, kept up to date as the
+    courses, exams, classes and custom events of the user change.
+    """
+    CUSTOM_EVENT = u'custom_event'
+
+    EVENT_TYPES = Ta3leemReminder.REMINDER_TYPES + (
+        (CUSTOM_EVENT, _(u'Custom Event')),
+    )
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="user_calendar_events")
+    event_type = models.CharField(max_length=24, choices=EVENT_TYPES)
+    # Identifier of the event, the reminders of the event share it
+    key = models.CharField(max_length=255)
+    # Course or exam of the event, empty for the classes and the custom events
+    course_id = models.CharField(max_length=255, blank=True, db_index=True)
+    title = models.CharField(max_length=255, blank=True)
+    description = models.TextField(blank=True)
+    start_date = models.DateTimeField()
+    link = models.CharField(max_length=500, blank=True)
+
+    class Meta:
+        app_label = 'taleem_calendar'
+        unique_together = ('user', 'event_type', 'key')
+        index_together = (('user', 'start_date'), ('event_type', 'key'))
+
+
+class UserCalendar(models.Model):
+    """
+    Marks the users whose calendar events are stored, the events of the
+    other users are built on their first calendar view.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="calendar")
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        app_label = 'taleem_calendar'
@@ -0,0 +1,155 @@
+"""
+Default reminders of the events, sent to the learners before the events start or end.
+
+Every run of send_default_event_reminders asks the database for the events
+falling in the windows of the reminders. The windows reach back a few
+runs, so the reminders of a skipped run are still sent. Each reminder is
+recorded when dispatched so overlapping runs never send it twice. The
+reminders are sent by Celery tasks, one task per batch of learners.
+"""
+
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
+from student.models import CourseEnrollment
+from xmodule.course_metadata_utils import DEFAULT_START_DATE
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.custom.live_class.models import LiveClass, LiveClassBooking
+from openedx.custom.taleem_calendar.models import EventReminderDispatch, Ta3leemReminder
+from openedx.custom.taleem_calendar.utils import (
+    send_course_notification,
+    send_exam_notification,
+    send_live_class_notification,
+)
+from openedx.custom.timed_exam.models import TimedExam
+from openedx.custom.utils import chunked
+
+log = logging.getLogger(__name__)
+
+# The command is run every 5 minutes by cron
+REMINDER_WINDOW = timedelta(minutes=5)
+
+
+def get_timedelta_from_offset(time_string):
+    time, offset = time_string.split(' ')
+    time = int(time)
+    if offset == 'hours':
+        time_obj = timedelta(hours=time)
+    elif offset == 'days':
+        time_obj = timedelta(days=time)
+    else:
+        time_obj = timedelta(minutes=time)
+    return time_obj
+
+
+def get_reminder_window(time_string, now=None):
+    """
+    Return the (start, end) times of the events to remind `time_string` before.
+    """
+    now = now or timezone.now()
+    start = now + get_timedelta_from_offset(time_string)
+    catch_up = timedelta(minutes=settings.CALENDAR_REMINDER_CATCH_UP_IN_MINUTES)
+    # Events already started are not reminded
+    return max(start - catch_up, now), start + REMINDER_WINDOW
+
+
+def get_course_events(start, end):
+    """
+    Yield the (event type, event id, event time) of the courses starting or ending in the window.
+    """
+    courses = CourseOverview.get_all_courses().exclude(
+        start=DEFAULT_START_DATE, advertised_start__isnull=True,
+    )
+    for course_id, course_start in courses.filter(start__range=(start, end)).values_list('id', 'start'):
+        yield Ta3leemReminder.COURSE_START_DATE, course_id, course_start
+    for course_id, course_end in courses.filter(end__range=(start, end)).values_list('id', 'end'):
+        yield Ta3leemReminder.COURSE_END_DATE, course_id, course_end
+
+
+def get_exam_events(start, end):
+    """
+    Yield the (event type, event id, event time) of the exams released or due in the window.
+    """
+    exams = TimedExam.objects.all()
+    for key, release_date in exams.filter(release_date__range=(start, end)).values_list('key', 'release_date'):
+        yield Ta3leemReminder.EXAM_START_DATE, key, release_date
+    for key, due_date in exams.filter(due_date__range=(start, end)).values_list('key', 'due_date'):
+        yield Ta3leemReminder.EXAM_END_DATE, key, due_date
+
+
+def get_live_class_events(start, end):
+    """
+    Yield the (event type, event id, event time) of the scheduled classes starting in the window.
+    """
+    classes = LiveClass.objects.filter(
+        stage=LiveClass.SCHEDULED,
+        scheduled_on__range=(start, end),
+    ).order_by().values_list('id', 'scheduled_on')
+    for class_id, scheduled_on in classes:
+        yield Ta3leemReminder.LIVE_CLASS, class_id, scheduled_on
+
+
+def get_audience(event_type, event_id):
+    """
+    Return the ids of the learners to remind of the event.
+    """
+    if event_type == Ta3leemReminder.LIVE_CLASS:
+        user_ids = LiveClassBooking.objects.filter(live_class_id=event_id)
+    else:
+        user_ids = CourseEnrollment.objects.filter(course_id=CourseKey.from_string(str(event_id)), is_active=True)
+    return user_ids.order_by('user_id').values_list('user_id', flat=True)
+
+
+def dispatch_reminders(event_type, event_id, event_time, time_string):
+    """
+    Send the reminder of the event to its learners in the background,
+    unless dispatched already. Return the number of tasks sent.
+    """
+    from openedx.custom.taleem_calendar.tasks import send_event_reminders
+
+    if not EventReminderDispatch.claim(event_type, event_id, event_time, time_string):
+        return 0
+
+    tasks = 0
+    batch_size = settings.CALENDAR_REMINDER_BATCH_SIZE
+    for user_ids in chunked(get_audience(event_type, event_id).iterator(chunk_size=batch_size), batch_size):
+        send_event_reminders.delay(event_type, str(event_id), time_string, user_ids)
+        tasks += 1
+    log.info(
+        "Dispatched the %s reminder of [%s] at %s in %s tasks",
+        event_type, event_id, event_time, tasks,
+    )
+    return tasks
+
+
+def send_reminders(event_type, event_id, time_string, user_ids):
+    """
+    Send the reminder of the event to the given learners.
+    """
+    users = User.objects.filter(id__in=user_ids).select_related('ta3leem_profile')
+    if event_type == Ta3leemReminder.LIVE_CLASS:
+        live_class = LiveClass.objects.filter(id=event_id).first()
+        if not live_class:
+            return
+        for user in users:
+            send_live_class_notification(user, live_class, time_string)
+    elif event_type in (Ta3leemReminder.EXAM_START_DATE, Ta3leemReminder.EXAM_END_DATE):
+        exam = TimedExam.objects.filter(key=event_id).first()
+        if not exam:
+            return
+        notification_type = 'start' if event_type == Ta3leemReminder.EXAM_START_DATE else 'end'
+        for user in users:
+            send_exam_notification(user, exam, notification_type, time_string)
+    else:
+        course = CourseOverview.objects.filter(id=CourseKey.from_string(event_id)).first()
+        if not course:
+            return
+        notification_type = 'start' if event_type == Ta3leemReminder.COURSE_START_DATE else 'end'
+        for user in users:
+            send_course_notification(user, course, notification_type, time_string)
@@ -0,0 +1,76 @@
+"""
+Taleem calendar signals and handlers, keeping the calendar events of the users up to date.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from student.signals import ENROLL_STATUS_CHANGE
+from xmodule.modulestore.django import SignalHandler
+
+from openedx.custom.live_class.models import BOOKINGS_CHANGED, LiveClass, LiveClassBooking
+
+from .feed import add_live_class_event, delete_custom_event, remove_live_class_event, sync_custom_event
+from .models import CalendarEvent
+from .tasks import sync_course_calendar_events, sync_live_class_calendar_events
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def sync_enrollment_calendar_events(sender, event=None, user=None, **kwargs):  # pylint: disable=unused-argument
+    if not user or not kwargs.get('course_id'):
+        return
+
+    course_id = str(kwargs.get('course_id'))
+    transaction.on_commit(lambda: sync_course_calendar_events.delay(course_id, [user.id]))
+
+
+@receiver(SignalHandler.course_published)
+def sync_published_course_calendar_events(sender, course_key, **kwargs):  # pylint: disable=unused-argument
+    """
+    Rebuild the calendar events of the learners, the dates of the course may have changed.
+    """
+    transaction.on_commit(lambda: sync_course_calendar_events.delay(str(course_key)))
+
+
+@receiver(post_save, sender=LiveClass)
+@receiver(post_delete, sender=LiveClass)
+def sync_live_class_calendar(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    live_class_id = str(instance.id)
+    transaction.on_commit(lambda: sync_live_class_calendar_events.delay(live_class_id))
+
+
+@receiver(BOOKINGS_CHANGED)
+def sync_booked_live_classes_calendar(sender, live_class_ids, user_ids=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Add the events of the classes for the users booked in bulk only,
+    the events of the classes are rebuilt if the booked users are unknown.
+    """
+    if user_ids is not None:
+        if not user_ids:
+            return
+        user_ids = list(user_ids)
+    for live_class_id in live_class_ids:
+        transaction.on_commit(
+            lambda live_class_id=str(live_class_id): sync_live_class_calendar_events.delay(live_class_id, user_ids)
+        )
+
+
+@receiver(post_save, sender=LiveClassBooking)
+def add_booking_calendar_event(sender, instance, created, **kwargs):  # pylint: disable=unused-argument
+    if created:
+        add_live_class_event(instance)
+
+
+@receiver(post_delete, sender=LiveClassBooking)
+def remove_booking_calendar_event(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    remove_live_class_event(instance)
+
+
+@receiver(post_save, sender=CalendarEvent)
+def sync_custom_calendar_event(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    sync_custom_event(instance)
+
+
+@receiver(post_delete, sender=CalendarEvent)
+def delete_custom_calendar_event(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    delete_custom_event(instance)
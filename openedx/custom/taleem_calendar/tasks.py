@@ -0,0 +1,59 @@
+"""
+Taleem calendar celery tasks.
+"""
+
+
+import logging
+
+from celery.task import task  # pylint: disable=no-name-in-module, import-error
+from django.conf import settings
+from opaque_keys.edx.keys import CourseKey
+from student.models import CourseEnrollment
+
+from openedx.custom.taleem_calendar.feed import add_live_class_events, sync_course_events, sync_live_class_events
+from openedx.custom.taleem_calendar.reminders import send_reminders
+from openedx.custom.utils import chunked
+
+log = logging.getLogger(__name__)
+
+
+@task(bind=True)
+def send_event_reminders(self, event_type, event_id, time_string, user_ids):
+    """
+    Send the default reminder of an event to a batch of its learners.
+    """
+    send_reminders(event_type, event_id, time_string, user_ids)
+    log.info("Sent the %s reminder of [%s] to %s users", event_type, event_id, len(user_ids))
+
+
+@task(bind=True, routing_key=settings.CALENDAR_EVENTS_ROUTING_KEY)
+def sync_course_calendar_events(self, course_id, user_ids=None):
+    """
+    Rebuild the calendar events of the given users in the course or the exam,
+    or of all its learners in subtasks.
+    """
+    course_key = CourseKey.from_string(course_id)
+    if user_ids is not None:
+        count = sync_course_events(course_key, user_ids)
+        log.info("Rebuilt %s calendar events of %s users in [%s]", count, len(user_ids), course_id)
+        return
+
+    batch_size = settings.CALENDAR_EVENTS_BATCH_SIZE
+    user_ids = CourseEnrollment.objects.filter(
+        course_id=course_key,
+        is_active=True,
+    ).order_by('user_id').values_list('user_id', flat=True)
+    for chunk in chunked(user_ids.iterator(chunk_size=batch_size), batch_size):
+        sync_course_calendar_events.delay(course_id, chunk)
+
+
+@task(bind=True, routing_key=settings.CALENDAR_EVENTS_ROUTING_KEY)
+def sync_live_class_calendar_events(self, live_class_id, user_ids=None):
+    """
+    Add the calendar events of the class for the given users booked in it,
+    or rebuild them for all its users.
+    """
+    if user_ids is not None:
+        add_live_class_events(live_class_id, user_ids)
+        return
+    sync_live_class_events(live_class_id)
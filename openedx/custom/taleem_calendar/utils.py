@@ -4,20 +4,14 @@ import uuid
 from django.conf import settings
 from django.contrib.sites.models import Site
 from django.core.exceptions import ObjectDoesNotExist
-from django.urls import reverse
 from django.utils import translation
 from django.utils.translation import ugettext as _
 from edx_ace import ace
 from edx_ace.recipient import Recipient
 from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
-from six import text_type
 from student.auth import has_course_author_access
-from student.models import CourseEnrollment
-from util.course import get_link_for_about_page
 
-from lms.djangoapps.courseware.courses import get_course_date_blocks
-from lms.djangoapps.courseware.date_summary import CourseAssignmentDate
 from openedx.core.djangoapps.ace_common.template_context import get_base_template_context
 from openedx.core.djangoapps.lang_pref import LANGUAGE_KEY
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
@@ -25,173 +19,14 @@ from openedx.core.djangoapps.user_api.preferences import api as preferences_api
 from openedx.core.lib.celery.task_utils import emulate_http_request
 from openedx.core.lib.request_utils import course_id_from_url
 from openedx.custom.live_class.models import LiveClass
-from openedx.custom.live_class.utils import get_all_live_classes
 from openedx.custom.notifications.constants import NotificationTypes
 from openedx.custom.notifications.utils import notify_user
 from openedx.custom.taleem_calendar.message_types import (NotificationMessage, ReminderMessage)
-from openedx.custom.taleem_calendar.models import CalendarEvent, Ta3leemReminder
-from openedx.custom.utils import utc_datetime_to_local_datetime
+from openedx.custom.taleem_calendar.models import Ta3leemReminder
 
 log = logging.getLogger(__name__)
 
 
-def get_user_courses_between_dates(from_date, to_date, request):
-    courses = []
-    enrollments = CourseEnrollment.objects.filter(user=request.user, course__is_timed_exam=False)
-
-    for enrollment in enrollments:
-        course = enrollment.course
-        # Adding Course Start Date Event
-        if course.start_date and from_date <= course.start_date <= to_date:
-            reminders = _get_reminders(reminder_type='course_start_date', key=course.id, user=request.user)
-            course_start_event = {
-                'title': _("Course Start Date"),
-                'description': course.display_name,
-                'start_date': course.start_date,
-                'type': 'course_start_date',
-                'course_id': text_type(course.id),
-                'link': get_link_for_about_page(course),
-                'reminders': reminders
-            }
-            courses.append(course_start_event)
-
-        # Adding Course Important Dates
-        important_dates = get_course_important_dates(course, request, from_date, to_date)
-        courses = courses + important_dates
-
-        # Adding Course End Date Event
-        if course.end_date and (from_date <= course.end_date <= to_date):
-            reminders = _get_reminders(reminder_type='course_end_date', key=course.id, user=request.user)
-            course_end_event = {
-                'title': _("Course End Date"),
-                'description': course.display_name,
-                'start_date': course.end_date,
-                'type': 'course_end_date',
-                'link': get_link_for_about_page(course),
-                'course_id': text_type(course.id),
-                'reminders': reminders
-            }
-            courses.append(course_end_event)
-
-    return courses
-
-
-def get_user_exams_between_dates(from_date, to_date, user):
-    exams = []
-    enrollments = CourseEnrollment.objects.filter(user=user, course__is_timed_exam=True)
-
-    for enrollment in enrollments:
-        timed_exam = enrollment.course
-        reminders = _get_reminders(reminder_type='exam_start_date', key=timed_exam.id, user=user)
-        if timed_exam.start_date and from_date <= timed_exam.start_date <= to_date:
-            exam = {
-                'title': _("Timed Exam Start"),
-                'description': timed_exam.display_name,
-                'start_date': utc_datetime_to_local_datetime(timed_exam.start_date),
-                'type': 'exam_start_date',
-                'exam_id': text_type(timed_exam.id),
-                'reminders': reminders
-            }
-            exams.append(exam)
-
-        if timed_exam.end_date and from_date <= timed_exam.end_date <= to_date:
-            reminders = _get_reminders(reminder_type='exam_end_date', key=timed_exam.id, user=user)
-            exam = {
-                'title': _("Timed Exam End"),
-                'description': timed_exam.display_name,
-                'start_date': utc_datetime_to_local_datetime(timed_exam.end_date),
-                'type': 'exam_end_date',
-                'exam_id': text_type(timed_exam.id),
-                'reminders': reminders
-            }
-            exams.append(exam)
-
-    return exams
-
-
-def get_user_live_classes_between_dates(from_date, to_date, user):
-    classes = []
-    live_classes = get_all_live_classes(user)
-
-    for live_class in live_classes:
-        if from_date <= live_class.scheduled_on <= to_date:
-            reminders = _get_reminders(reminder_type='live_class', key=live_class.id, user=user)
-            live_class_obj = {
-                'title': _("Live Class"),
-                'start_date': live_class.scheduled_on,
-                'description': live_class.name,
-                'type': 'live_class',
-                'live_class_id': live_class.id,
-                'reminders': reminders
-            }
-
-            if live_class.stage == LiveClass.SCHEDULED or live_class.stage == LiveClass.RUNNING:
-                live_class_obj['link'] = reverse('go_to_class', args=[text_type(live_class.id)])
-
-            classes.append(live_class_obj)
-
-    return classes
-
-
-def get_course_important_dates(course, request, from_date, to_date):
-    important_dates = []
-
-    blocks = get_course_date_blocks(course, request.user, request, include_access=True, include_past_dates=True)
-    for block in blocks:
-        if isinstance(block, CourseAssignmentDate) and block.link:
-            if from_date <= block.date <= to_date:
-                reminders = _get_reminders(reminder_type='course_important_date', key=block.link, user=request.user)
-                block_link = request.build_absolute_uri(block.link)
-                obj = {
-                    'title': "{type} - {title}".format(type=_("Course Important Date"), title=block.title),
-                    'description': course.display_name,
-                    'start_date': block.date,
-                    'type': 'course_important_date',
-                    'link': block_link,
-                    'course_important_date_id': block.link,
-                    'reminders': reminders
-                }
-                important_dates.append(obj)
-
-    return important_dates
-
-
-def get_user_custom_events(from_date, to_date, user):
-    events = []
-    user_events = CalendarEvent.objects.filter(created_by=user)
-    for event in user_events:
-        if from_date <= event.time <= to_date:
-            event_obj = {
-                'event_id': event.id,
-                'title': event.title,
-                'start_date': event.time,
-                'description': event.description,
-                'type': 'custom_event',
-                'reminders': []
-            }
-
-            events.append(event_obj)
-
-    return events
-
-
-def _get_reminders(reminder_type, key, user=None):
-    reminders = []
-    queryset = Ta3leemReminder.objects.filter(type=reminder_type, identifier=key)
-
-    for reminder in queryset:
-        if reminder.privacy == Ta3leemReminder.PRIVATE and not reminder.created_by == user:
-            continue
-        obj = {
-            'description': reminder.message,
-            'start_date': reminder.time,
-            'reminder_id': reminder.id,
-        }
-        reminders.append(obj)
-
-    return reminders
-
-
 def validate_reminder_params(reminder_type, identifier, reminder_time, description):
     allowed_reminder_types = ['course_start_date', 'course_end_date', 'exam_start_date',
                               'exam_end_date', 'live_class', 'individual_user', 'course_important_date']
@@ -3,17 +3,22 @@
 Views for Taleem Calendar App.
 """
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from django.contrib.auth.decorators import login_required
+from django.http import HttpResponse
+from django.utils import timezone
 from django.utils.timezone import make_aware
 from django.views.decorators.http import require_http_methods
 from util.json_request import JsonResponse
 
+from openedx.custom.taleem_calendar.feed import generate_user_ics, get_user_calendar_events
 from openedx.custom.taleem_calendar.models import Ta3leemReminder, CalendarEvent
-from openedx.custom.taleem_calendar.utils import (get_reminder_privacy, get_user_courses_between_dates,
-                                                  get_user_exams_between_dates, get_user_live_classes_between_dates,
-                                                  validate_reminder_params, get_user_custom_events)
+from openedx.custom.taleem_calendar.utils import get_reminder_privacy, validate_reminder_params
+
+# Days of the events exported to iCalendar, before and after today
+ICAL_EXPORT_PAST_DAYS = 30
+ICAL_EXPORT_FUTURE_DAYS = 365
 
 
 @login_required
@@ -41,16 +46,29 @@ def get_all_calendar_events(request):
             'error': '`from_date` should be earlier than the `to_date`.'
         }, status=500)
 
-    courses = get_user_courses_between_dates(from_date, to_date, request)
-    exams = get_user_exams_between_dates(from_date, to_date, request.user)
-    live_classes = get_user_live_classes_between_dates(from_date, to_date, request.user)
-    custom_events = get_user_custom_events(from_date, to_date, request.user)
-
     return JsonResponse({
-        'events': courses + exams + live_classes + custom_events
+        'events': get_user_calendar_events(request.user, from_date, to_date)
     }, status=200)
 
 
+@login_required
+@require_http_methods(('GET', ))
+def export_calendar_events(request):
+    """
+    Export the calendar events of the user around today as an iCalendar file.
+    """
+    today = timezone.now()
+    ics = generate_user_ics(
+        request.user,
+        today - timedelta(days=ICAL_EXPORT_PAST_DAYS),
+        today + timedelta(days=ICAL_EXPORT_FUTURE_DAYS),
+        request.get_host(),
+    )
+    response = HttpResponse(ics, content_type='text/calendar')
+    response['Content-Disposition'] = 'attachment; filename="calendar.ics"'
+    return response
+
+
 @login_required
 @require_http_methods(('POST',))
 def create_reminder(request):
@@ -0,0 +1,61 @@
+"""
+Command to rebuild the exam summaries of the students.
+"""
+
+
+import logging
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from openedx.custom.taleem_grades.models import StudentExamSummary
+from openedx.custom.taleem_grades.tasks import refresh_student_exam_summary
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms rebuild_student_exam_summaries --settings=production
+        $ ./manage.py lms rebuild_student_exam_summaries --users 12 35 --settings=production
+        $ ./manage.py lms rebuild_student_exam_summaries --async --settings=production
+    """
+    help = 'Rebuilds the timed exam summaries shown on the student dashboards.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--users',
+            dest='users',
+            nargs='+',
+            type=int,
+            help='List of (space separated) user ids whose summaries need to be rebuilt.',
+        )
+        parser.add_argument(
+            '--async',
+            dest='run_async',
+            help='Enqueue a task per student instead of rebuilding in the process.',
+            action='store_true',
+            default=False,
+        )
+
+    def handle(self, *args, **options):
+        user_ids = options['users']
+        if not user_ids:
+            user_ids = User.objects.filter(
+                courseenrollment__is_active=True,
+                courseenrollment__course__is_timed_exam=True,
+            ).values_list('id', flat=True).distinct().order_by('id').iterator()
+
+        count = 0
+        for user_id in user_ids:
+            if options['run_async']:
+                refresh_student_exam_summary.delay(user_id)
+            else:
+                StudentExamSummary.refresh(user_id)
+            count += 1
+
+        log.info("Rebuilt the exam summaries of %s students.", count)
@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-17 10:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import jsonfield.fields
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('taleem_grades', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentExamSummary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('submitted_count', models.PositiveIntegerField(default=0)),
+                ('passed_count', models.PositiveIntegerField(default=0)),
+                ('failed_count', models.PositiveIntegerField(default=0)),
+                ('average_grade', models.FloatField(default=0)),
+                ('unattempted_due_dates', jsonfield.fields.JSONField(blank=True, default=dict)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='exam_summary', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
@@ -3,10 +3,15 @@ Models used for persisting exam grades.
 """
 
 
+import calendar
 import logging
+import time
 
+import six
+from django.contrib.auth.models import User
 from django.db import models
 from django.utils.encoding import python_2_unicode_compatible
+from jsonfield import JSONField
 from model_utils.models import TimeStampedModel
 from opaque_keys.edx.django.models import CourseKeyField
 
@@ -145,3 +150,113 @@ class PersistentExamGrade(TimeStampedModel):
     @classmethod
     def _cache_key(cls, course_id):
         return u"taleem_grades_cache.{}".format(course_id)
+
+
+@python_2_unicode_compatible
+class StudentExamSummary(TimeStampedModel):
+    """
+    Denormalized summary of the timed exams of a student,
+    kept up to date from the attempt, grade and enrollment signals.
+
+    Missed and pending exams depend on the current time, so the
+    due dates of the exams not attempted yet are stored instead of the counts.
+
+    .. no_pii:
+    """
+    PASS_CRITERIA = 50.0
+
+    user = models.OneToOneField(User, related_name='exam_summary', on_delete=models.CASCADE)
+    submitted_count = models.PositiveIntegerField(default=0)
+    passed_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+    average_grade = models.FloatField(default=0)
+    # {exam_key: due date timestamp} of the exams not attempted yet
+    unattempted_due_dates = JSONField(default=dict, blank=True)
+
+    class Meta(object):
+        app_label = "taleem_grades"
+
+    def __str__(self):
+        return u"{} user: {}".format(type(self).__name__, self.user_id)
+
+    @property
+    def missed_count(self):
+        now = time.time()
+        return len([
+            due_date for due_date in self.unattempted_due_dates.values()
+            if due_date is not None and due_date < now
+        ])
+
+    @property
+    def pending_count(self):
+        now = time.time()
+        return len([
+            due_date for due_date in self.unattempted_due_dates.values()
+            if due_date is not None and due_date >= now
+        ])
+
+    @classmethod
+    def get_or_build(cls, user_id):
+        """
+        Returns the summary of the given user, builds it if missing.
+        """
+        try:
+            return cls.objects.get(user_id=user_id)
+        except cls.DoesNotExist:
+            return cls.refresh(user_id)
+
+    @classmethod
+    def refresh(cls, user_id):
+        """
+        Recompute the summary of the given user.
+        """
+        # imports placed here to avoid circular import.
+        from edx_proctoring.models import ProctoredExamStudentAttempt
+        from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus
+        from openedx.custom.timed_exam.models import TimedExam
+        from student.models import CourseEnrollment
+
+        timed_exam_ids = [
+            six.text_type(course_id) for course_id in CourseEnrollment.objects.filter(
+                user_id=user_id, is_active=1, course__is_timed_exam=True
+            ).values_list('course_id', flat=True)
+        ]
+
+        attempts = dict(
+            ProctoredExamStudentAttempt.objects.filter(
+                proctored_exam__course_id__in=timed_exam_ids,
+                user_id=user_id,
+            ).values_list('proctored_exam__course_id', 'status')
+        ) if timed_exam_ids else {}
+
+        grades = list(
+            PersistentExamGrade.objects.filter(
+                user_id=user_id,
+                course_id__in=timed_exam_ids,
+            ).values_list('percent_grade', flat=True)
+        ) if timed_exam_ids else []
+
+        unattempted_due_dates = {
+            key: due_date and calendar.timegm(due_date.utctimetuple())
+            for key, due_date in TimedExam.objects.filter(
+                key__in=timed_exam_ids
+            ).exclude(
+                key__in=list(attempts)
+            ).values_list('key', 'due_date')
+        } if timed_exam_ids else {}
+
+        passed_count = len([grade for grade in grades if grade >= cls.PASS_CRITERIA])
+        summary, __ = cls.objects.update_or_create(
+            user_id=user_id,
+            defaults={
+                'submitted_count': len([
+                    status for status in attempts.values()
+                    if status == ProctoredExamStudentAttemptStatus.submitted
+                ]),
+                'passed_count': passed_count,
+                'failed_count': len(grades) - passed_count,
+                'average_grade': round(sum(grades) / len(grades), 2) if grades else 0,
+                'unattempted_due_dates': unattempted_due_dates,
+            }
+        )
+        return summary
@@ -5,10 +5,20 @@ Grades related signals.
 
 from logging import getLogger
 
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
+from course_modes.models import CourseMode
+from edx_proctoring.models import ProctoredExamStudentAttempt
 from lms.djangoapps.grades.signals.signals import SUBSECTION_SCORE_CHANGED
+from openedx.custom.taleem.dashboard_reports import TEACHER_EXAM_REPORT_CACHE_KEY, invalidate_teacher_exam_report
 from openedx.custom.taleem.views import tashgheel_grade_notification
+from openedx.custom.taleem_grades.models import PersistentExamGrade
+from openedx.custom.taleem_grades.tasks import refresh_exam_student_summaries, refresh_student_exam_summary
+from openedx.custom.timed_exam.models import TimedExam
+from student.signals import ENROLL_STATUS_CHANGE
 
 log = getLogger(__name__)
 
@@ -16,6 +26,75 @@ log = getLogger(__name__)
 @receiver(SUBSECTION_SCORE_CHANGED)
 def exam_grade_handler(sender, course, course_structure, user, **kwargs):  # pylint: disable=unused-argument
     """
-    Notify Tashgheel
+    Queue the Tashgheel grade notification
     """
     tashgheel_grade_notification(user, course.id)
+
+
+@receiver(post_save, sender=PersistentExamGrade)
+@receiver(post_delete, sender=PersistentExamGrade)
+def exam_grade_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the teacher reports of the exam
+    and refresh the exam summary of the student.
+    """
+    invalidate_teacher_exam_report(instance.course_id)
+    _refresh_student_exam_summary(instance.user_id)
+
+
+@receiver(pre_save, sender=ProctoredExamStudentAttempt)
+def exam_attempt_saving(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Keep the stored status of the attempt, to tell whether the save changes it.
+    """
+    instance._stored_status = sender.objects.filter(id=instance.id).values_list(
+        'status', flat=True,
+    ).first() if instance.id else None
+
+
+@receiver(post_save, sender=ProctoredExamStudentAttempt)
+@receiver(post_delete, sender=ProctoredExamStudentAttempt)
+def exam_attempt_changed(sender, instance, created=True, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the teacher reports of the exam
+    and refresh the exam summary of the student.
+
+    The teacher reports only depend on the existence of the attempt, the
+    exam summary on its status too. Other updates are ignored.
+    """
+    if created:
+        invalidate_teacher_exam_report(instance.proctored_exam.course_id)
+        _refresh_student_exam_summary(instance.user_id)
+    elif instance.status != getattr(instance, '_stored_status', instance.status):
+        _refresh_student_exam_summary(instance.user_id)
+
+
+@receiver(ENROLL_STATUS_CHANGE)
+def exam_enrollment_changed(sender, event=None, user=None, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the teacher reports of the exam
+    and refresh the exam summary of the student.
+    """
+    if kwargs.get('mode') == CourseMode.TIMED:
+        invalidate_teacher_exam_report(kwargs.get('course_id'))
+        if user:
+            _refresh_student_exam_summary(user.id)
+
+
+@receiver(post_save, sender=TimedExam)
+@receiver(post_delete, sender=TimedExam)
+def timed_exam_changed(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the teacher reports of the exam owner
+    and refresh the exam summary of the enrolled students.
+    """
+    cache.delete(TEACHER_EXAM_REPORT_CACHE_KEY.format(user_id=instance.user_id))
+    course_id = instance.key
+    transaction.on_commit(lambda: refresh_exam_student_summaries.delay(course_id))
+
+
+def _refresh_student_exam_summary(user_id):
+    """
+    Refresh the exam summary of the student once the transaction is committed.
+    """
+    transaction.on_commit(lambda: refresh_student_exam_summary.delay(user_id))
@@ -12,6 +12,7 @@ from django.contrib.auth.models import User
 from student.models import CourseEnrollment
 
 from openedx.custom.taleem_grades.grades import calc_and_persist_exam_grade
+from openedx.custom.taleem_grades.models import StudentExamSummary
 
 log = logging.getLogger(__name__)
 
@@ -57,3 +58,25 @@ def calculate_exam_grades(self, course_id):
             enrollment.user,
             course_key
         )
+
+
+@task(bind=True)
+def refresh_student_exam_summary(self, user_id):
+    """
+    Recompute the exam summary of the given student.
+    """
+    StudentExamSummary.refresh(user_id)
+
+
+@task(bind=True)
+def refresh_exam_student_summaries(self, course_id):
+    """
+    Recompute the exam summary of all the students
+    enrolled in the given exam.
+    """
+    user_ids = CourseEnrollment.objects.filter(
+        course_id=course_id,
+        is_active=True,
+    ).values_list('user_id', flat=True)
+    for user_id in user_ids.iterator():
+        StudentExamSummary.refresh(user_id)
@@ -11,7 +11,6 @@ from django.conf import settings
 from django.core.cache import cache
 from django.utils.decorators import method_decorator
 from django.views.decorators.cache import cache_page
-from django.db.models import Q
 import edx_api_doc_tools as apidocs
 from rest_framework.generics import ListAPIView
 from rest_framework.authentication import SessionAuthentication
@@ -26,8 +25,11 @@ from openedx.custom.timed_exam.utils import get_browsable_exams
 from openedx.custom.timed_exam.api.serializers import ExamSerializer
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.custom.taleem_search.models import FilterCategory, FilterCategoryValue
+from openedx.custom.taleem_search.search_index import search
 from openedx.custom.taleem_search.utils import (
     apply_filters,
+    get_courses_enrichment,
+    get_facet_counts,
     get_sorted_courses,
     get_sorted_live_courses,
     get_sorted_exams,
@@ -40,6 +42,72 @@ from .serializers import (
 
 log = logging.getLogger(__name__)
 
+FACETS_PARAMETER = apidocs.string_parameter(
+    'facets',
+    apidocs.ParameterLocation.QUERY,
+    description="true to get the number of results for each category `option` id along with the results",
+)
+
+
+class FacetedSearchMixin(object):
+    """
+    Add the facet counts of the filter values to the paginated results.
+
+    Views using the mixin define:
+        get_base_queryset(): the results before the filters are applied.
+        sort_queryset(queryset, sort_type): the results in the requested order.
+    """
+
+    def get_queryset(self):
+        """
+        Returns queryset of the base results matching the filters.
+
+        The results will be then sorted based on the order given.
+        """
+        queryset = self.get_base_queryset()
+
+        filters = self.request.query_params.get('filters')
+        if filters:
+            queryset = apply_filters(queryset, filters)
+
+        sort_type = self.request.query_params.get('sort')
+        if sort_type:
+            queryset = self.sort_queryset(queryset, sort_type)
+
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        response = super(FacetedSearchMixin, self).list(request, *args, **kwargs)
+        facets = request.query_params.get('facets', 'false')
+        if facets.lower() == 'true' and isinstance(response.data, dict):
+            response.data['facets'] = get_facet_counts(
+                self.get_base_queryset(),
+                request.query_params.get('filters'),
+            )
+        return response
+
+
+class CourseEnrichmentMixin(object):
+    """
+    Load the user specific data of the courses of a page at once
+    and pass it to the serializer as `course_enrichment`.
+    """
+
+    course_enrichment = None
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args:
+            courses = list(args[0])
+            self.course_enrichment = get_courses_enrichment(courses, self.request.user)
+            args = (courses,) + args[1:]
+        return super(CourseEnrichmentMixin, self).get_serializer(*args, **kwargs)
+
+    def get_serializer_context(self):
+        context = super(CourseEnrichmentMixin, self).get_serializer_context()
+        context['course_enrichment'] = self.course_enrichment or {}
+        return context
+
+
 class SearchPagination(DefaultPagination):
     """
     Paginator for search APIs.
@@ -273,9 +341,7 @@ class CourseSearchAutoCompleteView(ListAPIView):
 
         search_term = self.request.query_params.get('search')
         if search_term:
-            query1 = Q(display_name__icontains=search_term)
-            query2 = Q(short_description__icontains=search_term)
-            courses = courses.filter(query1 | query2)
+            courses = search(courses, search_term)
 
         return courses
 
@@ -336,9 +402,7 @@ class ExamSearchAutoCompleteView(ListAPIView):
         exams = get_browsable_exams()
         search_term = self.request.query_params.get('search')
         if search_term:
-            exams = exams.filter(
-                display_name__icontains=search_term,
-            )
+            exams = search(exams, search_term)
         return exams
 
 
@@ -397,13 +461,11 @@ class LiveCourseSearchAutoCompleteView(ListAPIView):
         live_courses = get_live_courses()
         search_term = self.request.query_params.get('search')
         if search_term:
-            live_courses = live_courses.filter(
-                name__icontains=search_term,
-            )
+            live_courses = search(live_courses, search_term)
         return live_courses
 
 
-class AdvertisedCourseListView(ListAPIView):
+class AdvertisedCourseListView(CourseEnrichmentMixin, ListAPIView):
     """REST endpoint to list the advertised courses"""
 
     authentication_classes = (
@@ -477,7 +539,7 @@ class AdvertisedCourseListView(ListAPIView):
         return courses
 
 
-class PopularCourseListView(ListAPIView):
+class PopularCourseListView(CourseEnrichmentMixin, ListAPIView):
     """REST endpoint to list the popular courses"""
 
     authentication_classes = (
@@ -551,7 +613,7 @@ class PopularCourseListView(ListAPIView):
         return courses
 
 
-class CourseSearchView(ListAPIView):
+class CourseSearchView(CourseEnrichmentMixin, FacetedSearchMixin, ListAPIView):
     """REST endpoint for search, sort and filter courses"""
 
     authentication_classes = (
@@ -577,6 +639,7 @@ class CourseSearchView(ListAPIView):
                 apidocs.ParameterLocation.QUERY,
                 description="atoz, start_date, rating, popular, ztoa",
             ),
+            FACETS_PARAMETER,
         ]
     )
     def get(self, request, *args, **kwargs):
@@ -627,11 +690,9 @@ class CourseSearchView(ListAPIView):
         """
         return super(CourseSearchView, self).get(request, *args, **kwargs)
 
-    def get_queryset(self):
+    def get_base_queryset(self):
         """
-        Returns queryset of courses matching search term and filters.
-
-        The results will be then sorted based on the order given.
+        Returns queryset of courses matching search term.
         """
         cache_key = "ta3leem.search.courses.qs"
         courses = cache.get(cache_key)
@@ -646,24 +707,17 @@ class CourseSearchView(ListAPIView):
             ).exclude(**exclude_archived).distinct()
             cache.set(cache_key, courses, settings.API_CACHE_TIMEOUT)
 
-        filters = self.request.query_params.get('filters')
-        if filters:
-            courses = apply_filters(courses, filters)
-
         search_term = self.request.query_params.get('search')
         if search_term:
-            query1 = Q(display_name__icontains=search_term)
-            query2 = Q(short_description__icontains=search_term)
-            courses = courses.filter(query1 | query2)
-
-        sort_type = self.request.query_params.get('sort')
-        if sort_type:
-            courses = get_sorted_courses(courses, sort_type)
+            courses = search(courses, search_term)
 
         return courses
 
+    def sort_queryset(self, queryset, sort_type):
+        return get_sorted_courses(queryset, sort_type)
 
-class ExamSearchView(ListAPIView):
+
+class ExamSearchView(FacetedSearchMixin, ListAPIView):
     """REST endpoint for search, sort and filter exams"""
 
     authentication_classes = (
@@ -689,6 +743,7 @@ class ExamSearchView(ListAPIView):
                 apidocs.ParameterLocation.QUERY,
                 description="atoz, start_date, popular, ztoa",
             ),
+            FACETS_PARAMETER,
         ]
     )
     def get(self, request, *args, **kwargs):
@@ -741,29 +796,23 @@ class ExamSearchView(ListAPIView):
             })
         return context
 
-    def get_queryset(self):
+    def get_base_queryset(self):
         """
-        Returns queryset of exams matching search term and filters.
-        The results will be then sorted based on the order given.
+        Returns queryset of exams matching search term.
         """
         exams = get_browsable_exams()
 
-        filters = self.request.query_params.get('filters')
-        if filters:
-            exams = apply_filters(exams, filters)
-
         search_term = self.request.query_params.get('search')
         if search_term:
-            exams = exams.filter(display_name__icontains=search_term)
-
-        sort_type = self.request.query_params.get('sort')
-        if sort_type:
-            exams = get_sorted_exams(exams, sort_type)
+            exams = search(exams, search_term)
 
         return exams
 
+    def sort_queryset(self, queryset, sort_type):
+        return get_sorted_exams(queryset, sort_type)
+
 
-class LiveCourseSearchView(ListAPIView):
+class LiveCourseSearchView(FacetedSearchMixin, ListAPIView):
     """REST endpoint for search, sort and filter live courses"""
 
     authentication_classes = (
@@ -789,6 +838,7 @@ class LiveCourseSearchView(ListAPIView):
                 apidocs.ParameterLocation.QUERY,
                 description="atoz, start_date, popular, ztoa",
             ),
+            FACETS_PARAMETER,
         ]
     )
     def get(self, request, *args, **kwargs):
@@ -835,25 +885,17 @@ class LiveCourseSearchView(ListAPIView):
         """
         return super(LiveCourseSearchView, self).get(request, *args, **kwargs)
 
-    def get_queryset(self):
+    def get_base_queryset(self):
         """
-        Returns queryset of live courses matching search term and filters.
-
-        The results will be then sorted based on the order given.
+        Returns queryset of live courses matching search term.
         """
-        courses = get_live_courses()
-
-        filters = self.request.query_params.get('filters')
-        if filters:
-            courses = apply_filters(courses, filters)
+        courses = get_live_courses(user=self.request.user)
 
         search_term = self.request.query_params.get('search')
         if search_term:
-            query = Q(name__icontains=search_term) | Q(description__icontains=search_term)
-            courses = courses.filter(query)
-
-        sort_type = self.request.query_params.get('sort')
-        if sort_type:
-            courses = get_sorted_live_courses(courses, sort_type)
+            courses = search(courses, search_term)
 
         return courses
+
+    def sort_queryset(self, queryset, sort_type):
+        return get_sorted_live_courses(queryset, sort_type)
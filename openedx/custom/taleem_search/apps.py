@@ -11,3 +11,6 @@ class TaleemSearchConfig(AppConfig):
     """
     name = 'openedx.custom.taleem_search'
     verbose_name = 'Taleem Search'
+
+    def ready(self):
+        import openedx.custom.taleem_search.signals  # pylint: disable=unused-import
@@ -0,0 +1,45 @@
+"""
+Command to rebuild the search index of courses, exams and live courses.
+"""
+
+
+import logging
+
+from django.core.management.base import BaseCommand
+
+from openedx.custom.taleem_search.models import SearchIndexEntry
+from openedx.custom.taleem_search.search_index import INDEXED_MODELS, index_object
+
+log = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Example usage:
+        $ ./manage.py lms rebuild_search_index --settings=production
+        $ ./manage.py lms rebuild_search_index --types exam live_course --settings=production
+    """
+    help = 'Rebuilds the search index used by the search and auto complete of courses, exams and live courses.'
+
+    def add_arguments(self, parser):
+        """
+        Entry point for subclassed commands to add custom arguments.
+        """
+        parser.add_argument(
+            '--types',
+            dest='object_types',
+            nargs='+',
+            choices=list(INDEXED_MODELS),
+            help='List of (space separated) object types to rebuild the index of.',
+        )
+
+    def handle(self, *args, **options):
+        object_types = options['object_types'] or list(INDEXED_MODELS)
+        for object_type in object_types:
+            model, _fields = INDEXED_MODELS[object_type]
+            SearchIndexEntry.objects.filter(object_type=object_type).delete()
+            count = 0
+            for instance in model.objects.all().iterator():
+                index_object(instance)
+                count += 1
+            log.info("Indexed %s objects of type %s.", count, object_type)
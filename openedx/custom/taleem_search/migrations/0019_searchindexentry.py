@@ -0,0 +1,28 @@
+# Generated by Django 2.2.16 on 2026-10-17 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('taleem_search', '0018_auto_20230308_0802'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_type', models.CharField(choices=[('course', 'Course'), ('exam', 'Exam'), ('live_course', 'Live Course')], max_length=16)),
+                ('object_id', models.CharField(db_index=True, max_length=255)),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveSmallIntegerField(default=1)),
+            ],
+            options={
+                'verbose_name': 'Search Index Entry',
+                'verbose_name_plural': 'Search Index Entries',
+                'index_together': {('object_type', 'term')},
+            },
+        ),
+    ]
@@ -166,3 +166,35 @@ class ExamFilters(models.Model):
 
     def __str__(self):
         return "Exam: {} , Filter: {}".format(self.exam, self.filter_value)
+
+
+class SearchIndexEntry(models.Model):
+    """
+    Inverted search index of courses, exams and live courses.
+
+    Every entry maps a normalized term, a word or a prefix of a
+    word, to an object it appears in along with the weight of the match.
+    """
+    COURSE = 'course'
+    EXAM = 'exam'
+    LIVE_COURSE = 'live_course'
+
+    OBJECT_TYPES = (
+        (COURSE, _('Course')),
+        (EXAM, _('Exam')),
+        (LIVE_COURSE, _('Live Course')),
+    )
+
+    object_type = models.CharField(max_length=16, choices=OBJECT_TYPES)
+    object_id = models.CharField(max_length=255, db_index=True)
+    term = models.CharField(max_length=64)
+    weight = models.PositiveSmallIntegerField(default=1)
+
+    class Meta(object):
+        app_label = "taleem_search"
+        verbose_name = _("Search Index Entry")
+        verbose_name_plural = _("Search Index Entries")
+        index_together = ('object_type', 'term')
+
+    def __str__(self):
+        return "{}: {} , Term: {}".format(self.object_type, self.object_id, self.term)
@@ -0,0 +1,199 @@
+"""
+Search index of courses, exams and live courses.
+
+Titles and descriptions are normalized, split into words and stored
+along with the prefixes of the words, so both the search and the
+auto complete are answered with indexed lookups of the terms.
+"""
+import re
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Sum, When
+from django.utils.html import strip_tags
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.custom.live_class.models import LiveClass
+from openedx.custom.taleem_search.models import SearchIndexEntry
+from openedx.custom.timed_exam.models import TimedExam
+
+
+MAX_TERM_LENGTH = 64
+MAX_SEARCH_RESULTS = 1000
+
+# Weights of the matches
+TITLE_WEIGHT = 4
+DESCRIPTION_WEIGHT = 1
+WORD_WEIGHT = 2
+
+# Harakat, Quranic marks and tatweel
+ARABIC_DIACRITICS = re.compile('[\u0610-\u061a\u064b-\u065f\u0670\u06d6-\u06ed\u0640]')
+ARABIC_LETTERS = str.maketrans({
+    '\u0622': '\u0627',  # alef with madda above
+    '\u0623': '\u0627',  # alef with hamza above
+    '\u0625': '\u0627',  # alef with hamza below
+    '\u0671': '\u0627',  # alef wasla
+    '\u0649': '\u064a',  # alef maksura
+    '\u0626': '\u064a',  # yeh with hamza above
+    '\u0624': '\u0648',  # waw with hamza above
+    '\u0629': '\u0647',  # teh marbuta
+})
+ARABIC_DEFINITE_ARTICLE = '\u0627\u0644'
+WORDS = re.compile(r'\w+')
+
+# object type: (model, [(field, weight)])
+INDEXED_MODELS = {
+    SearchIndexEntry.COURSE: (CourseOverview, [
+        ('display_name', TITLE_WEIGHT),
+        ('short_description', DESCRIPTION_WEIGHT),
+    ]),
+    SearchIndexEntry.EXAM: (TimedExam, [
+        ('display_name', TITLE_WEIGHT),
+    ]),
+    SearchIndexEntry.LIVE_COURSE: (LiveClass, [
+        ('name', TITLE_WEIGHT),
+        ('description', DESCRIPTION_WEIGHT),
+    ]),
+}
+
+
+def normalize(text):
+    """
+    Normalize the text for the search.
+
+    Lower cases the text, strips the Latin and Arabic diacritics
+    and unifies the Arabic letters having several written forms.
+    """
+    text = ARABIC_DIACRITICS.sub('', text.lower()).translate(ARABIC_LETTERS)
+    return ''.join(
+        char for char in unicodedata.normalize('NFKD', text)
+        if not unicodedata.combining(char)
+    )
+
+
+def tokenize(text):
+    """
+    Return the normalized words of the text.
+    """
+    return [word[:MAX_TERM_LENGTH] for word in WORDS.findall(normalize(strip_tags(text or '')))]
+
+
+def strip_definite_article(word):
+    """
+    Return the Arabic word without the definite article.
+    """
+    if word.startswith(ARABIC_DEFINITE_ARTICLE) and len(word) > len(ARABIC_DEFINITE_ARTICLE) + 1:
+        return word[len(ARABIC_DEFINITE_ARTICLE):]
+    return word
+
+
+def get_terms(instance, fields):
+    """
+    Return the terms of the instance mapped to their weights.
+
+    Terms are the words, with and without the Arabic definite article,
+    and their prefixes. A word weighs more than a mere prefix of a word,
+    and a title more than a description.
+    """
+    terms = {}
+    for field, weight in fields:
+        for word in tokenize(getattr(instance, field)):
+            for stem in {word, strip_definite_article(word)}:
+                for length in range(1, len(stem) + 1):
+                    term_weight = weight * WORD_WEIGHT if length == len(stem) else weight
+                    terms[stem[:length]] = max(terms.get(stem[:length], 0), term_weight)
+    return terms
+
+
+def get_object_type(model):
+    """
+    Return the object type of the index for the given model.
+    """
+    for object_type, (indexed_model, _fields) in INDEXED_MODELS.items():
+        if issubclass(model, indexed_model):
+            return object_type
+    return None
+
+
+def get_indexed_fields(model):
+    """
+    Return the names of the indexed fields of the given model.
+    """
+    _model, fields = INDEXED_MODELS[get_object_type(model)]
+    return [field for field, _weight in fields]
+
+
+def get_indexed_values(instance, stored=False):
+    """
+    Return the values of the indexed fields of the instance,
+    or as stored in the database if `stored`, None if not stored.
+    """
+    fields = get_indexed_fields(type(instance))
+    if stored:
+        return type(instance).objects.filter(pk=instance.pk).values_list(*fields).first()
+    return tuple(getattr(instance, field) for field in fields)
+
+
+def index_object(instance):
+    """
+    Replace the index entries of the given course, exam or live course.
+    """
+    object_type = get_object_type(type(instance))
+    _model, fields = INDEXED_MODELS[object_type]
+    object_id = str(instance.pk)
+    with transaction.atomic():
+        SearchIndexEntry.objects.filter(object_type=object_type, object_id=object_id).delete()
+        SearchIndexEntry.objects.bulk_create([
+            SearchIndexEntry(object_type=object_type, object_id=object_id, term=term, weight=weight)
+            for term, weight in get_terms(instance, fields).items()
+        ])
+
+
+def unindex_object(instance):
+    """
+    Remove the index entries of the given course, exam or live course.
+    """
+    SearchIndexEntry.objects.filter(
+        object_type=get_object_type(type(instance)),
+        object_id=str(instance.pk),
+    ).delete()
+
+
+def get_ranked_ids(object_type, search_term):
+    """
+    Return the ids of the objects matching all the words of
+    the search term, as words or prefixes, best matches first.
+    """
+    terms = set(strip_definite_article(word) for word in tokenize(search_term))
+    if not terms:
+        return []
+    entries = SearchIndexEntry.objects.filter(
+        object_type=object_type,
+        term__in=terms,
+    ).values('object_id').annotate(
+        matched=Count('term', distinct=True),
+        score=Sum('weight'),
+    ).filter(
+        matched=len(terms),
+    ).order_by('-score', 'object_id')
+    return [entry['object_id'] for entry in entries[:MAX_SEARCH_RESULTS]]
+
+
+def search(queryset, search_term):
+    """
+    Filter the queryset of courses, exams or live courses
+    with the search term, ordered by relevance.
+    """
+    model = queryset.model
+    object_ids = [
+        model._meta.pk.to_python(object_id)
+        for object_id in get_ranked_ids(get_object_type(model), search_term)
+    ]
+    if not object_ids:
+        return queryset.none()
+    return queryset.filter(pk__in=object_ids).annotate(
+        search_rank=Case(
+            *[When(pk=object_id, then=rank) for rank, object_id in enumerate(object_ids)],
+            output_field=IntegerField()
+        ),
+    ).order_by('search_rank')
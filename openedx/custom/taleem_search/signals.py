@@ -0,0 +1,75 @@
+"""
+Signal handlers of the taleem search app.
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
+from openedx.custom.live_class.models import LiveClass
+from openedx.custom.taleem_search.models import (
+    CourseFilters, ExamFilters, FilterCategoryValue, LiveCourseFilters,
+)
+from openedx.custom.taleem_search.search_index import (
+    get_indexed_fields, get_indexed_values, index_object, unindex_object,
+)
+from openedx.custom.taleem_search.utils import invalidate_filter_index
+from openedx.custom.timed_exam.models import TimedExam
+
+
+@receiver(post_save, sender=CourseFilters)
+@receiver(post_delete, sender=CourseFilters)
+@receiver(post_save, sender=LiveCourseFilters)
+@receiver(post_delete, sender=LiveCourseFilters)
+@receiver(post_save, sender=ExamFilters)
+@receiver(post_delete, sender=ExamFilters)
+def update_filter_index(sender, **kwargs):
+    """
+    Rebuild the filter index of the objects whose filters have changed.
+    """
+    invalidate_filter_index(sender)
+
+
+@receiver(post_save, sender=FilterCategoryValue)
+@receiver(post_delete, sender=FilterCategoryValue)
+def update_filter_indexes(sender, **kwargs):
+    """
+    Rebuild all the filter indexes as they share the filter values.
+    """
+    invalidate_filter_index()
+
+
+@receiver(pre_save, sender=CourseOverview)
+@receiver(pre_save, sender=TimedExam)
+@receiver(pre_save, sender=LiveClass)
+def keep_indexed_values(sender, instance, update_fields=None, **kwargs):
+    """
+    Keep the stored name and description of the course, exam or live course,
+    to tell whether the save changes them.
+    """
+    if update_fields and not set(update_fields) & set(get_indexed_fields(sender)):
+        instance._indexed_values = get_indexed_values(instance)
+    else:
+        instance._indexed_values = get_indexed_values(instance, stored=True)
+
+
+@receiver(post_save, sender=CourseOverview)
+@receiver(post_save, sender=TimedExam)
+@receiver(post_save, sender=LiveClass)
+def update_search_index(sender, instance, created, **kwargs):
+    """
+    Index the course, exam or live course with its new name and description.
+
+    Other changes, e.g. of the stage of a live class, are ignored.
+    """
+    if created or getattr(instance, '_indexed_values', None) != get_indexed_values(instance):
+        index_object(instance)
+
+
+@receiver(post_delete, sender=CourseOverview)
+@receiver(post_delete, sender=TimedExam)
+@receiver(post_delete, sender=LiveClass)
+def remove_from_search_index(sender, instance, **kwargs):
+    """
+    Remove the deleted course, exam or live course from the search index.
+    """
+    unindex_object(instance)
@@ -0,0 +1,41 @@
+"""
+Tests of the filters of Ta3leem search.
+"""
+from unittest import TestCase
+
+from mock import MagicMock, patch
+
+from openedx.custom.taleem_search.utils import apply_filters
+
+FILTER_INDEX = {
+    # Filter value id: category id
+    'categories': {1: 10, 2: 10, 3: 20},
+    # Filter value id: object ids
+    'values': {1: {100, 101}, 2: {102}, 3: {101, 102}},
+}
+
+
+@patch('openedx.custom.taleem_search.utils.get_filter_index', MagicMock(return_value=FILTER_INDEX))
+class ApplyFiltersTests(TestCase):
+
+    def setUp(self):
+        self.courses = MagicMock()
+
+    def test_values_of_a_category(self):
+        apply_filters(self.courses, '1,2')
+        self.courses.filter.assert_called_once_with(pk__in={100, 101, 102})
+
+    def test_values_of_categories(self):
+        apply_filters(self.courses, '1,3')
+        self.courses.filter.assert_called_once_with(pk__in={101})
+
+    def test_unknown_values_ignored(self):
+        apply_filters(self.courses, '1,999')
+        self.courses.filter.assert_called_once_with(pk__in={100, 101})
+
+    def test_unknown_values_only(self):
+        """
+        As before the filter index, unknown values only match nothing.
+        """
+        self.assertEqual(apply_filters(self.courses, '999'), self.courses.none.return_value)
+        self.courses.filter.assert_not_called()
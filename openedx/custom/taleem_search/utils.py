@@ -2,45 +2,140 @@ import collections
 import math
 
 from django.conf import settings
-from django.db.models import Q, Count
+from django.core.cache import cache
+from django.db.models import Count
 from django.shortcuts import redirect
 from six import text_type
 from student.models import CourseEnrollment
 
 from openedx.custom.taleem.utils import get_course_ratings
-from openedx.custom.taleem_search.models import FilterCategory, FilterCategoryValue
+from openedx.custom.taleem_search.models import (
+    CourseFilters, ExamFilters, FilterCategory, FilterCategoryValue, LiveCourseFilters,
+)
+from openedx.custom.taleem_search.search_index import search
 from openedx.custom.wishlist.models import Wishlist
 
 
+FILTER_INDEX_CACHE_KEY = 'taleem_search.filter_index.{model}'
+FILTER_INDEX_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _get_filters_relation(model):
+    """
+    Return the (through model, object field name) of the filters
+    relation of the given model i.e. CourseOverview, LiveClass or TimedExam.
+    """
+    relation = model._meta.get_field('filters')
+    return relation.related_model, relation.field.name
+
+
+def get_filter_index(model):
+    """
+    Return the filter index of the given model.
+
+    The index maps every filter value id to its category id and to
+    the set of ids of the objects tagged with it, so that filters can be
+    answered with set algebra instead of a query per object.
+    """
+    through_model, field_name = _get_filters_relation(model)
+    cache_key = FILTER_INDEX_CACHE_KEY.format(model=through_model._meta.label_lower)
+    index = cache.get(cache_key)
+    if index is None:
+        values = collections.defaultdict(set)
+        for value_id, object_id in through_model.objects.filter(
+            **{'{}__isnull'.format(field_name): False}
+        ).values_list('filter_value_id', '{}_id'.format(field_name)):
+            values[value_id].add(object_id)
+        index = {
+            'categories': dict(FilterCategoryValue.objects.values_list('id', 'filter_category_id')),
+            'values': dict(values),
+        }
+        cache.set(cache_key, index, FILTER_INDEX_CACHE_TIMEOUT)
+    return index
+
+
+def invalidate_filter_index(through_model=None):
+    """
+    Drop the cached filter index of the given through model, or all of them.
+    """
+    through_models = [through_model] if through_model else [CourseFilters, ExamFilters, LiveCourseFilters]
+    cache.delete_many([
+        FILTER_INDEX_CACHE_KEY.format(model=model._meta.label_lower)
+        for model in through_models
+    ])
+
+
+def parse_filters(filters):
+    """
+    Parse the comma separated filter value ids.
+    """
+    return set(int(value) for value in filters.split(',') if value.strip())
+
+
+def group_filters(index, filters_set):
+    """
+    Group the filter value ids by their category.
+    Unknown filter values are ignored.
+    """
+    categories = collections.defaultdict(set)
+    for value_id in filters_set:
+        category_id = index['categories'].get(value_id)
+        if category_id is not None:
+            categories[category_id].add(value_id)
+    return categories
+
+
+def match_filters(index, categories, exclude_category=None):
+    """
+    Return the set of object ids matching the grouped filters,
+    any value within a category and all of the categories.
+
+    `None` is returned if there is nothing to match against.
+    """
+    matched = None
+    for category_id, value_ids in categories.items():
+        if category_id == exclude_category:
+            continue
+        category_ids = set().union(*(index['values'].get(value_id, ()) for value_id in value_ids))
+        matched = category_ids if matched is None else matched & category_ids
+        if not matched:
+            break
+    return matched
+
+
 def apply_filters(courses, filters):
     """
     Works well for both courses and live courses
     Assumes that filters is a string and not empty.
     courses: Query set to be filtered.
     """
-    filters_set = set(map(int, filters.split(',')))
-    categories = collections.defaultdict(list)
-    for fcv in FilterCategoryValue.objects.filter(
-        id__in=filters_set
-    ):
-      categories[fcv.filter_category.id].append(fcv.id)
-
-
-    def course_valid_for_filters(course):
-        for category in categories:
-            if not course.filters.filter(filter_value__id__in=categories[category]):
-                return False
-        return True
-
-    filtered_courses = courses.filter(
-        filters__filter_value__in=filters_set
-    )
-
-    return courses.filter(id__in=[
-        course.id
-        for course in filtered_courses
-        if course_valid_for_filters(course)
-    ])
+    index = get_filter_index(courses.model)
+    matched = match_filters(index, group_filters(index, parse_filters(filters)))
+    if not matched:
+        return courses.none()
+    return courses.filter(pk__in=matched)
+
+
+def get_facet_counts(courses, filters=None):
+    """
+    Return the number of objects of the given queryset for each filter value.
+
+    Selecting a value narrows the counts of the other categories only,
+    so the counts of a category tell how many objects each of its values
+    would add to the current selection.
+    """
+    index = get_filter_index(courses.model)
+    categories = group_filters(index, parse_filters(filters) if filters else set())
+    object_ids = set(courses.values_list('pk', flat=True))
+
+    scopes = {}
+    facets = {}
+    for value_id, category_id in index['categories'].items():
+        if category_id not in scopes:
+            matched = match_filters(index, categories, exclude_category=category_id)
+            scopes[category_id] = object_ids if matched is None else object_ids & matched
+        facets[value_id] = len(scopes[category_id] & index['values'].get(value_id, set()))
+    return facets
 
 
 def get_category_values(category_id):
@@ -115,23 +210,60 @@ def get_recommended_courses(all_courses, filters):
         filtercategoryvalue__in=filters_set
     ).order_by('weightage')
 
+    index = get_filter_index(all_courses.model)
     for category in categories:
-        category_values = category.filtercategoryvalue_set.all()
-        courses = all_courses.filter(
-            filters__filter_value__in=category_values,
-        )
-        if courses:
+        category_ids = set().union(*(
+            object_ids
+            for value_id, object_ids in index['values'].items()
+            if index['categories'].get(value_id) == category.id
+        ))
+        courses = all_courses.filter(pk__in=category_ids)
+        if category_ids and courses:
             return courses, category.name
 
     return all_courses.none(), ''
 
 
+def get_courses_enrichment(courses, user):
+    """
+    Return the user specific data of the given courses keyed by course id (str).
+
+    The wishlist, the enrollments and the ratings of the user are
+    loaded once for all of the courses instead of once per course.
+    """
+    courses = list(courses)
+    course_keys = [course.id for course in courses]
+
+    wishlist_keys = set()
+    enrolled_keys = set()
+    if user.is_authenticated:
+        wishlist_keys = set(map(text_type, Wishlist.fav_course_id_list(user).filter(course_key__in=course_keys)))
+        enrolled_keys = set(map(text_type, CourseEnrollment.objects.filter(
+            user=user,
+            course_id__in=course_keys,
+            is_active=True,
+        ).values_list('course_id', flat=True)))
+
+    course_ratings = get_course_ratings(user, courses)
+
+    enrichment = {}
+    for course in courses:
+        course_id = text_type(course.id)
+        enrichment[course_id] = {
+            'is_favorite': course_id in wishlist_keys,
+            'is_enrolled': course_id in enrolled_keys,
+            'ratings': course_ratings[course_id],
+        }
+    return enrichment
+
+
 def get_courses_in_json(courses, user):
     json_courses = []
 
-    course_ratings = get_course_ratings(user, courses)
+    enrichment = get_courses_enrichment(courses, user)
 
     for course in courses:
+        course_enrichment = enrichment[text_type(course.id)]
         data = {
             'id': text_type(course.id),
             'display_name_with_default': course.display_name_with_default,
@@ -140,11 +272,11 @@ def get_courses_in_json(courses, user):
             'display_org_with_default': course.display_org_with_default,
             'course_date_string': course.start.strftime('%Y-%m-%dT%H:%M:%S%z'),
             'advertised_start': course.advertised_start,
-            'is_favorite': '' if user.is_anonymous else in_user_wishlist(course, user),
-            'is_enrolled': CourseEnrollment.is_enrolled(user, course.id)
+            'is_favorite': '' if user.is_anonymous else course_enrichment['is_favorite'],
+            'is_enrolled': course_enrichment['is_enrolled'],
         }
 
-        data.update(course_ratings[text_type(course.id)])
+        data.update(course_enrichment['ratings'])
         json_courses.append(data)
 
     return json_courses
@@ -155,8 +287,9 @@ def in_user_wishlist(course, user):
 
 
 def is_course_valid_for_filters(filters_dict, course):
+    index = get_filter_index(type(course))
     for category in filters_dict:
-        if not course.filters.filter(filter_value__id__in=filters_dict[category]):
+        if not any(course.pk in index['values'].get(value_id, ()) for value_id in filters_dict[category]):
             return False
     return True
 
@@ -168,9 +301,7 @@ def get_searched_courses(courses, search_term):
         search_term: string
     returns: Queryset to CourseOverview
     """
-    query1 = Q(display_name__icontains=search_term)
-    query2 = Q(short_description__icontains=search_term)
-    return courses.filter(query1 | query2)
+    return search(courses, search_term)
 
 
 def get_sorted_courses(courses, sort_type):
@@ -224,9 +355,7 @@ def get_sorted_live_courses(courses, sort_type):
     elif sort_type == 'ztoa':
         courses = courses.order_by('-name')
     elif sort_type == 'popular':
-        courses = courses.annotate(
-            num_bookings=Count('bookings')
-        ).order_by('-num_bookings')
+        courses = courses.order_by('-booked_seats')
 
     return courses
 
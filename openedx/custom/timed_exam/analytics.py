@@ -0,0 +1,227 @@
+"""
+Analytics of the exams shown in their reports.
+
+Computing the analytics of a large exam costs seconds of database time,
+so they are stored in an ExamAnalyticsSnapshot computed in the background.
+The snapshot is split in sections recomputed separately as the attempts
+are submitted, the grades change or the attempts are reviewed.
+
+Maps keyed on the students are stored as lists of (student_id, value)
+pairs, JSON objects would turn the ids into strings.
+"""
+
+
+import logging
+
+import numpy
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from edx_proctoring.models import (
+    ProctoredExamReview,
+    ProctoredExamSessionConnectionHistory,
+    ProctoredExamStudentAttempt,
+    ProctoredExamTabSwitchHistory,
+    ProctoredExamWebMonitoringHistory,
+)
+from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus
+from opaque_keys.edx.keys import CourseKey
+from scipy import stats
+from student.models import CourseAccessRole
+
+from openedx.custom.taleem_grades.models import PersistentExamGrade
+from openedx.custom.timed_exam.models import ExamAnalyticsSnapshot
+
+from .helpers import analyze_exam
+from .reports import distribute_scores
+
+log = logging.getLogger(__name__)
+
+ATTENDANCE = 'attendance'
+PROCTORING = 'proctoring'
+GRADES = 'grades'
+REVIEWS = 'reviews'
+SECTIONS = (ATTENDANCE, PROCTORING, GRADES, REVIEWS)
+
+ANALYTICS_SCHEDULED_CACHE_KEY = 'timed_exam.analytics.scheduled.{course_id}.{section}'
+
+
+def get_teachers(course_key):
+    return CourseAccessRole.objects.filter(
+        course_id=course_key, role__in=["staff", "instructor"]
+    ).values_list("user")
+
+
+def compute_attendance(course_key):
+    """
+    Students who have submitted the exam.
+    """
+    attendees = ProctoredExamStudentAttempt.objects.filter(
+        proctored_exam__course_id=course_key,
+        status=ProctoredExamStudentAttemptStatus.submitted,
+        user__is_staff=False,
+    ).exclude(
+        user__in=get_teachers(course_key),
+    ).order_by().values_list("user", flat=True).distinct()
+    return {"attendees": list(attendees)}
+
+
+def _count_per_student(queryset, user_field="user"):
+    return list(
+        queryset.values_list(user_field).annotate(violations=Count("id")).order_by()
+    )
+
+
+def compute_proctoring(course_key):
+    """
+    Proctoring violations of the students.
+    """
+    course_id = str(course_key)
+    snapshots = ProctoredExamWebMonitoringHistory.objects.filter(
+        proctored_exam_snapshot__course_id=course_id,
+    )
+    snapshot_user = "proctored_exam_snapshot__user"
+    return {
+        # The first connection of the session is not a violation
+        "session_violations": [
+            (user_id, connections - 1)
+            for user_id, connections in _count_per_student(
+                ProctoredExamSessionConnectionHistory.objects.filter(course_id=course_id)
+            )
+        ],
+        "tab_violations": _count_per_student(
+            ProctoredExamTabSwitchHistory.objects.filter(course_id=course_id, event_type="out")
+        ),
+        "snapshots_taken": _count_per_student(snapshots, snapshot_user),
+        "face_not_found_violations": _count_per_student(
+            snapshots.filter(status=ProctoredExamWebMonitoringHistory.FACE_NOT_FOUND),
+            snapshot_user,
+        ),
+        "multiple_faces_found_violations": _count_per_student(
+            snapshots.filter(
+                status__in=[
+                    ProctoredExamWebMonitoringHistory.MULTIPLE_FACE_FOUND,
+                    ProctoredExamWebMonitoringHistory.MULTIPLE_PEOPLE_FOUND,
+                ],
+            ),
+            snapshot_user,
+        ),
+        "unknown_face_found_violations": _count_per_student(
+            snapshots.filter(status=ProctoredExamWebMonitoringHistory.UNKNOWN_FACE),
+            snapshot_user,
+        ),
+    }
+
+
+def compute_grades(course_key):
+    """
+    Scores of the students, their distribution and the analysis of the questions.
+    """
+    scores = list(
+        PersistentExamGrade.objects.filter(
+            course_id=str(course_key),
+        ).values_list("user_id", "percent_grade")
+    )
+    score_distribution = {
+        "highest": 0.0,
+        "lowest": 0.0,
+        "mean": 0.0,
+        "median": 0.0,
+        "mode": 0.0,
+        "scores_y_axis": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    }
+    sorted_scores = sorted(score for __, score in scores)
+    if sorted_scores:
+        score_distribution.update(
+            {
+                "highest": sorted_scores[-1],
+                "lowest": sorted_scores[0],
+                "mean": round(float(numpy.mean(sorted_scores)), 2),
+                "median": round(float(numpy.median(sorted_scores)), 2),
+                "mode": round(float(stats.mode(sorted_scores).mode[-1]), 2),
+                "scores_y_axis": distribute_scores(sorted_scores),
+            }
+        )
+
+    question_analysis = analyze_exam(course_key)
+    return {
+        "scores": scores,
+        "score_distribution": score_distribution,
+        "problems": question_analysis["problems"],
+        "cronbach_alpha": question_analysis["cronbach_alpha"],
+    }
+
+
+def compute_reviews(course_key):
+    """
+    Review status of the attempts of the students.
+    """
+    return {
+        "review_status": list(
+            ProctoredExamReview.objects.filter(
+                course_id=str(course_key),
+            ).values_list("user_id", "status")
+        ),
+    }
+
+
+SECTION_FUNCTIONS = {
+    ATTENDANCE: compute_attendance,
+    PROCTORING: compute_proctoring,
+    GRADES: compute_grades,
+    REVIEWS: compute_reviews,
+}
+
+
+def compute_exam_analytics(course_id, sections=SECTIONS):
+    """
+    Compute the given sections of the analytics of the exam and store them in its snapshot.
+    """
+    course_key = CourseKey.from_string(course_id)
+    cache.delete_many([
+        ANALYTICS_SCHEDULED_CACHE_KEY.format(course_id=course_id, section=section)
+        for section in sections
+    ])
+    log.info("Computing the analytics %s of [%s]", ", ".join(sections), course_id)
+    return ExamAnalyticsSnapshot.update_sections(
+        course_id,
+        {section: SECTION_FUNCTIONS[section](course_key) for section in sections},
+    )
+
+
+def schedule_exam_analytics(course_id, sections=SECTIONS, countdown=None):
+    """
+    Recompute the given sections of the analytics of the exam in the background.
+
+    The changes made within TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS are
+    computed at once, e.g. the many submissions at the end of an exam.
+    """
+    from openedx.custom.timed_exam.tasks import refresh_exam_analytics
+
+    course_id = str(course_id)
+    if countdown is None:
+        countdown = settings.TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS
+    sections = [
+        section
+        for section in sections
+        if cache.add(
+            ANALYTICS_SCHEDULED_CACHE_KEY.format(course_id=course_id, section=section),
+            True,
+            countdown + settings.TIMED_EXAM_ANALYTICS_DELAY_IN_SECONDS,
+        )
+    ]
+    if sections:
+        transaction.on_commit(
+            lambda: refresh_exam_analytics.apply_async((course_id, sections), countdown=countdown)
+        )
+
+
+def get_exam_analytics(course_id):
+    """
+    Return the analytics snapshot of the exam, computed now if missing.
+    """
+    snapshot = ExamAnalyticsSnapshot.objects.filter(course_id=course_id).first()
+    if snapshot is None or set(snapshot.data) != set(SECTIONS):
+        snapshot = compute_exam_analytics(course_id)
+    return snapshot
@@ -22,6 +22,21 @@ INCLUDE_EXCLUDE_CHOICES = (
     (EXCLUDE, 'Exclude')
 )
 
+# Number of question sets to write per query
+QUESTION_SET_BATCH_SIZE = 500
+# Number of enrollments handled by a single re-assignment subtask
+QUESTION_SET_TASK_CHUNK_SIZE = 5000
+# Re-assignment is split into subtasks above this number of enrollments
+QUESTION_SET_FAN_OUT_THRESHOLD = 20000
+
+# Flattened problem index of the exams, keyed on the published version
+PROBLEM_INDEX_CACHE_KEY = 'timed_exam.problem_index.{course_key}.{version}'
+PROBLEM_INDEX_VERSION_CACHE_KEY = 'timed_exam.problem_index.version.{course_key}'
+PROBLEM_INDEX_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Maximum number of points in the proctoring timeline chart
+TIMELINE_MAX_POINTS = 900
+
 TIMED_EXAM_ALARM_CONFIGURATION_URL_NAME = 'add_timed_exam_alarm_configuration'
 
 EXAM_KEY_PATTERN = r'(?P<exam_key>[^/+]+(/|\+)[^/+]+(/|\+)[^/?]+)'
@@ -0,0 +1,144 @@
+"""
+Export of the proctoring reports of all the students of an exam.
+
+The reports are rendered to HTML in the task, then converted to PDF by a
+pool of processes, the PDF conversion being the bulk of the work. The PDFs
+are written to a ZIP file as they come, the ZIP is stored in the default
+storage once complete and the requester is notified with its link.
+
+The static assets of the reports, the font and the logo, are read from
+the static files of the server instead of being downloaded by every report.
+"""
+
+
+import logging
+import os
+import tempfile
+import zipfile
+from io import BytesIO
+
+from billiard import Pool
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.urls import reverse
+from django.utils import translation
+from django.utils.six.moves.urllib.parse import urljoin, urlparse
+from edx_proctoring.models import ProctoredExamStudentAttempt
+from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus
+from edxmako.shortcuts import render_to_string
+
+from openedx.custom.notifications.utils import notify_user
+from openedx.custom.utils import chunked
+from openedx.custom.xhtml2pdf import pisa
+
+from .reports import proctoring_report_context
+
+log = logging.getLogger(__name__)
+
+EXPORT_FILE_NAME = 'proctoring_reports/{course_id}/{export_id}.zip'
+
+
+def resolve_report_link(uri, rel):
+    """
+    Resolve the links of the PDF reports, the static assets to their files on the server.
+    """
+    static_path = urlparse(settings.STATIC_URL).path
+    path = urlparse(uri).path
+    if path.startswith(static_path):
+        static_file = os.path.join(settings.STATIC_ROOT, path[len(static_path):])
+        if os.path.isfile(static_file):
+            return static_file
+    return urljoin(settings.LMS_ROOT_URL, uri)
+
+
+def render_pdf(report_html):
+    """
+    Convert the HTML of a report to PDF, return None on errors.
+    """
+    pdf = BytesIO()
+    pisa_status = pisa.CreatePDF(report_html, dest=pdf, link_callback=resolve_report_link)
+    if pisa_status.err:
+        return None
+    return pdf.getvalue()
+
+
+def _render_pdf_job(job):
+    name, report_html = job
+    return name, render_pdf(report_html)
+
+
+def get_student_ids(course_id):
+    return list(
+        ProctoredExamStudentAttempt.objects.filter(
+            proctored_exam__course_id=course_id,
+            status=ProctoredExamStudentAttemptStatus.submitted,
+        ).order_by('user_id').values_list('user_id', flat=True).distinct()
+    )
+
+
+def render_reports_html(export, student_ids):
+    """
+    Return the (file name, HTML) of the reports of the given students.
+    """
+    jobs = []
+    with translation.override(export.language):
+        for student_id in student_ids:
+            try:
+                context = proctoring_report_context(export.course_id, student_id, export.requested_by)
+            except Exception:  # pylint: disable=broad-except
+                log.exception('[Proctoring Export] Could not get the report of [%s] in [%s]', student_id, export.course_id)
+                continue
+            # Permission failures are returned as responses
+            if not isinstance(context, dict):
+                continue
+            name = 'report_{}_{}.pdf'.format(student_id, context['student'].username)
+            jobs.append((name, render_to_string('timed_exam/pdf_report.html', context)))
+    return jobs
+
+
+def run_export(export):
+    """
+    Render the proctoring reports of the exam to a ZIP file of PDFs.
+    """
+    student_ids = get_student_ids(export.course_id)
+    export.start(len(student_ids))
+    log.info('[Proctoring Export] Exporting %s reports of [%s]', len(student_ids), export.course_id)
+
+    # The forked processes must not share the database connections
+    connections.close_all()
+    pool = Pool(processes=settings.PROCTORING_REPORT_EXPORT_PROCESSES)
+    try:
+        with tempfile.TemporaryFile() as export_file:
+            # PDFs are compressed already
+            with zipfile.ZipFile(export_file, 'w', zipfile.ZIP_STORED) as archive:
+                for chunk in chunked(student_ids, settings.PROCTORING_REPORT_EXPORT_BATCH_SIZE):
+                    jobs = render_reports_html(export, chunk)
+                    for name, pdf in pool.imap_unordered(_render_pdf_job, jobs):
+                        if pdf is None:
+                            log.warning('[Proctoring Export] Could not render %s of [%s]', name, export.course_id)
+                            continue
+                        archive.writestr(name, pdf)
+                    export.add_progress(len(chunk))
+
+            export_file.seek(0)
+            file_name = EXPORT_FILE_NAME.format(course_id=export.course_id, export_id=export.id)
+            file_name = default_storage.save(file_name, File(export_file, name=file_name))
+    except BaseException:
+        # e.g. the soft time limit of the task, the reports left are not rendered
+        pool.terminate()
+        raise
+    else:
+        pool.close()
+    finally:
+        pool.join()
+
+    export.finish(file_name)
+    notify_user(
+        export.requested_by,
+        resolve_link=reverse('timed_exam:download_proctoring_export', args=(export.course_id, export.id)),
+        notification_message='The proctoring reports of your exam are ready to download.',
+        title='Proctoring reports',
+    )
+    log.info('[Proctoring Export] Exported the reports of [%s] to %s', export.course_id, file_name)
@@ -4,24 +4,33 @@ Helper functions for timed exam app.
 
 import six
 import json
+import itertools
 import logging
+import numpy
 import pytz
 from datetime import datetime
-from collections import defaultdict
 from six import text_type
 
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.translation import ugettext_lazy as _
 
+from opaque_keys.edx.keys import UsageKey
+from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.django import modulestore
 from edx_user_state_client.interface import XBlockUserState
 from lms.djangoapps.courseware.models import StudentModule
 from submissions.models import Submission, ScoreSummary
 from xblock.fields import Scope
 
-from student.models import anonymous_id_for_user, user_by_anonymous_id
+from student.models import AnonymousUserId, anonymous_id_for_user
 from lms.djangoapps.courseware.module_render import get_module_for_descriptor
 from lms.djangoapps.courseware.model_data import FieldDataCache
+from openedx.custom.timed_exam.constants import (
+    PROBLEM_INDEX_CACHE_KEY,
+    PROBLEM_INDEX_CACHE_TIMEOUT,
+    PROBLEM_INDEX_VERSION_CACHE_KEY
+)
 from openedx.custom.timed_exam.models import QuestionSet
 from openedx.custom.taleem_grades.models import PersistentExamGrade
 
@@ -32,32 +41,18 @@ OPEN_ASSESSMENT = 'openassessment'
 EDX_SGA = 'edx_sga'
 
 
-def num_correct_answers(learner_group, scores):
-    """
-    Return number of learners who answered
-    correctly from the given learner group.
-    """
-    correct = 0
-    for learner_id in learner_group:
-        if scores.get(learner_id, 0):
-            correct += 1
-    return correct
-
-
-def form_learner_groups(course_id):
+def form_learner_groups(grades):
     """
     Divide the group into four equal parts.
     If not precisely divisible by four,
     the highest and lowest groups should be the same size and
     slightly bigger than the two middle groups.
+
+    Arguments: grades (list) [
+        (student_id, percent_grade) from the highest to the lowest grade
+    ]
     """
-    # Arrange the test scores from the highest to the lowest value
-    learners = tuple(
-        PersistentExamGrade.objects.filter(
-            course_id=course_id
-        ).values_list('user_id', flat=True
-        ).order_by('-percent_grade')
-    )
+    learners = tuple(user_id for user_id, __ in grades)
 
     # proceed only if we have records
     num_learners = len(learners)
@@ -106,7 +101,7 @@ def form_learner_groups(course_id):
     )
 
 
-def calc_discrimination_index(learner_groups, scores):
+def calc_discrimination_indexes(learner_groups, correct, row_index):
     """
     The discrimination index can be described as the possibility
     that a specific item might distinguish or discriminate between
@@ -115,19 +110,71 @@ def calc_discrimination_index(learner_groups, scores):
 
     Ref. https://e.itg.be/bangalore/MCQ/Discrimination%20index.html
 
-    Arguments: scores (dict) {
-        student_id: score
-    }
-    learner_groups: tuple of tuples (4 groups)
+    Arguments:
+        learner_groups: tuple of tuples (4 groups)
+        correct: boolean matrix of learners x problems
+        row_index (dict) {
+            student_id: row of the student in the matrix
+        }
+
+    Returns an array with the discrimination index of every problem
+    or None if there are not enough learners.
     """
     if not any(learner_groups):
         return None
-    g1,g2,g3,g4 = learner_groups
-    KH = num_correct_answers(g1, scores)
-    KL = num_correct_answers(g4, scores)
+    g1, g2, g3, g4 = learner_groups
+    KH = correct[[row_index[learner_id] for learner_id in g1]].sum(axis=0)
+    KL = correct[[row_index[learner_id] for learner_id in g4]].sum(axis=0)
     NH = len(g1)
     D = (KH - KL) / NH
-    return round(D, 2)
+    return numpy.round(D, 2)
+
+
+def calc_point_biserial(correct, totals, assigned):
+    """
+    Point-biserial correlation between answering each problem
+    correctly and the total score of the learners, computed over
+    the learners the problem is assigned to.
+
+    Returns an array with NaN for the problems assigned to less than
+    two learners, or answered the same way by all of them.
+    """
+    assigned = assigned.astype(float)
+    items = correct * assigned
+    totals = totals[:, numpy.newaxis] * assigned
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        count = assigned.sum(axis=0)
+        items_mean = items.sum(axis=0) / count
+        totals_mean = totals.sum(axis=0) / count
+        covariance = (items * totals).sum(axis=0) / count - items_mean * totals_mean
+        # The items are 0 or 1, their squares are the items
+        items_variance = items_mean - items_mean ** 2
+        totals_variance = (totals ** 2).sum(axis=0) / count - totals_mean ** 2
+        point_biserials = covariance / numpy.sqrt(items_variance * totals_variance)
+    point_biserials[count < 2] = numpy.nan
+    return point_biserials
+
+
+def calc_cronbach_alpha(scores, assigned):
+    """
+    Cronbach's alpha of the exam, computed over the given
+    learners x problems score matrix.
+
+    Learners assigned different problems do not take the same test, the
+    alpha is computed only if all the learners are assigned the same problems.
+    """
+    if not len(assigned) or (assigned != assigned[0]).any():
+        return None
+    scores = scores[:, assigned[0]]
+    num_learners, num_items = scores.shape
+    if num_learners < 2 or num_items < 2:
+        return None
+    total_variance = scores.sum(axis=1).var(ddof=1)
+    if not total_variance:
+        return None
+    items_variance = scores.var(axis=0, ddof=1).sum()
+    alpha = (num_items / (num_items - 1.0)) * (1 - items_variance / total_variance)
+    return round(float(alpha), 2)
 
 
 def get_effectiveness_of_question(d_value):
@@ -169,100 +216,256 @@ def descriptor_to_module(request, course_key, descriptor):
     return instance
 
 
-def get_assigned_problems(request, user_id, course_key, shallow=False):
-    # Get all problems
-    problems = []
-    for sequential in modulestore().get_items(
-        course_key,
-        qualifiers={'category': 'sequential'}
-    ):
-        for vert in sequential.get_children():
-            problems += vert.get_children()
+def _get_problem_index_version(course_key):
+    """
+    Returns the published version of the course the problem index
+    is keyed on. The version is cached until the course is published again.
+    """
+    version_cache_key = PROBLEM_INDEX_VERSION_CACHE_KEY.format(course_key=course_key)
+    version = cache.get(version_cache_key)
+    if version is None:
+        store = modulestore()
+        with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            course = store.get_course(course_key, depth=0)
+        version = six.text_type(getattr(course, 'course_version', None))
+        cache.set(version_cache_key, version, PROBLEM_INDEX_CACHE_TIMEOUT)
+    return version
+
+
+def get_problem_index(course_key):
+    """
+    Returns the flattened list of problems of the exam
+    in question number order.
 
-    # Filter assigned questions
+    Each item is a dict with the usage key, difficulty level and
+    display name of the problem. The list is cached per published
+    version of the course so the modulestore tree is only traversed
+    once per publish.
+    """
+    cache_key = PROBLEM_INDEX_CACHE_KEY.format(
+        course_key=course_key,
+        version=_get_problem_index_version(course_key),
+    )
+    problem_index = cache.get(cache_key)
+    if problem_index is None:
+        problem_index = []
+        store = modulestore()
+        with store.branch_setting(ModuleStoreEnum.Branch.published_only, course_key):
+            for sequential in store.get_items(
+                course_key,
+                qualifiers={'category': 'sequential'}
+            ):
+                for vert in sequential.get_children():
+                    for problem in vert.get_children():
+                        problem_index.append({
+                            'usage_key': six.text_type(problem.location),
+                            'difficulty_level': getattr(problem, 'difficulty_level', None) or '',
+                            'display_name': problem.display_name,
+                        })
+        cache.set(cache_key, problem_index, PROBLEM_INDEX_CACHE_TIMEOUT)
+    return problem_index
+
+
+def get_assigned_problem_keys(user_id, course_key):
+    """
+    Returns the usage keys of the problems assigned
+    to the given user in question number order.
+    """
+    problem_index = get_problem_index(course_key)
     easy, moderate, hard = QuestionSet.get_question_numbers(user_id, course_key)
+    return [
+        UsageKey.from_string(problem_index[question_num]['usage_key'])
+        for question_num in easy + moderate + hard
+    ]
+
+
+def get_assigned_problem_blocks(user_id, course_key):
+    """
+    Returns the problems assigned to the given user in
+    question number order, loaded with one modulestore query.
+    """
+    usage_keys = get_assigned_problem_keys(user_id, course_key)
+    blocks = {
+        block.location: block
+        for block in modulestore().get_items(
+            course_key,
+            qualifiers={'name': [usage_key.block_id for usage_key in usage_keys]},
+        )
+    }
+    return [blocks[usage_key] for usage_key in usage_keys if usage_key in blocks]
+
+
+def get_assigned_problems(request, user_id, course_key, shallow=False):
+    # Filter assigned questions
+    problems = get_assigned_problem_blocks(user_id, course_key)
 
     # Shallow objects
     if shallow:
-        return [
-            problems[question_num]
-            for question_num in easy + moderate + hard
-        ]
+        return problems
 
     return [
-        descriptor_to_module(request, course_key, problems[question_num])
-        for question_num in easy + moderate + hard
+        descriptor_to_module(request, course_key, problem)
+        for problem in problems
     ]
 
 
-def get_submissions(course_key):
+def get_assigned_matrix(course_key, row_index, num_problems):
+    """
+    Return the boolean learners x problems matrix of the problems assigned
+    to the learners, all the problems to the learners without a question set.
+    """
+    assigned = numpy.ones((len(row_index), num_problems), dtype=bool)
+    question_sets = QuestionSet.objects.filter(
+        course_id=six.text_type(course_key),
+    ).values_list('user_id', 'easy_questions', 'moderate_questions', 'hard_questions')
+    for user_id, easy, moderate, hard in question_sets.iterator():
+        row = row_index.get(user_id)
+        if row is None:
+            continue
+        question_numbers = [
+            int(question_num)
+            for questions in (easy, moderate, hard)
+            for question_num in (questions or '').split(',')
+            if question_num
+        ]
+        assigned[row] = False
+        assigned[row, [question_num for question_num in question_numbers if question_num < num_problems]] = True
+    return assigned
+
+
+def get_score_matrix(course_key, problem_ids, learner_ids=()):
+    """
+    Load the submissions of the exam in a dense matrix.
+
+    Returns a tuple (row_index, scores, answered) where `row_index` maps
+    student id to row, `scores` is a learners x problems matrix
+    of the earned scores and `answered` is the boolean matrix of the
+    submitted problems. Columns follow the order of `problem_ids`.
+    """
+    column_index = {problem_id: column for column, problem_id in enumerate(problem_ids)}
+    entries = []
+
     student_modules = StudentModule.objects.filter(
         course_id=course_key,
         module_type__in=['problem', 'drag-and-drop-v2', 'h5p'],
         student__is_staff=False
-    )
-
-    submissions = defaultdict(dict)
-    for student_module in student_modules:
-        submissions[
-            six.text_type(student_module.module_state_key)
-        ].update({student_module.student_id: student_module.grade or 0})
+    ).values_list('student_id', 'module_state_key', 'grade')
+    for student_id, module_state_key, grade in student_modules.iterator():
+        column = column_index.get(six.text_type(module_state_key))
+        if column is not None:
+            entries.append((student_id, column, grade or 0))
 
-    score_summary = ScoreSummary.objects.filter(
+    score_summaries = list(ScoreSummary.objects.filter(
         student_item__course_id=six.text_type(course_key),
         student_item__item_type__in=['openassessment', 'sga']
+    ).values_list('student_item__student_id', 'student_item__item_id', 'latest__points_earned'))
+
+    # Resolve all the anonymous ids at once
+    learners_by_anonymous_id = dict(
+        AnonymousUserId.objects.filter(
+            anonymous_user_id__in={anonymous_id for anonymous_id, __, __ in score_summaries},
+            user__is_staff=False,
+        ).values_list('anonymous_user_id', 'user_id')
     )
-    for score in score_summary:
-        student_id = user_by_anonymous_id(score.student_item.student_id)
-        if student_id.is_staff:
-            continue
-        submissions[
-            score.student_item.item_id
-        ].update({
-            student_id: \
-            score.latest and score.latest.points_earned or 0
-        })
+    for anonymous_id, item_id, points_earned in score_summaries:
+        student_id = learners_by_anonymous_id.get(anonymous_id)
+        column = column_index.get(item_id)
+        if student_id is not None and column is not None:
+            entries.append((student_id, column, points_earned or 0))
 
-    return submissions
+    row_index = {}
+    for learner_id in itertools.chain(learner_ids, (entry[0] for entry in entries)):
+        row_index.setdefault(learner_id, len(row_index))
 
+    scores = numpy.zeros((len(row_index), len(problem_ids)))
+    answered = numpy.zeros(scores.shape, dtype=bool)
+    if entries:
+        rows, columns, values = zip(*entries)
+        rows = [row_index[student_id] for student_id in rows]
+        scores[rows, columns] = values
+        answered[rows, columns] = True
 
-def analyze_questions(course_key):
+    return row_index, scores, answered
+
+
+def analyze_exam(course_key):
     """
     Analyze Questions based on the submissions.
+
+    All the scores are loaded once in a learners x problems matrix
+    and the statistics of every question are computed from it.
+
+    Returns a dict with the analysis of each question and the
+    Cronbach's alpha of the exam.
     """
-    problems = []
+    problem_index = get_problem_index(course_key)
+    problem_ids = [problem['usage_key'] for problem in problem_index]
+
+    # Arrange the learners from the highest to the lowest grade
+    grades = list(
+        PersistentExamGrade.objects.filter(
+            course_id=six.text_type(course_key)
+        ).values_list('user_id', 'percent_grade').order_by('-percent_grade')
+    )
 
     # Prepare scores
-    submissions = get_submissions(course_key)
+    row_index, scores, answered = get_score_matrix(
+        course_key, problem_ids, learner_ids=[user_id for user_id, __ in grades]
+    )
+    correct = answered & (scores > 0)
+
+    respondents = answered.sum(axis=0)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        p_values = numpy.round(correct.sum(axis=0) / respondents, 2)
 
     # for d_value create 4 groups
-    learner_groups = form_learner_groups(six.text_type(course_key))
+    learner_groups = form_learner_groups(grades)
+    d_values = calc_discrimination_indexes(learner_groups, correct, row_index)
 
-    # Get all problems in the course
-    for sequential in modulestore().get_items(
-        course_key,
-        qualifiers={'category': 'sequential'}
-    ):
-        for vert in sequential.get_children():
-            for problem in vert.get_children():
-                problem_id = six.text_type(problem.location)
-                learner_score_map = submissions.get(problem_id, {})
-                problem_scores = learner_score_map.values()
-                respondents = len(problem_scores)
-                avg_score = respondents and round(sum(problem_scores) / respondents, 2) or 0.0
-                d_value = calc_discrimination_index(learner_groups, learner_score_map)
-                effectiveness = get_effectiveness_of_question(d_value)
-                problems.append({
-                    "id": problem_id,
-                    "display_name": problem.display_name,
-                    "difficulty_level": problem.difficulty_level.capitalize(),
-                    "respondents": respondents,
-                    "d_value": d_value or '--',
-                    "effectiveness": effectiveness,
-                })
-
-    # Sort problems by name
-    return sorted(problems, key=lambda problem:problem["display_name"])
+    # Problems answered but not assigned are counted too, e.g. question sets re-assigned
+    assigned = get_assigned_matrix(course_key, row_index, len(problem_ids)) | answered
+
+    graded_rows = [row_index[user_id] for user_id, __ in grades]
+    totals = numpy.array([percent_grade for __, percent_grade in grades], dtype=float)
+    point_biserials = numpy.round(
+        calc_point_biserial(correct[graded_rows], totals, assigned[graded_rows]), 2
+    )
+
+    problems = []
+    for column, problem in enumerate(problem_index):
+        d_value = float(d_values[column]) if d_values is not None else None
+        problems.append({
+            "id": problem['usage_key'],
+            "display_name": problem['display_name'],
+            "difficulty_level": problem['difficulty_level'].capitalize(),
+            "respondents": int(respondents[column]),
+            "p_value": _to_display_value(p_values[column]),
+            "point_biserial": _to_display_value(point_biserials[column]),
+            "d_value": _to_display_value(d_value),
+            "effectiveness": get_effectiveness_of_question(d_value),
+        })
+
+    return {
+        # Sort problems by name
+        "problems": sorted(problems, key=lambda problem: problem["display_name"]),
+        "cronbach_alpha": calc_cronbach_alpha(scores[graded_rows], assigned[graded_rows]),
+    }
+
+
+def _to_display_value(value):
+    """
+    Convert the numpy value to float, missing values to '--'.
+    """
+    if value is None or numpy.isnan(value):
+        return '--'
+    return float(value)
+
+
+def analyze_questions(course_key):
+    """
+    Analyze Questions based on the submissions.
+    """
+    return analyze_exam(course_key)["problems"]
 
 
 def get_problem_scores(student, course_key, exam_started_at):
@@ -274,20 +477,10 @@ def get_problem_scores(student, course_key, exam_started_at):
     def datetime_to_point(dt):
         return round((dt - exam_started_at).total_seconds())
 
-    # Get all problems
-    problems = []
-    for sequential in modulestore().get_items(
-        course_key,
-        qualifiers={'category': 'sequential'}
-    ):
-        for vert in sequential.get_children():
-            problems += vert.get_children()
-
     # Filter assigned questions
-    easy, moderate, hard = QuestionSet.get_question_numbers(student.id, course_key)
     assigned_problems = {
-        str(problems[question_num].location): problems[question_num]
-        for question_num in easy + moderate + hard
+        str(problem.location): problem
+        for problem in get_assigned_problem_blocks(student.id, course_key)
     }
 
     # Get student modules
@@ -0,0 +1,71 @@
+import time
+from logging import getLogger
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from edxmako.shortcuts import render_to_string
+
+from openedx.custom.timed_exam.exports import render_pdf
+from openedx.custom.timed_exam.reports import proctoring_report_context
+from openedx.custom.xhtml2pdf.cache import clearCaches
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    This command attempts to:
+        Render the proctoring report of a student to PDF many times
+        and print the time taken, with and without the caches of the
+        parsed stylesheets and fonts kept between the documents.
+    Example usage:
+        $ ./manage.py lms benchmark_proctoring_report_pdf course-v1:edX+E101+2021 12 --username teacher
+        $ ./manage.py lms benchmark_proctoring_report_pdf course-v1:edX+E101+2021 12 --username teacher --iterations 50
+    """
+    help = 'Command to benchmark the rendering of the proctoring reports to PDF.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('course_id', help='Course key of the exam.')
+        parser.add_argument('student_id', type=int, help='Id of a student who submitted the exam.')
+        parser.add_argument(
+            '--username',
+            required=True,
+            help='Teacher or admin allowed to access the reports of the exam.',
+        )
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Number of times the report is rendered.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError('User {} does not exist.'.format(options['username']))
+        context = proctoring_report_context(options['course_id'], options['student_id'], user)
+        if not isinstance(context, dict):
+            raise CommandError('Could not get the report of the student.')
+        report_html = render_to_string('timed_exam/pdf_report.html', context)
+
+        iterations = options['iterations']
+        uncached = self.benchmark(report_html, iterations, cached=False)
+        cached = self.benchmark(report_html, iterations, cached=True)
+        self.stdout.write('Rendered the report {} times'.format(iterations))
+        self.stdout.write('Without caches: {:.3f}s per report'.format(uncached / iterations))
+        self.stdout.write('With caches: {:.3f}s per report'.format(cached / iterations))
+        self.stdout.write('Speedup: {:.2f}x'.format(uncached / cached))
+
+    def benchmark(self, report_html, iterations, cached):
+        clearCaches()
+        elapsed = 0
+        for __ in range(iterations):
+            if not cached:
+                clearCaches()
+            start = time.perf_counter()
+            if render_pdf(report_html) is None:
+                raise CommandError('Could not render the report to PDF.')
+            elapsed += time.perf_counter() - start
+        logger.info('Rendered the report %s times in %.3fs, cached: %s', iterations, elapsed, cached)
+        return elapsed
@@ -0,0 +1,26 @@
+# Generated by Django 2.2.16 on 2026-10-18 11:05
+
+from django.db import migrations, models
+import django.utils.timezone
+import jsonfield.fields
+import model_utils.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timed_exam', '0033_timedout_notice'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExamAnalyticsSnapshot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('course_id', models.CharField(max_length=255, unique=True)),
+                ('data', jsonfield.fields.JSONField(blank=True, default={})),
+            ],
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 2.2.16 on 2026-10-18 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timed_exam', '0035_proctoringreportexport'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='timedexam',
+            name='due_date',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='timedexam',
+            name='release_date',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -8,8 +8,10 @@ import random
 import pytz
 from datetime import datetime, timedelta
 
+from django.conf import settings
 from django.urls import reverse
 from django.db import models, transaction
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.utils.translation import ngettext_lazy, ugettext_lazy as _
 from django.core.validators import MaxValueValidator, MinValueValidator
@@ -20,7 +22,7 @@ from simple_history.models import HistoricalRecords
 
 from opaque_keys.edx.keys import CourseKey
 
-from openedx.custom.timed_exam.constants import INCLUDE_EXCLUDE_CHOICES
+from openedx.custom.timed_exam.constants import INCLUDE_EXCLUDE_CHOICES, QUESTION_SET_BATCH_SIZE
 from openedx.custom.taleem_organization.models import Skill
 
 log = logging.getLogger(__name__)
@@ -46,8 +48,8 @@ class TimedExam(TimeStampedModel):
     user_id = models.IntegerField(blank=True, db_index=True, null=True)
     display_name = models.CharField(max_length=255)
     question_bank = models.CharField(max_length=255)
-    due_date = models.DateTimeField(blank=True, null=True)
-    release_date = models.DateTimeField(blank=True, null=True)
+    due_date = models.DateTimeField(blank=True, null=True, db_index=True)
+    release_date = models.DateTimeField(blank=True, null=True, db_index=True)
     allotted_time = models.CharField(max_length=255, default="01:00")
     allowed_disconnection_window = models.CharField(max_length=255, default="01:00")
     is_randomized = models.BooleanField(default=True)
@@ -350,98 +352,164 @@ class QuestionSet(TimeStampedModel):
         question_set.hard_questions = self.hard_questions
         question_set.save()
 
+    @staticmethod
+    def _sample_questions(rng, start_index, num_pulled, num_to_pick):
+        """
+        Pick `num_to_pick` distinct question numbers out of the
+        `[start_index, start_index + num_pulled)` range in a single pass.
+
+        Sampling is done without replacement, so picking all the
+        questions simply returns a shuffled range.
+        """
+        if num_pulled <= 0 or num_to_pick <= 0:
+            return []
+        num_to_pick = min(num_to_pick, num_pulled)
+        return rng.sample(range(start_index, start_index + num_pulled), num_to_pick)
+
+    @classmethod
+    def generate_question_numbers(cls, timed_exam, rng=None):
+        """
+        Generate a random question set as per the difficulty
+        level and optional counts of the given timed exam.
+
+        Returns a tuple of (easy, moderate, hard) question numbers.
+        """
+        rng = rng or random
+        num_easy_questions_pulled = timed_exam.num_easy_questions_pulled
+        num_moderate_questions_pulled = timed_exam.num_moderate_questions_pulled
+        num_hard_questions_pulled = timed_exam.num_hard_questions_pulled
+
+        # Questions are pulled in the order easy, moderate, hard
+        # so every difficulty level has its own range of numbers.
+        easy_questions = cls._sample_questions(
+            rng,
+            0,
+            num_easy_questions_pulled,
+            timed_exam.easy_question_count + timed_exam.optional_easy_question_count,
+        )
+        moderate_questions = cls._sample_questions(
+            rng,
+            num_easy_questions_pulled,
+            num_moderate_questions_pulled,
+            timed_exam.moderate_question_count + timed_exam.optional_moderate_question_count,
+        )
+        hard_questions = cls._sample_questions(
+            rng,
+            num_easy_questions_pulled + num_moderate_questions_pulled,
+            num_hard_questions_pulled,
+            timed_exam.hard_question_count + timed_exam.optional_hard_question_count,
+        )
+        return easy_questions, moderate_questions, hard_questions
+
+    @staticmethod
+    def _get_random_generator(seed, course_id, user_id):
+        """
+        Returns the random generator to be used for the given student.
+
+        With a seed, every student gets its own generator derived
+        from (seed, exam, student) so the allocation can be reproduced
+        regardless of the order in which students are processed.
+        """
+        if seed is None:
+            return random
+        return random.Random("{}:{}:{}".format(seed, course_id, user_id))
+
+    @classmethod
+    def allocate_question_sets(cls, user_ids, course_id, timed_exam=None, seed=None):
+        """
+        Allocate question sets to multiple students in one go.
+
+        Question sets are generated in memory and written in batches,
+        updating the existing sets and bulk creating the missing ones.
+        Pass a `seed` to get a reproducible allocation.
+
+        Returns the number of allocated question sets.
+        """
+        timed_exam = timed_exam or TimedExam.get_obj_by_course_id(course_id)
+        if not timed_exam:
+            return 0
+
+        # Same set to be assigned all students
+        shared_questions = None
+        if not timed_exam.is_randomized:
+            question_set = cls.get_question_set(course_id)
+            if question_set:
+                shared_questions = (
+                    question_set.easy_questions,
+                    question_set.moderate_questions,
+                    question_set.hard_questions,
+                )
+            else:
+                shared_questions = tuple(
+                    ",".join(map(str, questions))
+                    for questions in cls.generate_question_numbers(
+                        timed_exam, cls._get_random_generator(seed, course_id, None)
+                    )
+                )
+
+        allocated = 0
+        user_ids = list(user_ids)
+        for index in range(0, len(user_ids), QUESTION_SET_BATCH_SIZE):
+            batch = user_ids[index:index + QUESTION_SET_BATCH_SIZE]
+            questions_map = {}
+            for user_id in batch:
+                if shared_questions:
+                    questions_map[user_id] = shared_questions
+                else:
+                    questions_map[user_id] = tuple(
+                        ",".join(map(str, questions))
+                        for questions in cls.generate_question_numbers(
+                            timed_exam, cls._get_random_generator(seed, course_id, user_id)
+                        )
+                    )
+            allocated += cls._write_question_sets(course_id, questions_map)
+
+        return allocated
+
+    @classmethod
+    def _write_question_sets(cls, course_id, questions_map):
+        """
+        Store the given {user_id: (easy, moderate, hard)} question sets.
+        """
+        now = timezone.now()
+        existing = list(cls.objects.filter(course_id=course_id, user_id__in=questions_map.keys()))
+        for question_set in existing:
+            question_set.easy_questions, question_set.moderate_questions, question_set.hard_questions = (
+                questions_map.pop(question_set.user_id)
+            )
+            question_set.modified = now
+
+        with transaction.atomic():
+            if existing:
+                cls.objects.bulk_update(
+                    existing,
+                    ['easy_questions', 'moderate_questions', 'hard_questions', 'modified'],
+                )
+            if questions_map:
+                cls.objects.bulk_create(
+                    [
+                        cls(
+                            course_id=course_id,
+                            user_id=user_id,
+                            easy_questions=easy,
+                            moderate_questions=moderate,
+                            hard_questions=hard,
+                        )
+                        for user_id, (easy, moderate, hard) in questions_map.items()
+                    ],
+                    ignore_conflicts=True,
+                )
+        return len(existing) + len(questions_map)
+
     @classmethod
-    def allocate_question_set(cls, user, course_id):
+    def allocate_question_set(cls, user, course_id, seed=None):
         """
         To be called after enrollment.
         It will get the exam settings, will pick random questions,
         as per the difficulty level and optional counts and at last
         it will store the question set.
         """
-        timed_exam = TimedExam.get_obj_by_course_id(course_id)
-        if timed_exam:
-            if not timed_exam.is_randomized:
-                # Same set to be assigned all students
-                question_set = cls.get_question_set(course_id)
-                if question_set:
-                    question_set.assign_to_student(user)
-                    return
-
-            num_easy_questions_pulled = timed_exam.num_easy_questions_pulled
-            num_moderate_questions_pulled = timed_exam.num_moderate_questions_pulled
-            num_hard_questions_pulled = timed_exam.num_hard_questions_pulled
-
-            easy_questions_to_pick = timed_exam.easy_question_count + timed_exam.optional_easy_question_count
-            moderate_questions_to_pick = timed_exam.moderate_question_count + timed_exam.optional_moderate_question_count
-            hard_questions_to_pick = timed_exam.hard_question_count + timed_exam.optional_hard_question_count
-
-            # Actual picked questions
-            easy_questions = []
-            moderate_questions = []
-            hard_questions = []
-
-            # Pick easy questions
-            if num_easy_questions_pulled > 0 and easy_questions_to_pick > 0:
-                if easy_questions_to_pick > num_easy_questions_pulled:
-                    easy_questions_to_pick = num_easy_questions_pulled
-
-                # If all questions to be picked, just shuffle
-                if easy_questions_to_pick == num_easy_questions_pulled:
-                    easy_questions = [i for i in range(easy_questions_to_pick)]
-                    random.shuffle(easy_questions)
-                else:
-                    # Pick random question in specific range
-                    while len(easy_questions) < easy_questions_to_pick:
-                        question_num = random.randint(0, num_easy_questions_pulled - 1)
-                        if question_num not in easy_questions:
-                            easy_questions.append(question_num)
-
-            # Pick moderate questions
-            if num_moderate_questions_pulled > 0 and moderate_questions_to_pick > 0:
-                if moderate_questions_to_pick > num_moderate_questions_pulled:
-                    moderate_questions_to_pick = num_moderate_questions_pulled
-
-                # Define start/end index
-                start_index = num_easy_questions_pulled
-                end_index = start_index + num_moderate_questions_pulled
-
-                # If all questions to be picked, just shuffle
-                if moderate_questions_to_pick == num_moderate_questions_pulled:
-                    moderate_questions = [i for i in range(start_index, end_index)]
-                    random.shuffle(moderate_questions)
-                else:
-                    # Pick random question in specific range
-                    while len(moderate_questions) < moderate_questions_to_pick:
-                        question_num = random.randint(start_index, end_index - 1)
-                        if question_num not in moderate_questions:
-                            moderate_questions.append(question_num)
-
-            # Pick hard questions
-            if num_hard_questions_pulled > 0 and hard_questions_to_pick > 0:
-                if hard_questions_to_pick > num_hard_questions_pulled:
-                    hard_questions_to_pick = num_hard_questions_pulled
-
-                # Update start and end index
-                start_index = num_easy_questions_pulled + num_moderate_questions_pulled
-                end_index = start_index + num_hard_questions_pulled
-
-                # If all questions to be picked, just shuffle
-                if hard_questions_to_pick == num_hard_questions_pulled:
-                    hard_questions = [i for i in range(start_index, end_index)]
-                    random.shuffle(hard_questions)
-                else:
-                    # Pick random question in specific range
-                    while len(hard_questions) < hard_questions_to_pick:
-                        question_num = random.randint(start_index, end_index - 1)
-                        if question_num not in hard_questions:
-                            hard_questions.append(question_num)
-
-            # Store the generated question numbers
-            question_set, created = cls.objects.get_or_create(user=user, course_id=course_id)
-            question_set.easy_questions = ",".join(map(str, easy_questions))
-            question_set.moderate_questions = ",".join(map(str, moderate_questions))
-            question_set.hard_questions = ",".join(map(str, hard_questions))
-            question_set.save()
+        cls.allocate_question_sets([user.id], course_id, seed=seed)
 
     @classmethod
     def get_question_numbers(cls, user_id, course_key):
@@ -723,3 +791,124 @@ class ExamTimedOutNotice(models.Model):
 
     class Meta:
         app_label = 'timed_exam'
+
+
+class ExamAnalyticsSnapshot(TimeStampedModel):
+    """
+    Analytics of an exam shown in its reports.
+
+    The analytics are split in sections computed in the background,
+    `data` maps every section to its values and the time it was computed at.
+    """
+    course_id = models.CharField(max_length=255, unique=True)
+    data = JSONField(default={}, blank=True)
+
+    class Meta:
+        app_label = 'timed_exam'
+
+    @classmethod
+    def update_sections(cls, course_id, sections):
+        """
+        Store the given computed sections e.g. {section: values}, keeping the other sections.
+        """
+        computed_at = timezone.now().timestamp()
+        with transaction.atomic():
+            snapshot, __ = cls.objects.select_for_update().get_or_create(course_id=course_id)
+            for section, values in sections.items():
+                snapshot.data[section] = dict(values, computed_at=computed_at)
+            snapshot.save()
+        return snapshot
+
+    def get_section(self, section):
+        return self.data.get(section, {})
+
+    @property
+    def computed_at(self):
+        """
+        Time the oldest section was computed at.
+        """
+        timestamps = [values['computed_at'] for values in self.data.values()]
+        if not timestamps:
+            return None
+        return datetime.fromtimestamp(min(timestamps), pytz.UTC)
+
+    def __str__(self):
+        return self.course_id
+
+
+class ProctoringReportExport(TimeStampedModel):
+    """
+    Export of the proctoring reports of all the students of an exam, as a ZIP of PDFs.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    STATUS_CHOICES = (
+        (PENDING, _('Pending')),
+        (RUNNING, _('Running')),
+        (DONE, _('Done')),
+        (FAILED, _('Failed')),
+    )
+
+    course_id = models.CharField(max_length=255, db_index=True)
+    requested_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    # Language the reports are rendered in
+    language = models.CharField(max_length=16)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=PENDING)
+    total = models.PositiveIntegerField(default=0)
+    exported = models.PositiveIntegerField(default=0)
+    # Name of the ZIP file in the default storage
+    file_name = models.CharField(max_length=255, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        app_label = 'timed_exam'
+
+    @classmethod
+    def get_or_create_export(cls, course_id, user, language):
+        """
+        Return the export of the user in progress for the exam, or a new one.
+        """
+        exports = cls.objects.filter(
+            course_id=course_id,
+            requested_by=user,
+            status__in=[cls.PENDING, cls.RUNNING],
+        )
+        # Exports outliving the time limit of the task were killed, or never run
+        expired = timezone.now() - timedelta(seconds=settings.PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS)
+        exports.filter(created__lt=expired).update(
+            status=cls.FAILED,
+            error='Timed out',
+            modified=timezone.now(),
+        )
+        export = exports.first()
+        if export:
+            return export, False
+        return cls.objects.create(course_id=course_id, requested_by=user, language=language), True
+
+    @property
+    def in_progress(self):
+        return self.status in (self.PENDING, self.RUNNING)
+
+    def start(self, total):
+        self.status = self.RUNNING
+        self.total = total
+        self.save(update_fields=['status', 'total', 'modified'])
+
+    def add_progress(self, count):
+        ProctoringReportExport.objects.filter(id=self.id).update(exported=models.F('exported') + count)
+
+    def finish(self, file_name):
+        self.status = self.DONE
+        self.file_name = file_name
+        self.save(update_fields=['status', 'file_name', 'modified'])
+
+    def fail(self, error):
+        self.status = self.FAILED
+        self.error = str(error)
+        self.save(update_fields=['status', 'error', 'modified'])
+
+    def __str__(self):
+        return "{} - {}".format(self.course_id, self.id)
@@ -2,6 +2,7 @@
 """
 Timed exam reports.
 """
+import math
 import pytz
 import logging
 from collections import OrderedDict
@@ -20,9 +21,11 @@ from lms.djangoapps.courseware.access import has_access
 from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 from openedx.custom.taleem.models import UserType
 from openedx.custom.taleem_grades.models import PersistentExamGrade
+from openedx.custom.timed_exam.constants import TIMELINE_MAX_POINTS
 from openedx.custom.timed_exam.models import TimedExam
 from openedx.custom.utils import timedelta_to_hhmmss
 from student.roles import CourseStaffRole
+from edx_proctoring import heartbeats
 from edx_proctoring.models import (
     ProctoredExamStudentAttempt,
     ProctoredExamSessionConnectionHistory,
@@ -75,38 +78,38 @@ def proctoring_report_context(course_id, student_id, user):
 
     # elapsed_time: incident
     incidents = {}
-    abnormalities = []
+    # (start, end) seconds of the attempt the student was away
+    abnormal_intervals = []
 
     # Attempt start/end time
     started_at = attempt.started_at
-    completed_at = attempt.completed_at
+    completed_at = attempt.completed_at or timestamp
+
+    def to_interval(start, end):
+        offset = int((start - started_at).total_seconds())
+        return offset, offset + int((end - start).total_seconds())
 
     # Session incidents
     session_history_qs = ProctoredExamSessionConnectionHistory.objects.filter(
         course_id=course_id,
         user=student,
     ).order_by('started_at')
+    # The last echo of the session may not be flushed yet
+    heartbeat = heartbeats.get_heartbeat(attempt.id)
     prev_session = None
     for session_history in session_history_qs:
+        if heartbeat and heartbeat['history_id'] == session_history.id:
+            session_history.last_echo = heartbeats.latest(session_history.last_echo, heartbeat)
         incidents.update({
             timedelta_to_hhmmss(session_history.last_echo - started_at): \
             _("Session was disconnected.")
         })
         if prev_session:
-            away_seconds = int((session_history.started_at - prev_session.last_echo).total_seconds())
-            for second in range(away_seconds):
-                abnormalities.append(
-                    timedelta_to_hhmmss(prev_session.last_echo + timedelta(seconds=second) - started_at)
-                )
+            abnormal_intervals.append(to_interval(prev_session.last_echo, session_history.started_at))
         prev_session = session_history
     # Check abnormalities till submission time
     if prev_session:
-        away_seconds = int((completed_at - prev_session.last_echo).total_seconds())
-        for second in range(away_seconds):
-            abnormalities.append(
-                timedelta_to_hhmmss(prev_session.last_echo + timedelta(seconds=second) - started_at)
-            )
-
+        abnormal_intervals.append(to_interval(prev_session.last_echo, completed_at))
 
     # Tab switch incidents
     tab_history_qs = ProctoredExamTabSwitchHistory.objects.filter(
@@ -123,18 +126,11 @@ def proctoring_report_context(course_id, student_id, user):
             prev_out = tab_history
             continue
         if prev_out:
-            away_seconds = int((tab_history.event_datetime - prev_out.event_datetime).total_seconds())
-            for second in range(away_seconds):
-                abnormalities.append(
-                    timedelta_to_hhmmss(prev_out.event_datetime + timedelta(seconds=second) - started_at)
-                )
+            abnormal_intervals.append(to_interval(prev_out.event_datetime, tab_history.event_datetime))
+            prev_out = None
     # Check abnormalities till submission time
     if prev_out:
-        away_seconds = int((completed_at - prev_out.event_datetime).total_seconds())
-        for second in range(away_seconds):
-            abnormalities.append(
-                timedelta_to_hhmmss(prev_out.event_datetime + timedelta(seconds=second) - started_at)
-            )
+        abnormal_intervals.append(to_interval(prev_out.event_datetime, completed_at))
 
     # Webcam incidents
     webcam_history_qs = ProctoredExamWebMonitoringHistory.objects.filter(
@@ -161,35 +157,19 @@ def proctoring_report_context(course_id, student_id, user):
                 prev_failed = webcam_history
             continue
         if prev_failed:
-            away_seconds = int((
-                webcam_history.proctored_exam_snapshot.created - prev_failed.proctored_exam_snapshot.created
-            ).total_seconds())
-            for second in range(away_seconds):
-                abnormalities.append(timedelta_to_hhmmss(
-                    prev_failed.proctored_exam_snapshot.created + timedelta(seconds=second) - started_at
-                ))
+            abnormal_intervals.append(to_interval(
+                prev_failed.proctored_exam_snapshot.created,
+                webcam_history.proctored_exam_snapshot.created,
+            ))
             prev_failed = None
     # Check abnormalities till submission time
     if prev_failed:
-        away_seconds = int((
-            completed_at - prev_failed.proctored_exam_snapshot.created
-        ).total_seconds())
-        for second in range(away_seconds):
-            abnormalities.append(timedelta_to_hhmmss(
-                prev_failed.proctored_exam_snapshot.created + timedelta(seconds=second) - started_at
-            ))
+        abnormal_intervals.append(to_interval(prev_failed.proctored_exam_snapshot.created, completed_at))
 
     # Timeline chart data
-    timeline_x_axis = []
-    timeline_y_axis = []
-    attempt_duration = int((attempt.completed_at - started_at).total_seconds())
-    for second in range(1, attempt_duration + 1):
-        elapsed_time = timedelta_to_hhmmss(started_at + timedelta(seconds=second) - started_at)
-        timeline_x_axis.append(elapsed_time)
-        timeline_y_axis.append({
-            "color": "#F6848E" if elapsed_time in abnormalities else "#97D637",
-            "y": 0.1,   # 0.1 is fixed, just to show it as column height
-        })
+    attempt_duration = int((completed_at - started_at).total_seconds())
+    timeline_segments = get_timeline_segments(abnormal_intervals, attempt_duration)
+    timeline_x_axis, timeline_y_axis = downsample_timeline(timeline_segments, attempt_duration)
 
     # Exam score
     try:
@@ -211,6 +191,7 @@ def proctoring_report_context(course_id, student_id, user):
         'tab_history': tab_history_qs,
         'webcam_history': webcam_history_qs,
         'incidents': OrderedDict(sorted(incidents.items())),
+        'timeline_segments': timeline_segments,
         'timeline_x_axis': timeline_x_axis,
         'timeline_y_axis': timeline_y_axis,
         'due_date_passed': due_date_passed,
@@ -219,6 +200,75 @@ def proctoring_report_context(course_id, student_id, user):
     }
 
 
+def merge_intervals(intervals):
+    """
+    Merge the overlapping (start, end) intervals.
+
+    Intervals are swept in the order of their start and
+    merged into the current one as long as they overlap it.
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def get_timeline_segments(abnormal_intervals, duration):
+    """
+    Run-length encoded timeline of the attempt.
+
+    Returns a list of {"start", "end", "abnormal"} segments
+    covering the seconds of the attempt, where the seconds
+    within [start, end) share the same state.
+    """
+    segments = []
+    position = 0
+    for start, end in merge_intervals(abnormal_intervals):
+        start, end = max(start, 0), min(end, duration)
+        if start >= end:
+            continue
+        if start > position:
+            segments.append({"start": position, "end": start, "abnormal": False})
+        segments.append({"start": start, "end": end, "abnormal": True})
+        position = end
+    if position < duration:
+        segments.append({"start": position, "end": duration, "abnormal": False})
+    return segments
+
+
+def downsample_timeline(segments, duration, max_points=TIMELINE_MAX_POINTS):
+    """
+    Produce the x/y series of the timeline chart from the segments.
+
+    Every point of the series stands for a bucket of seconds,
+    sized so the series has at most `max_points` points. A bucket is
+    marked abnormal if any of its seconds is abnormal.
+    """
+    bucket_size = max(1, int(math.ceil(duration / float(max_points)))) if max_points else 1
+    abnormal_segments = [segment for segment in segments if segment["abnormal"]]
+
+    timeline_x_axis = []
+    timeline_y_axis = []
+    index = 0
+    for bucket_start in range(0, duration, bucket_size):
+        # Seconds of the bucket are [bucket_start, bucket_end)
+        bucket_end = min(bucket_start + bucket_size, duration)
+        while index < len(abnormal_segments) and abnormal_segments[index]["end"] <= bucket_start:
+            index += 1
+        is_abnormal = index < len(abnormal_segments) and abnormal_segments[index]["start"] < bucket_end
+        timeline_x_axis.append(timedelta_to_hhmmss(timedelta(seconds=bucket_end)))
+        timeline_y_axis.append({
+            "color": "#F6848E" if is_abnormal else "#97D637",
+            "y": 0.1,   # 0.1 is fixed, just to show it as column height
+        })
+    return timeline_x_axis, timeline_y_axis
+
+
 def distribute_scores(sorted_scores):
     less_than_10 = 0
     bet_11_20 = 0
@@ -1,12 +1,18 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
+from edx_proctoring.models import ProctoredExamReview, ProctoredExamStudentAttempt
+from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus
 from opaque_keys.edx.keys import CourseKey
 
-from xmodule.modulestore.django import modulestore
+from xmodule.modulestore.django import modulestore, SignalHandler
 from student.models import EnrollStatusChange, CourseEnrollment
 from course_modes.models import CourseMode
 from student.signals import ENROLL_STATUS_CHANGE
+from openedx.custom.taleem_grades.models import PersistentExamGrade
+from openedx.custom.timed_exam.analytics import ATTENDANCE, GRADES, PROCTORING, REVIEWS, schedule_exam_analytics
+from openedx.custom.timed_exam.constants import PROBLEM_INDEX_VERSION_CACHE_KEY
 from openedx.custom.timed_exam.models import PendingTimedExamUser, TimedExam, QuestionSet
 from openedx.custom.taleem.views import tashgheel_skill_notification
 from openedx.custom.taleem_emails.models import Ta3leemEmail
@@ -75,3 +81,31 @@ def handle_pending_enrollments(sender, instance, created, **kwargs):
 def send_new_skill_notification(sender, instance, created, **kwargs):
     tashgheel_skill_notification(instance)
 
+
+@receiver(SignalHandler.course_published)
+def invalidate_problem_index(sender, course_key, **kwargs):
+    """
+    Drop the cached published version so the problem index
+    is rebuilt for the new version of the exam.
+    """
+    cache.delete(PROBLEM_INDEX_VERSION_CACHE_KEY.format(course_key=course_key))
+
+
+@receiver(post_save, sender=ProctoredExamStudentAttempt)
+def refresh_attendance_analytics(sender, instance, **kwargs):
+    """
+    Refresh the attendance and the proctoring violations of the reports once the attempt is submitted.
+    """
+    if instance.status == ProctoredExamStudentAttemptStatus.submitted:
+        schedule_exam_analytics(instance.proctored_exam.course_id, (ATTENDANCE, PROCTORING))
+
+
+@receiver(post_save, sender=PersistentExamGrade)
+@receiver(post_delete, sender=PersistentExamGrade)
+def refresh_grades_analytics(sender, instance, **kwargs):
+    schedule_exam_analytics(instance.course_id, (GRADES,))
+
+
+@receiver(post_save, sender=ProctoredExamReview)
+def refresh_reviews_analytics(sender, instance, **kwargs):
+    schedule_exam_analytics(instance.course_id, (REVIEWS,))
@@ -5,6 +5,8 @@ Background tasks for timed exam.
 import random
 import logging
 
+from billiard.exceptions import SoftTimeLimitExceeded
+from celery import chord
 from celery.task import task  # pylint: disable=no-name-in-module, import-error
 from celery_utils.persist_on_failure import LoggedPersistOnFailureTask
 from django.conf import settings
@@ -14,22 +16,35 @@ from django.contrib.sites.models import Site
 from course_modes.models import CourseMode
 from edx_ace import ace
 from edx_ace.message import Message
+from openedx.custom.timed_exam.analytics import compute_exam_analytics
+from openedx.custom.timed_exam.exports import run_export
 from openedx.custom.timed_exam.image_verification_service import (
     FACE_NOT_FOUND,
     MULTIPLE_FACE_FOUND,
     MULTIPLE_PEOPLE_FOUND,
     ImageVerificationService
 )
-from openedx.custom.timed_exam.models import QuestionSet
+from openedx.custom.timed_exam.constants import (
+    QUESTION_SET_BATCH_SIZE,
+    QUESTION_SET_FAN_OUT_THRESHOLD,
+    QUESTION_SET_TASK_CHUNK_SIZE
+)
+from openedx.custom.timed_exam.models import ProctoringReportExport, QuestionSet, TimedExam
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.lib.celery.task_utils import emulate_http_request
-from openedx.custom.utils import convert_image_to_base64
+from openedx.custom.utils import chunked, convert_image_to_base64
 from student.models import CourseEnrollment
-from edx_proctoring.models import ProctoredExamSnapshot, ProctoredExamWebMonitoringHistory
+from edx_proctoring.models import (
+    ProctoredExamSessionConnectionHistory,
+    ProctoredExamSnapshot,
+    ProctoredExamWebMonitoringHistory,
+)
 from lms.djangoapps.verify_student.services import IDVerificationService
 
 log = logging.getLogger(__name__)
 RANDOM_VALUE = "DUMMY"
+# Time given to an export to record its failure once its time limit is exceeded
+PROCTORING_REPORT_EXPORT_CLEANUP_IN_SECONDS = 60
 
 
 @task(bind=True)
@@ -83,15 +98,51 @@ def bulk_re_assign_question_set(self, course_id):
     To be scheduled after exam edit success,
     to update the question set for already enrolled
     students.
+
+    Enrollments are streamed in chunks and the question sets
+    are written in batches. Exams with a huge number of enrollments
+    are split into subtasks running in parallel.
     """
+    timed_exam = TimedExam.get_obj_by_course_id(course_id)
+    if not timed_exam:
+        return
+
     # Get enrollments
-    enrollments = CourseEnrollment.objects.filter(
+    user_ids = CourseEnrollment.objects.filter(
         course_id=course_id,
         mode=CourseMode.TIMED,
         is_active=True,
-    )
-    for enrollment in enrollments:
-        QuestionSet.allocate_question_set(enrollment.user, course_id)
+    ).values_list('user_id', flat=True).order_by('user_id')
+
+    # All students share the same set in a non randomized exam,
+    # so the work is only writes and can't be split safely.
+    if timed_exam.is_randomized and user_ids.count() > QUESTION_SET_FAN_OUT_THRESHOLD:
+        chunks = chunked(user_ids.iterator(chunk_size=QUESTION_SET_TASK_CHUNK_SIZE), QUESTION_SET_TASK_CHUNK_SIZE)
+        header = [re_assign_question_set_chunk.s(course_id, chunk) for chunk in chunks]
+        log.info('Re-assigning question sets of [{}] in {} subtasks.'.format(course_id, len(header)))
+        chord(header)(question_set_re_assigned.s(course_id))
+        return
+
+    allocated = 0
+    for chunk in chunked(user_ids.iterator(chunk_size=QUESTION_SET_BATCH_SIZE), QUESTION_SET_BATCH_SIZE):
+        allocated += QuestionSet.allocate_question_sets(chunk, course_id, timed_exam=timed_exam)
+    log.info('Re-assigned {} question sets of [{}].'.format(allocated, course_id))
+
+
+@task(bind=True)
+def re_assign_question_set_chunk(self, course_id, user_ids):
+    """
+    Re-assign question sets for the given chunk of students.
+    """
+    return QuestionSet.allocate_question_sets(user_ids, course_id)
+
+
+@task(bind=True)
+def question_set_re_assigned(self, allocated, course_id):
+    """
+    Callback of the re-assignment subtasks.
+    """
+    log.info('Re-assigned {} question sets of [{}].'.format(sum(allocated), course_id))
 
 
 @task(
@@ -220,3 +271,43 @@ def delete_timed_exam_proctoring_snapshots(self, timed_exam_ids):
         )
         log.error(str(exc))
         self.retry()
+
+
+@task(bind=True, time_limit=settings.PROCTORING_HEARTBEAT_FLUSH_INTERVAL_IN_SECONDS)
+def flush_proctoring_heartbeats(self):
+    """
+    Write the cached poll times of the exam attempts to the database.
+    """
+    count = ProctoredExamSessionConnectionHistory.flush_heartbeats()
+    log.info('[Proctoring Heartbeats] Flushed %s heartbeats.', count)
+
+
+@task(bind=True)
+def refresh_exam_analytics(self, course_id, sections):
+    """
+    Recompute the given sections of the analytics snapshot of the exam.
+    """
+    compute_exam_analytics(course_id, sections)
+
+
+@task(
+    bind=True,
+    soft_time_limit=settings.PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS,
+    time_limit=settings.PROCTORING_REPORT_EXPORT_TIME_LIMIT_IN_SECONDS + PROCTORING_REPORT_EXPORT_CLEANUP_IN_SECONDS,
+)
+def export_proctoring_reports(self, export_id):
+    """
+    Export the proctoring reports of all the students of an exam to a ZIP file.
+    """
+    export = ProctoringReportExport.objects.select_related('requested_by').get(id=export_id)
+    # Failed already if queued for longer than the time limit
+    if export.status != ProctoringReportExport.PENDING:
+        return
+    try:
+        run_export(export)
+    except SoftTimeLimitExceeded:
+        log.error('[Proctoring Export] Timed out exporting the reports of [%s]', export.course_id)
+        export.fail('Timed out')
+    except Exception as exc:
+        log.exception('[Proctoring Export] Failed to export the reports of [%s]', export.course_id)
+        export.fail(exc)
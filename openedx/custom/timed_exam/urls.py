@@ -9,10 +9,14 @@ app_name = 'timed_exam'
 
 urlpatterns = [
     url(r'^discover/', views.discover_exams, name='discover_exams'),
+    url(r'^{}/reports/recompute/'.format(settings.COURSE_ID_PATTERN), views.recompute_reports, name='recompute_reports'),
     url(r'^{}/reports/'.format(settings.COURSE_ID_PATTERN), views.reports, name='reports'),
     url(r'^{}/exam/grades/refresh/'.format(settings.COURSE_ID_PATTERN), views.refresh_exam_grades, name='refresh_exam_grades'),
     url(r'^{}/proctoring/(?P<student_id>[0-9]+)/'.format(settings.COURSE_ID_PATTERN), views.proctoring, name='proctoring'),
     url(r'^{}/proctoring/pdf/(?P<student_id>[0-9]+)/'.format(settings.COURSE_ID_PATTERN), views.proctoring_pdf, name='proctoring_pdf'),
+    url(r'^{}/proctoring/export/(?P<export_id>[0-9]+)/download/'.format(settings.COURSE_ID_PATTERN), views.download_proctoring_export, name='download_proctoring_export'),
+    url(r'^{}/proctoring/export/(?P<export_id>[0-9]+)/'.format(settings.COURSE_ID_PATTERN), views.proctoring_export_progress, name='proctoring_export_progress'),
+    url(r'^{}/proctoring/export/'.format(settings.COURSE_ID_PATTERN), views.export_proctoring_pdfs, name='export_proctoring_pdfs'),
     url(r'^{}/hide/'.format(settings.COURSE_ID_PATTERN), views.hide_exam, name='hide_exam'),
     url(r'^{}/enroll/'.format(settings.COURSE_ID_PATTERN), views.enroll_exam, name='enroll'),
     url(r'^{}/save-snapshot/'.format(settings.COURSE_ID_PATTERN), views.ProctoredExamUserSnapshotView.as_view(), name='save_snapshot'),
@@ -6,7 +6,6 @@ import logging
 import uuid
 from datetime import datetime
 
-import numpy
 import pytz
 import six
 from django.conf import settings
@@ -14,7 +13,9 @@ from django.contrib import admin, messages
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist, PermissionDenied
-from django.db.models import Count, Q
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import Q
 from django.http import (
     Http404,
     HttpResponse,
@@ -24,17 +25,12 @@ from django.http import (
 )
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
-from django.utils.translation import ugettext as _
+from django.utils.translation import get_language, ugettext as _
 from django.views.decorators.csrf import ensure_csrf_cookie
 from django.views.decorators.http import require_http_methods
 from django.views.generic import View
-from edx_proctoring.models import (
-    ProctoredExamReview,
-    ProctoredExamSessionConnectionHistory,
-    ProctoredExamStudentAttempt,
-    ProctoredExamTabSwitchHistory,
-    ProctoredExamWebMonitoringHistory,
-)
+from edx_proctoring import heartbeats
+from edx_proctoring.models import ProctoredExamStudentAttempt
 from edx_proctoring.statuses import ProctoredExamStudentAttemptStatus
 from edx_proctoring.utils import AuthenticatedAPIView
 from edxmako.shortcuts import render_to_response, render_to_string
@@ -42,7 +38,6 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 from rest_framework import status
 from rest_framework.response import Response
-from scipy import stats
 from student.auth import has_course_author_access
 from student.models import CourseAccessRole, CourseEnrollment
 from student.roles import CourseStaffRole
@@ -77,6 +72,7 @@ from openedx.custom.timed_exam.forms import (
     TimedExamForm,
 )
 from openedx.custom.timed_exam.models import (
+    ProctoringReportExport,
     TimedExam,
     TimedExamAlarmConfiguration,
     TimedExamExtras,
@@ -96,13 +92,22 @@ from openedx.custom.timed_exam.utils import (
     update_timed_exam_dates,
 )
 from openedx.custom.utils import local_datetime_to_utc_datetime
-from openedx.custom.xhtml2pdf import pisa
-from .helpers import analyze_questions
+from .analytics import (
+    ATTENDANCE,
+    GRADES,
+    PROCTORING,
+    REVIEWS,
+    get_exam_analytics,
+    get_teachers,
+    schedule_exam_analytics,
+)
+from .exports import render_pdf
 from .models import PendingTimedExamUser
-from .reports import distribute_scores, proctoring_report_context
+from .reports import proctoring_report_context
 from .tasks import (
     bulk_re_assign_question_set,
     delete_timed_exam_proctoring_snapshots,
+    export_proctoring_reports,
 )
 
 log = logging.getLogger(__name__)
@@ -405,6 +410,20 @@ def update_timed_exam_fields(request, course_key_string):
     return JsonResponse()
 
 
+def has_reports_access(user, course_key):
+    """
+    Only admin and allowed teacher can access the reports.
+    """
+    is_teacher = user.ta3leem_profile.user_type == UserType.teacher.name
+    return any(
+        (
+            user.is_superuser,
+            has_access(user, CourseStaffRole.ROLE, course_key),
+            is_teacher and user.ta3leem_profile.can_create_exam,
+        )
+    )
+
+
 @login_required
 @ensure_csrf_cookie
 def reports(request, course_id):
@@ -420,21 +439,11 @@ def reports(request, course_id):
     course = get_object_or_404(CourseOverview, id=course_key)
     exam = get_object_or_404(TimedExam, key=course_id)
 
-    # Only admin and allowed teacher can access the reports
-    is_teacher = user.ta3leem_profile.user_type == UserType.teacher.name
-    if not any(
-        (
-            user.is_superuser,
-            has_access(user, CourseStaffRole.ROLE, course_key),
-            is_teacher and user.ta3leem_profile.can_create_exam,
-        )
-    ):
+    if not has_reports_access(user, course_key):
         return HttpResponseForbidden()
 
     # Get the list of teachers for this course
-    teachers = CourseAccessRole.objects.filter(
-        course_id=course_key, role__in=["staff", "instructor"]
-    ).values_list("user")
+    teachers = get_teachers(course_key)
 
     # Get the enrolled students
     students = (
@@ -450,168 +459,100 @@ def reports(request, course_id):
 
     id_verification_statuses = get_users_verification_status(students)
 
-    # Student IDs who have have attempted the exam
-    all_submitted_attempts = (
-        ProctoredExamStudentAttempt.objects.filter(
-            proctored_exam__course_id=course_key,
-            status=ProctoredExamStudentAttemptStatus.submitted,
-            user__is_staff=False,
-        )
-        .exclude(user__in=teachers)
-        .order_by()
-    )
+    # Analytics computed in the background, refreshed while the exam is running
+    snapshot = get_exam_analytics(course_id)
+    timestamp = datetime.now(pytz.UTC)
+    snapshot_age = (timestamp - snapshot.computed_at).total_seconds()
+    if course.start <= timestamp <= course.end and snapshot_age > settings.TIMED_EXAM_ANALYTICS_MAX_AGE_IN_SECONDS:
+        schedule_exam_analytics(course_id, (ATTENDANCE, PROCTORING), countdown=0)
+    attendance = snapshot.get_section(ATTENDANCE)
+    proctoring = snapshot.get_section(PROCTORING)
+    grades = snapshot.get_section(GRADES)
+    reviews = snapshot.get_section(REVIEWS)
 
-    attendees = all_submitted_attempts.values_list("user", flat=True).distinct()
+    # Student IDs who have have attempted the exam
+    attendees = set(attendance["attendees"])
 
     # Student IDs who are either in-progress or left in between
     live_students = []
     dangling_students = []
-    timestamp = datetime.now(pytz.UTC)
     due_date_passed = course.end <= timestamp
     away_time_limit = exam.allowed_disconnection_minutes
     filtered_query = Q(proctored_exam__course_id=course_id) & (
         Q(status=ProctoredExamStudentAttemptStatus.started)
         | Q(status=ProctoredExamStudentAttemptStatus.ready_to_submit)
     )
-    in_progress_attempts = ProctoredExamStudentAttempt.objects.filter(filtered_query)
+    in_progress_attempts = ProctoredExamStudentAttempt.objects.filter(filtered_query).only(
+        "id", "user_id", "last_poll_timestamp"
+    )
+    attempt_heartbeats = heartbeats.get_heartbeats([attempt.id for attempt in in_progress_attempts])
     for attempt in in_progress_attempts:
+        last_poll_timestamp = heartbeats.latest(
+            attempt.last_poll_timestamp,
+            attempt_heartbeats.get(attempt.id),
+        )
         if (
-            timestamp - attempt.last_poll_timestamp
+            timestamp - last_poll_timestamp
         ).total_seconds() / 60 <= away_time_limit:
-            live_students.append(attempt.user.id)
+            live_students.append(attempt.user_id)
         else:
-            dangling_students.append(attempt.user.id)
-
-    # Session violations per student e.g. {student_id: num_violations}
-    session_violations = dict(
-        ProctoredExamSessionConnectionHistory.objects.filter(
-            course_id=course_id,
-        )
-        .values_list(
-            "user",
-        )
-        .annotate(violations=Count(id) - 1)
-        .order_by()
-    )
-
-    # Tab violations per student e.g. {student_id: num_violations}
-    tab_violations = dict(
-        ProctoredExamTabSwitchHistory.objects.filter(
-            course_id=course_id,
-            event_type="out",
-        )
-        .values_list(
-            "user",
-        )
-        .annotate(violations=Count(id))
-        .order_by()
-    )
-
-    # Webcam abnormalities
-    snapshots_taken = dict(
-        ProctoredExamWebMonitoringHistory.objects.filter(
-            proctored_exam_snapshot__course_id=course_id,
-        )
-        .values_list("proctored_exam_snapshot__user")
-        .annotate(violations=Count(id))
-        .order_by()
-    )
-    face_not_found_violations = dict(
-        ProctoredExamWebMonitoringHistory.objects.filter(
-            proctored_exam_snapshot__course_id=course_id,
-            status=ProctoredExamWebMonitoringHistory.FACE_NOT_FOUND,
-        )
-        .values_list("proctored_exam_snapshot__user")
-        .annotate(violations=Count(id))
-        .order_by()
-    )
-    multiple_faces_found_violations = dict(
-        ProctoredExamWebMonitoringHistory.objects.filter(
-            proctored_exam_snapshot__course_id=course_id,
-            status__in=[
-                ProctoredExamWebMonitoringHistory.MULTIPLE_FACE_FOUND,
-                ProctoredExamWebMonitoringHistory.MULTIPLE_PEOPLE_FOUND,
-            ],
-        )
-        .values_list("proctored_exam_snapshot__user")
-        .annotate(violations=Count(id))
-        .order_by()
-    )
-    unknown_face_found_violations = dict(
-        ProctoredExamWebMonitoringHistory.objects.filter(
-            proctored_exam_snapshot__course_id=course_id,
-            status=ProctoredExamWebMonitoringHistory.UNKNOWN_FACE,
-        )
-        .values_list("proctored_exam_snapshot__user")
-        .annotate(violations=Count(id))
-        .order_by()
-    )
-
-    # Exam scores per student e.g. {student_id: score}
-    scores = dict(
-        PersistentExamGrade.objects.filter(
-            course_id=course_id,
-        ).values_list("user_id", "percent_grade")
-    )
-    score_distribution = {
-        "highest": 0.0,
-        "lowest": 0.0,
-        "mean": 0.0,
-        "median": 0.0,
-        "mode": 0.0,
-        "scores_y_axis": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-    }
-    sorted_scores = sorted(scores.values())
-    if sorted_scores:
-        score_distribution.update(
-            {
-                "highest": sorted_scores[-1],
-                "lowest": sorted_scores[0],
-                "mean": round(numpy.mean(sorted_scores), 2),
-                "median": round(numpy.median(sorted_scores), 2),
-                "mode": stats.mode(sorted_scores),
-                "scores_y_axis": distribute_scores(sorted_scores),
-            }
-        )
-
-    # Exam review status by student
-    review_status = {
-        review.user.id: review.status
-        for review in ProctoredExamReview.objects.filter(course_id=course_id)
-    }
+            dangling_students.append(attempt.user_id)
 
     mandatory, optional = exam.count_questions
-    problems = analyze_questions(course_key)
 
     return render_to_response(
         "timed_exam/reports.html",
         {
             "course": course,
             "exam": exam,
-            "scores": scores,
+            "scores": dict(grades["scores"]),
             "num_questions": mandatory + optional,
             "num_optional_questions": optional,
             "p_value": exam.p_value,
-            "score_distribution": score_distribution,
-            "problems": problems,
+            "score_distribution": grades["score_distribution"],
+            "problems": grades["problems"],
+            "cronbach_alpha": grades["cronbach_alpha"],
             "students": students,
             "id_verification_statuses": id_verification_statuses,
             "attendees": attendees,
             "live_students": live_students,
             "due_date_passed": due_date_passed,
             "dangling_students": dangling_students,
-            "session_violations": session_violations,
-            "tab_violations": tab_violations,
-            "snapshots_taken": snapshots_taken,
-            "face_not_found_violations": face_not_found_violations,
-            "multiple_faces_found_violations": multiple_faces_found_violations,
-            "unknown_face_found_violations": unknown_face_found_violations,
-            "review_status": review_status,
+            "session_violations": dict(proctoring["session_violations"]),
+            "tab_violations": dict(proctoring["tab_violations"]),
+            "snapshots_taken": dict(proctoring["snapshots_taken"]),
+            "face_not_found_violations": dict(proctoring["face_not_found_violations"]),
+            "multiple_faces_found_violations": dict(proctoring["multiple_faces_found_violations"]),
+            "unknown_face_found_violations": dict(proctoring["unknown_face_found_violations"]),
+            "review_status": dict(reviews["review_status"]),
             "is_monitored_timed_exam": TimedExam.is_monitored_timed_exam(course_key),
+            "analytics_computed_at": snapshot.computed_at,
         },
     )
 
 
+@login_required
+@ensure_csrf_cookie
+@require_http_methods(("POST",))
+def recompute_reports(request, course_id):
+    """
+    Recompute the analytics of the exam reports in the background.
+    """
+    user = request.user
+
+    # Get the course key
+    try:
+        course_key = CourseKey.from_string(course_id)
+    except InvalidKeyError:
+        return HttpResponseBadRequest()
+
+    if not has_reports_access(user, course_key):
+        return HttpResponseForbidden()
+
+    schedule_exam_analytics(course_id, countdown=0)
+    return JsonResponse()
+
+
 @login_required
 @ensure_csrf_cookie
 def refresh_exam_grades(request, course_id):
@@ -623,15 +564,7 @@ def refresh_exam_grades(request, course_id):
     except InvalidKeyError:
         return HttpResponseBadRequest()
 
-    # Only admin and allowed teacher can access the reports
-    is_teacher = user.ta3leem_profile.user_type == UserType.teacher.name
-    if not any(
-        (
-            user.is_superuser,
-            has_access(user, CourseStaffRole.ROLE, course_key),
-            is_teacher and user.ta3leem_profile.can_create_exam,
-        )
-    ):
+    if not has_reports_access(user, course_key):
         return HttpResponseForbidden()
 
     # Update scores in needed
@@ -673,16 +606,77 @@ def proctoring_pdf(request, course_id, student_id):
     report_file_name = "report_{}.pdf".format(student_id)
     response["Content-Disposition"] = 'attachment; filename="' + report_file_name + '"'
     report_html = render_to_string("timed_exam/pdf_report.html", context)
-    pisa_status = pisa.CreatePDF(
-        report_html,
-        dest=response,
-        path=settings.LMS_ROOT_URL,
-    )
-    if pisa_status.err:
-        return HttpResponse("We had some errors <pre>" + html + "</pre>")
+    pdf = render_pdf(report_html)
+    if pdf is None:
+        return HttpResponse("We had some errors <pre>" + report_html + "</pre>")
+    response.write(pdf)
     return response
 
 
+def proctoring_export_status(export):
+    return {
+        "id": export.id,
+        "status": export.status,
+        "total": export.total,
+        "exported": export.exported,
+        "progress_url": reverse(
+            "timed_exam:proctoring_export_progress", args=(export.course_id, export.id)
+        ),
+        "download_url": reverse(
+            "timed_exam:download_proctoring_export", args=(export.course_id, export.id)
+        ) if export.status == ProctoringReportExport.DONE else None,
+    }
+
+
+@login_required
+@ensure_csrf_cookie
+@require_http_methods(("POST",))
+def export_proctoring_pdfs(request, course_id):
+    """
+    Export the proctoring reports of all the students of the exam in the background.
+    """
+    try:
+        course_key = CourseKey.from_string(course_id)
+    except InvalidKeyError:
+        return HttpResponseBadRequest()
+
+    if not has_reports_access(request.user, course_key):
+        return HttpResponseForbidden()
+
+    export, created = ProctoringReportExport.get_or_create_export(course_id, request.user, get_language())
+    if created:
+        transaction.on_commit(lambda: export_proctoring_reports.delay(export.id))
+    return JsonResponse(proctoring_export_status(export))
+
+
+@login_required
+@require_http_methods(("GET",))
+def proctoring_export_progress(request, course_id, export_id):
+    """
+    Return the progress of an export of the proctoring reports.
+    """
+    export = get_object_or_404(
+        ProctoringReportExport, id=export_id, course_id=course_id, requested_by=request.user
+    )
+    return JsonResponse(proctoring_export_status(export))
+
+
+@login_required
+@require_http_methods(("GET",))
+def download_proctoring_export(request, course_id, export_id):
+    """
+    Redirect to the ZIP file of an export of the proctoring reports.
+    """
+    export = get_object_or_404(
+        ProctoringReportExport,
+        id=export_id,
+        course_id=course_id,
+        requested_by=request.user,
+        status=ProctoringReportExport.DONE,
+    )
+    return redirect(default_storage.url(export.file_name))
+
+
 @login_required
 @ensure_csrf_cookie
 @require_http_methods(("GET",))
@@ -121,6 +121,21 @@ def dedupe(items, key=None):
     return unique_items
 
 
+def chunked(iterable, chunk_size):
+    """
+    Yield lists of at most `chunk_size` items from the given iterable
+    without loading the whole iterable in memory.
+    """
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
 def to_lower(value):
     """
     Convert the value to lower case if possible. This function does not raise error if value is not of correct type.
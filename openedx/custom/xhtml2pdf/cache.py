@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+Process level caches of the work repeated by every document.
+
+The parsed stylesheets and the loaded fonts are kept between the
+documents rendered by a process, keyed by the hash of their content.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import arabic_reshaper
+from reportlab.pdfbase.ttfonts import TTFont
+
+# Entries kept by the caches, the least recently used are dropped first
+CSS_CACHE_SIZE = 32
+FONT_CACHE_SIZE = 16
+
+
+class ContentCache(object):
+    """
+    Bounded map of the content hashes to the objects built from the content.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            value = self.items.get(key)
+            if value is not None:
+                self.items.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+cssCache = ContentCache(CSS_CACHE_SIZE)
+fontCache = ContentCache(FONT_CACHE_SIZE)
+
+
+def contentHash(*parts):
+    sha = hashlib.sha1()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = str(part).encode('utf-8')
+        sha.update(part)
+        sha.update(b'\0')
+    return sha.hexdigest()
+
+
+def fileHash(filename):
+    with open(filename, 'rb') as fontFile:
+        return contentHash(fontFile.read())
+
+
+def getTTFont(fontName, filename):
+    """
+    Return the TrueType font of the file, parsed once per content.
+    """
+    key = contentHash('ttf', fontName, fileHash(filename))
+    font = fontCache.get(key)
+    if font is None:
+        font = TTFont(fontName, filename)
+        fontCache.set(key, font)
+    return font
+
+
+def getArabicReshaper(filename):
+    """
+    Return the reshaper of the ligatures of the font file, read once per version.
+
+    It is needed by every fragment of text, so the file is not read to be hashed.
+    """
+    stat = os.stat(filename)
+    key = contentHash('reshaper', filename, stat.st_mtime, stat.st_size)
+    reshaper = fontCache.get(key)
+    if reshaper is None:
+        reshaper = arabic_reshaper.ArabicReshaper(
+            arabic_reshaper.config_for_true_type_font(
+                filename,
+                arabic_reshaper.ENABLE_ALL_LIGATURES
+            )
+        )
+        fontCache.set(key, reshaper)
+    return reshaper
+
+
+def clearCaches():
+    cssCache.clear()
+    fontCache.clear()
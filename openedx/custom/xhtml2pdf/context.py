@@ -14,9 +14,9 @@ from reportlab.lib.fonts import addMapping
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.styles import ParagraphStyle
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.platypus.frames import Frame, ShowBoundaryValue
 from reportlab.platypus.paraparser import ParaFrag, ps2tt, tt2ps
+from openedx.custom.xhtml2pdf.cache import contentHash, cssCache, getTTFont
 from openedx.custom.xhtml2pdf.util import (copy_attrs, getColor, getCoords, getFile,
                             getFrameDimensions, getSize, pisaFileObject,
                             set_value, set_asian_fonts, arabic_format, frag_text_language_check)
@@ -357,6 +357,68 @@ class pisaCSSBuilder(css.CSSBuilder):
 
 class pisaCSSParser(css.CSSParser):
 
+    # (rootPath, source) of the at-rules changing the context while parsing,
+    # replayed when the parsed stylesheet is taken from the cache
+    contextAtRules = None
+    # Stylesheets importing others are not cached, the imported files may change
+    cacheable = True
+    # Depth of the context at-rules being parsed, the @frame of a @page is
+    # replayed with its @page and must not be recorded on its own
+    contextAtRuleDepth = 0
+
+    def _parseContextAtRule(self, parseAtRule, src):
+        self.contextAtRuleDepth += 1
+        try:
+            rest, result = parseAtRule(self, src)
+        finally:
+            self.contextAtRuleDepth -= 1
+        if self.contextAtRules is not None and not self.contextAtRuleDepth:
+            self.contextAtRules.append((self.rootPath, src[:len(src) - len(rest)]))
+        return rest, result
+
+    def _parseAtImports(self, src):
+        rest, result = css.CSSParser._parseAtImports(self, src)
+        if result:
+            self.cacheable = False
+        return rest, result
+
+    def _parseAtPage(self, src):
+        return self._parseContextAtRule(css.CSSParser._parseAtPage, src)
+
+    def _parseAtFrame(self, src):
+        return self._parseContextAtRule(css.CSSParser._parseAtFrame, src)
+
+    def _parseAtFontFace(self, src):
+        return self._parseContextAtRule(css.CSSParser._parseAtFontFace, src)
+
+    def parseCached(self, src):
+        """
+        Parse the stylesheet once per process, the at-rules changing
+        the context (@page, @frame and @font-face) are applied every time.
+        """
+        key = contentHash('css', self.rootPath, src)
+        cached = cssCache.get(key)
+        if cached is not None:
+            stylesheet, contextAtRules = cached
+            rootPath = self.rootPath
+            try:
+                for atRuleRootPath, atRule in contextAtRules:
+                    self.rootPath = atRuleRootPath
+                    self.parse(atRule)
+            finally:
+                self.rootPath = rootPath
+            return stylesheet
+
+        self.contextAtRules = []
+        self.cacheable = True
+        try:
+            stylesheet = self.parse(src)
+            if self.cacheable:
+                cssCache.set(key, (stylesheet, self.contextAtRules))
+        finally:
+            self.contextAtRules = None
+        return stylesheet
+
     def parseExternal(self, cssResourceName):
         result = None
         oldRootPath = self.rootPath
@@ -466,8 +528,8 @@ class pisaContext(object):
         self.cssParser._c = weakref.ref(self)
         pisaCSSParser.c = property(lambda self: self._c())
 
-        self.css = self.cssParser.parse(self.cssText)
-        self.cssDefault = self.cssParser.parse(self.cssDefaultText)
+        self.css = self.cssParser.parseCached(self.cssText)
+        self.cssDefault = self.cssParser.parseCached(self.cssDefaultText)
         self.cssCascade = css.CSSCascadeStrategy(
             userAgent=self.cssDefault, user=self.css)
         self.cssCascade.parser = self.cssParser
@@ -862,7 +924,7 @@ class pisaContext(object):
 
                     # Register TTF font and special name
                     filename = file.getNamedFile()
-                    file = TTFont(fullFontName, filename)
+                    file = getTTFont(fullFontName, filename)
                     pdfmetrics.registerFont(file)
 
                     # Add or replace missing styles
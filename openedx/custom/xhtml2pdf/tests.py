@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from openedx.custom.xhtml2pdf.cache import clearCaches
+from openedx.custom.xhtml2pdf.context import pisaContext
+
+PAGE_CSS = """
+@page {
+    size: a4 portrait;
+    @frame header_frame {
+        -pdf-frame-content: header_content;
+        left: 50pt; width: 512pt; top: 50pt; height: 40pt;
+    }
+    @frame content_frame {
+        left: 50pt; width: 512pt; top: 90pt; height: 632pt;
+    }
+}
+"""
+
+
+class CachedStylesheetTests(TestCase):
+
+    def setUp(self):
+        clearCaches()
+        self.addCleanup(clearCaches)
+
+    def parse(self, cssText):
+        context = pisaContext(None)
+        context.addCSS(cssText)
+        context.parseCSS()
+        return context
+
+    def get_frames(self, context):
+        return {
+            name: (
+                [frame.id for frame in template.frames],
+                [frame.id for frame in template.pisaStaticList],
+            )
+            for name, template in context.templateList.items()
+        }
+
+    def test_cached_page_frames(self):
+        parsed = self.parse(PAGE_CSS)
+        cached = self.parse(PAGE_CSS)
+
+        self.assertEqual(self.get_frames(parsed), {
+            'body': (['content_frame'], ['header_frame']),
+        })
+        self.assertEqual(self.get_frames(cached), self.get_frames(parsed))
+        self.assertEqual(cached.frameList, [])
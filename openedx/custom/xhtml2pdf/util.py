@@ -19,7 +19,7 @@ import six
 import reportlab.pdfbase._cidfontdata
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
-import arabic_reshaper
+from openedx.custom.xhtml2pdf.cache import getArabicReshaper
 
 from django.conf import settings
 
@@ -977,11 +977,8 @@ def arabic_format(text, language):
     # But maybe in the future we have to for example implement something
     # for "hebrew" that isn't used in "arabic"
     if detect_language(language) in ('arabic', 'hebrew', 'persian', 'urdu', 'pashto', 'sindhi'):
-        reshaper = arabic_reshaper.ArabicReshaper(
-            arabic_reshaper.config_for_true_type_font(
-                "{}/taleem-theme/fonts/Almarai/Almarai-Regular.ttf".format(settings.STATIC_ROOT),
-                arabic_reshaper.ENABLE_ALL_LIGATURES
-            )
+        reshaper = getArabicReshaper(
+            "{}/taleem-theme/fonts/Almarai/Almarai-Regular.ttf".format(settings.STATIC_ROOT)
         )
         ar = reshaper.reshape(text)
         return get_display(ar)